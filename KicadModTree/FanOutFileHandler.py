@@ -0,0 +1,138 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2016-2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import io
+from collections import OrderedDict
+
+from KicadModTree.FileHandler import FileHandler
+from KicadModTree.KicadFileHandler import KicadFileHandler
+from KicadModTree.ResolvedFootprint import ResolvedFootprint
+from KicadModTree.SvgFileHandler import SvgFileHandler
+from KicadModTree.PngFileHandler import PngFileHandler
+from KicadModTree.JsonFileHandler import JsonFileHandler
+
+
+class FanOutFileHandler(FileHandler):
+    r"""Write a footprint in multiple formats, from a single walk of its tree
+
+    The tree is walked once, and the file handlers of all formats share the result: the KiCad footprint, a svg or
+    png image per layer and a json summary. The real positions are resolved once for the images and the json
+    summary. The KiCad file handler only reuses the grouped nodes of the walk, it still resolves the positions of
+    every node itself, as it writes the attributes of the nodes (and caches them by node, see ``KicadFileHandler``).
+
+    :param kicad_mod:
+        Main object representing the footprint
+    :type kicad_mod: ``KicadModTree.Footprint``
+    :param \**kwargs:
+        See below
+
+    :Keyword Arguments:
+        * *kicad_handler* (``FileHandler``) --
+          file handler of the footprint, None to skip it (default: ``KicadFileHandler``)
+        * *kicad_extension* (``str``) --
+          file extension of the footprint (default: '.kicad_mod')
+        * *svg_layers* (``list(str)``) --
+          layers which are written as svg (default: None, which means every layer containing a shape)
+        * *png_layers* (``list(str)``) --
+          layers which are written as png, None means every layer containing a shape (default: [])
+        * *json* (``bool``) --
+          write the json summary (default: True)
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> kicad_mod = Footprint("example_footprint")
+    >>> file_handler = FanOutFileHandler(kicad_mod, svg_layers=['F.Cu', 'F.SilkS'])
+    >>> file_handler.writeFile('example_footprint')
+    """
+
+    def __init__(self, kicad_mod, **kwargs):
+        FileHandler.__init__(self, kicad_mod)
+
+        self.kicad_handler = kwargs.get('kicad_handler', KicadFileHandler)
+        self.kicad_extension = kwargs.get('kicad_extension', '.kicad_mod')
+        self.svg_layers = kwargs.get('svg_layers')
+        self.png_layers = kwargs.get('png_layers', [])
+        self.json = kwargs.get('json', True)
+
+    def serialize(self, **kwargs):
+        r"""Get the outputs of all formats
+
+        :param \**kwargs:
+            passed to the serialize method of every file handler (like ``timestamp``)
+
+        :return: ``OrderedDict`` which maps the file suffix (like '.kicad_mod' or '.F.Cu.svg') to the output,
+                 which is ``bytes`` for png images
+
+        :Example:
+
+        >>> from KicadModTree import *
+        >>> kicad_mod = Footprint("example_footprint")
+        >>> file_handler = FanOutFileHandler(kicad_mod)
+        >>> for suffix, output in file_handler.serialize().items():
+        ...     print(suffix, len(output))
+        """
+        resolved = ResolvedFootprint(self.kicad_mod)
+
+        outputs = OrderedDict()
+
+        if self.kicad_handler is not None:
+            outputs[self.kicad_extension] = self.kicad_handler(self.kicad_mod).serialize(
+                grouped_nodes=resolved.grouped_nodes, **kwargs)
+
+        svg_layers = self.svg_layers if self.svg_layers is not None else resolved.getLayers()
+        if svg_layers:
+            svg_handler = SvgFileHandler(self.kicad_mod)
+            for layer in svg_layers:
+                outputs['.{}.svg'.format(layer)] = svg_handler.serialize(resolved=resolved, layer=layer, **kwargs)
+
+        png_layers = self.png_layers if self.png_layers is not None else resolved.getLayers()
+        if png_layers:
+            png_handler = PngFileHandler(self.kicad_mod)
+            for layer in png_layers:
+                outputs['.{}.png'.format(layer)] = png_handler.serialize(resolved=resolved, layer=layer, **kwargs)
+
+        if self.json:
+            outputs['.json'] = JsonFileHandler(self.kicad_mod).serialize(resolved=resolved, **kwargs)
+
+        return outputs
+
+    def writeFile(self, filename, **kwargs):
+        r"""Write the outputs of all formats, the file suffixes are appended to the given path
+
+        :param filename:
+            path of the output files, without extension
+        :type filename: ``str``
+
+        :return: list of the written files
+
+        :Example:
+
+        >>> from KicadModTree import *
+        >>> kicad_mod = Footprint("example_footprint")
+        >>> file_handler = FanOutFileHandler(kicad_mod)
+        >>> file_handler.writeFile('example_footprint')
+        """
+        written = []
+        for suffix, output in self.serialize(**kwargs).items():
+            if isinstance(output, bytes):
+                with open(filename + suffix, "wb") as f:
+                    f.write(output)
+            else:
+                with io.open(filename + suffix, "w", newline='\n') as f:
+                    f.write(output)
+            written.append(filename + suffix)
+
+        return written
@@ -0,0 +1,109 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2016-2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import json
+
+from KicadModTree.FileHandler import FileHandler
+from KicadModTree.ResolvedFootprint import ResolvedFootprint
+
+
+def _round(values):
+    return [round(v, 6) for v in values]
+
+
+class JsonFileHandler(FileHandler):
+    r"""Implementation of the FileHandler for a .json summary of the footprint
+
+    The summary contains the attributes of the footprint, its pads, the used layers with their bounding boxes and
+    the 3D models. It is meant for documentation and search indexes, not to recreate the footprint.
+
+    :param kicad_mod:
+        Main object representing the footprint
+    :type kicad_mod: ``KicadModTree.Footprint``
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> kicad_mod = Footprint("example_footprint")
+    >>> file_handler = JsonFileHandler(kicad_mod)
+    >>> file_handler.writeFile('example_footprint.json')
+    """
+
+    def __init__(self, kicad_mod):
+        FileHandler.__init__(self, kicad_mod)
+
+    def serialize(self, **kwargs):
+        r"""Get the summary of the footprint as json string
+
+        :param \**kwargs:
+            See below
+
+        :Keyword Arguments:
+            * *resolved* (``ResolvedFootprint``) --
+              already resolved footprint, to share one walk of the tree between multiple file handlers
+            * *indent* (``int``) --
+              indentation of the json output (default: 2)
+
+        :Example:
+
+        >>> from KicadModTree import *
+        >>> kicad_mod = Footprint("example_footprint")
+        >>> file_handler = JsonFileHandler(kicad_mod)
+        >>> print(file_handler.serialize())
+        """
+        resolved = kwargs.get('resolved')
+        if resolved is None:
+            resolved = ResolvedFootprint(self.kicad_mod)
+
+        return json.dumps(self.getSummary(resolved), indent=kwargs.get('indent', 2), sort_keys=True) + '\n'
+
+    def getSummary(self, resolved):
+        r"""Get the summary of the footprint as dict
+
+        :param resolved: the resolved footprint
+        :type resolved: ``ResolvedFootprint``
+        """
+        kicad_mod = self.kicad_mod
+
+        bbox = resolved.getBoundingBox()
+
+        layers = {}
+        for layer in resolved.getLayers():
+            layers[layer] = {'shapes': len(resolved.getShapes(layer)),
+                             'bbox': _round(resolved.getBoundingBox(layer))}
+
+        pads = []
+        for shape in resolved.getShapes():
+            if shape.kind != 'pad':
+                continue
+            node = shape.node
+            position, rotation = shape.geometry
+            pads.append({'number': node.number,
+                         'type': node.type,
+                         'shape': node.shape,
+                         'at': _round(position),
+                         'rotation': rotation,
+                         'size': _round([node.size.x, node.size.y]),
+                         'drill': _round([node.drill.x, node.drill.y]) if node.drill is not None else None,
+                         'layers': list(node.layers)})
+
+        return {'name': kicad_mod.name,
+                'description': kicad_mod.description,
+                'tags': kicad_mod.tags,
+                'attribute': kicad_mod.attribute,
+                'bbox': _round(bbox) if bbox is not None else None,
+                'layers': layers,
+                'pads': pads,
+                'models': [model.filename for model in resolved.getModels()]}
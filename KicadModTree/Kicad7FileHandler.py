@@ -0,0 +1,268 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2016-2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+from KicadModTree.KicadFileHandler import KicadFileHandler, _get_layer_width, DEFAULT_WIDTH_POLYGON_PAD
+from KicadModTree.util.kicad_util import *
+from KicadModTree.nodes.base.Pad import Pad
+from KicadModTree.nodes.base.Arc import Arc
+from KicadModTree.nodes.base.Circle import Circle
+from KicadModTree.nodes.base.Line import Line
+from KicadModTree.nodes.base.Polygon import Polygon
+from KicadModTree.nodes.specialized.RectFill import RectFill
+
+# models are placed in inch in the legacy format, and in mm in the new one
+_INCH = 25.4
+
+# the legacy 'virtual' attribute was split into multiple flags
+_ATTRIBUTE_FLAGS = {'virtual': ['board_only', 'exclude_from_pos_files', 'exclude_from_bom']}
+
+
+class Kicad7FileHandler(KicadFileHandler):
+    r"""Implementation of the FileHandler for .kicad_mod files in the format of KiCad 7 and newer
+
+    The footprint is written with the ``(footprint ... (version ...) (generator ...))`` header, so KiCad does not
+    have to convert it when it is loaded. No timestamps or uuids are written, which means the output only depends
+    on the footprint. Rectangles (``RectLine``) and solid fillings (``RectFill``) are written as ``fp_rect`` as long
+    as they stay axis aligned.
+
+    :param kicad_mod:
+        Main object representing the footprint
+    :type kicad_mod: ``KicadModTree.Footprint``
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> kicad_mod = Footprint("example_footprint")
+    >>> file_handler = Kicad7FileHandler(kicad_mod)
+    >>> file_handler.writeFile('example_footprint.kicad_mod')
+    """
+
+    FORMAT_VERSION = 20221018
+    GENERATOR = 'kicad_mod_tree'
+
+    _BASE_NODES = ['Arc', 'Circle', 'Line', 'RectLine', 'RectFill', 'Pad', 'Polygon', 'Text']
+
+    def __init__(self, kicad_mod):
+        KicadFileHandler.__init__(self, kicad_mod)
+        self._skipped_nodes = set()
+
+    def serialize(self, **kwargs):
+        r"""Get a valid string representation of the footprint in the .kicad_mod format of KiCad 7
+
+        :param \**kwargs:
+            See below
+
+        :Keyword Arguments:
+            * *grouped_nodes* (``dict``) --
+              result of ``KicadFileHandler.groupNodes``, to share one walk of the tree between multiple file handlers
+
+        :Example:
+
+        >>> from KicadModTree import *
+        >>> kicad_mod = Footprint("example_footprint")
+        >>> file_handler = Kicad7FileHandler(kicad_mod)
+        >>> print(file_handler.serialize())
+        """
+        return KicadFileHandler.serialize(self, **kwargs)
+
+    def _serializeHeader(self, **kwargs):
+        sexpr = ['footprint', self.kicad_mod.name,
+                 ['version', self.FORMAT_VERSION],
+                 ['generator', self.GENERATOR],
+                 SexprSerializer.NEW_LINE,
+                 ['layer', 'F.Cu'],
+                 SexprSerializer.NEW_LINE
+                ]  # NOQA
+
+        if self.kicad_mod.description:
+            sexpr.append(['descr', self.kicad_mod.description])
+            sexpr.append(SexprSerializer.NEW_LINE)
+
+        if self.kicad_mod.tags:
+            sexpr.append(['tags', self.kicad_mod.tags])
+            sexpr.append(SexprSerializer.NEW_LINE)
+
+        if self.kicad_mod.attribute:
+            attribute = self.kicad_mod.attribute
+            sexpr.append(['attr'] + _ATTRIBUTE_FLAGS.get(attribute, [attribute]))
+            sexpr.append(SexprSerializer.NEW_LINE)
+
+        sexpr.extend(self._serializeFootprintMargins())
+
+        return sexpr
+
+    def _serializeTree(self, grouped_nodes):
+        # the segments and fillings of rectangles which are written as fp_rect are not written again
+        self._skipped_nodes = set()
+        for node in grouped_nodes.get('RectLine', []):
+            if self._getRectCorners(node) is not None:
+                self._skipped_nodes.add((id(node), 'PolygoneLineSegments'))
+        for node in grouped_nodes.get('RectFill', []):
+            if node.mode == RectFill.MODE_SOLID and self._getRectCorners(node) is not None:
+                self._skipped_nodes.update((id(child), None) for child in node.getVirtualChilds())
+
+        return KicadFileHandler._serializeTree(self, grouped_nodes)
+
+    def _serializeNode(self, node, method_type=None):
+        # whether a node is skipped depends on the whole tree, which is not part of the cache key
+        if (id(node), method_type) in self._skipped_nodes:
+            return None
+        return KicadFileHandler._serializeNode(self, node, method_type)
+
+    @staticmethod
+    def _serialize_Stroke(node):
+        return ['stroke', ['width', _get_layer_width(node.layer, node.width)], ['type', 'solid']]
+
+    def _serialize_ArcPoints(self, node):
+        start_pos = node.getRealPosition(node.start_pos)
+        mid_pos = node.getRealPosition(node.getMidPoint())
+        end_pos = node.getRealPosition(node.getEndPoint())
+
+        return [
+                ['start', start_pos.x, start_pos.y],
+                ['mid', mid_pos.x, mid_pos.y],
+                ['end', end_pos.x, end_pos.y]
+               ]
+
+    def _serialize_Arc(self, node):
+        sexpr = ['fp_arc']
+        sexpr += self._serialize_ArcPoints(node)
+        sexpr += [
+                  self._serialize_Stroke(node),
+                  ['layer', node.layer]
+                 ]  # NOQA
+
+        return sexpr
+
+    def _serialize_Circle(self, node):
+        sexpr = ['fp_circle']
+        sexpr += self._serialize_CirclePoints(node)
+        sexpr += [
+                  self._serialize_Stroke(node),
+                  ['fill', 'none'],
+                  ['layer', node.layer]
+                 ]  # NOQA
+
+        return sexpr
+
+    def _serialize_LineSegment(self, node, start_pos, end_pos):
+        return ['fp_line',
+                ['start', start_pos.x, start_pos.y],
+                ['end', end_pos.x, end_pos.y],
+                self._serialize_Stroke(node),
+                ['layer', node.layer]
+               ]  # NOQA
+
+    @staticmethod
+    def _getRectCorners(node):
+        # only rectangles with an area which are still axis aligned in the footprint can be written as fp_rect. The
+        # corner between start and end is taken from the drawn points, which are rotated together with the rect.
+        start_pos = node.getRealPosition(node.start_pos)
+        end_pos = node.getRealPosition(node.end_pos)
+
+        if abs(start_pos.x - end_pos.x) < 1e-9 or abs(start_pos.y - end_pos.y) < 1e-9:
+            return None
+
+        if isinstance(node, RectFill):
+            corner = node.getVirtualChilds()[0].nodes[3]
+        else:
+            corner = node.nodes[1]
+        corner = node.getRealPosition(corner)
+
+        if abs(corner.x - start_pos.x) < 1e-9 and abs(corner.y - end_pos.y) < 1e-9:
+            return start_pos, end_pos
+        if abs(corner.x - end_pos.x) < 1e-9 and abs(corner.y - start_pos.y) < 1e-9:
+            return start_pos, end_pos
+
+        return None
+
+    def _serialize_RectLine(self, node):
+        corners = self._getRectCorners(node)
+        if corners is None:
+            return None
+        start_pos, end_pos = corners
+
+        sexpr = ['fp_rect',
+                 ['start', start_pos.x, start_pos.y],
+                 ['end', end_pos.x, end_pos.y],
+                 self._serialize_Stroke(node),
+                 ['fill', 'none'],
+                 ['layer', node.layer]
+                ]  # NOQA
+
+        return sexpr
+
+    def _serialize_RectFill(self, node):
+        if node.mode != RectFill.MODE_SOLID:
+            return None
+        corners = self._getRectCorners(node)
+        if corners is None:
+            return None
+        start_pos, end_pos = corners
+
+        sexpr = ['fp_rect',
+                 ['start', start_pos.x, start_pos.y],
+                 ['end', end_pos.x, end_pos.y],
+                 self._serialize_Stroke(node),
+                 ['fill', 'solid'],
+                 ['layer', node.layer]
+                ]  # NOQA
+
+        return sexpr
+
+    def _serialize_Model(self, node):
+        sexpr = ['model', node.filename,
+                 SexprSerializer.NEW_LINE,
+                 ['offset', ['xyz', node.at.x * _INCH, node.at.y * _INCH, node.at.z * _INCH]],
+                 SexprSerializer.NEW_LINE,
+                 ['scale', ['xyz', node.scale.x, node.scale.y, node.scale.z]],
+                 SexprSerializer.NEW_LINE,
+                 ['rotate', ['xyz', node.rotate.x, node.rotate.y, node.rotate.z]],
+                 SexprSerializer.NEW_LINE
+                ]  # NOQA
+
+        return sexpr
+
+    def _serialize_CustomPadPrimitive(self, p):
+        width = DEFAULT_WIDTH_POLYGON_PAD if p.width is None else p.width
+
+        if isinstance(p, Polygon):
+            return ['gr_poly',
+                    self._serialize_PolygonPoints(p, newline_after_pts=True),
+                    ['width', width],
+                    ['fill', 'yes']
+                   ]  # NOQA
+        elif isinstance(p, Line):
+            return ['gr_line'] + self._serialize_LinePoints(p) + [['width', width]]
+        elif isinstance(p, Circle):
+            # a circle without width was a filled disc in the legacy format
+            return ['gr_circle'] + self._serialize_CirclePoints(p) + [['width', width],
+                                                                      ['fill', 'no' if width else 'yes']]
+        elif isinstance(p, Arc):
+            return ['gr_arc'] + self._serialize_ArcPoints(p) + [['width', width]]
+        else:
+            raise TypeError('Unsuported type of primitive for custom pad.')
+
+    def _serialize_Polygon(self, node):
+        node_points = self._serialize_PolygonPoints(node)
+
+        sexpr = ['fp_poly',
+                 node_points,
+                 self._serialize_Stroke(node),
+                 ['fill', 'solid'],
+                 ['layer', node.layer]
+                ]  # NOQA
+
+        return sexpr
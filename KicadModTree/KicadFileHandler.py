@@ -15,11 +15,14 @@
 
 from KicadModTree.FileHandler import FileHandler
 from KicadModTree.util.kicad_util import *
+from KicadModTree.Vector import Vector2D, Vector3D
+from KicadModTree.nodes.Node import Node
 from KicadModTree.nodes.base.Pad import Pad  # TODO: why .KicadModTree is not enough?
 from KicadModTree.nodes.base.Arc import Arc
 from KicadModTree.nodes.base.Circle import Circle
 from KicadModTree.nodes.base.Line import Line
 from KicadModTree.nodes.base.Polygon import Polygon
+from KicadModTree.nodes.specialized.PolygoneLine import PolygoneLine
 
 
 DEFAULT_LAYER_WIDTH = {'F.SilkS': 0.12,
@@ -41,6 +44,70 @@ def _get_layer_width(layer, width=None):
         return DEFAULT_LAYER_WIDTH.get(layer, DEFAULT_WIDTH)
 
 
+# rendered base nodes by their state (see _get_fragment_key), shared by all file handlers of the process. Once it
+# is full, the cache is simply started again.
+_FRAGMENT_CACHE = {}
+_FRAGMENT_CACHE_SIZE = 65536
+_MISSING = object()
+
+_ATOM_TYPES = frozenset([int, float, str, bool, type(None)])
+
+# attributes which link a node into the tree (see _get_fragment_key), or which are derived from the other ones
+_TREE_ATTRIBUTES = frozenset(['_parent', '_childs', '_virtual_childs', '_nodes_shared'])
+
+
+def _get_state_key(value):
+    # hashable snapshot of a value, vectors and other objects are compared by the values of their attributes. Atoms
+    # are tagged with their type, as equal values like 1, 1.0 and True do not necessarily render the same.
+    value_type = value.__class__
+    if value_type in _ATOM_TYPES:
+        return (value_type, value)
+    if value_type is Vector2D:
+        return (value.x, value.y)
+    if value_type is Vector3D:
+        return (value.x, value.y, value.z)
+    if value_type is list or value_type is tuple:
+        return (value_type, tuple([(item.__class__, item) if item.__class__ in _ATOM_TYPES else _get_state_key(item)
+                                   for item in value]))
+    if value_type is dict:
+        return (dict, tuple([_get_state_key(name) for name in value]), _get_state_key(list(value.values())))
+    if hasattr(value, '__dict__'):
+        state = value.__dict__
+        return (value_type, tuple(state),
+                tuple([(item.__class__, item) if item.__class__ in _ATOM_TYPES else _get_state_key(item)
+                       for name, item in state.items() if name not in _TREE_ATTRIBUTES]))
+    return (value_type, value)
+
+
+def _get_fragment_key(node):
+    # the state of the node, and of all ancestors which transform the positions of their children. Changing any of
+    # them (even by modifying a vector in place) results in a different key, so cached fragments never get stale.
+    key = [_get_state_key(node)]
+
+    parent = node._parent
+    while parent is not None:
+        if parent.__class__.getRealPosition is not Node.getRealPosition:
+            key.append(_get_state_key(parent))
+        parent = parent._parent
+
+    return tuple(key)
+
+
+# rendered (layers ...) forms by layer set, there are only a handful of distinct sets in a library
+_LAYERS_FRAGMENTS = {}
+
+
+def _get_layers_fragment(layers):
+    if type(layers) is not tuple:
+        layers = tuple(layers)
+
+    fragment = _LAYERS_FRAGMENTS.get(layers)
+    if fragment is None:
+        fragment = SexprFragment(SexprSerializer(None).sexpr_to_string(('layers',) + layers))
+        _LAYERS_FRAGMENTS[layers] = fragment
+    return fragment
+
+
 class KicadFileHandler(FileHandler):
     r"""Implementation of the FileHandler for .kicad_mod files
 
@@ -59,9 +126,21 @@ class KicadFileHandler(FileHandler):
     def __init__(self, kicad_mod):
         FileHandler.__init__(self, kicad_mod)
 
+    # base nodes in the order they are rendered, except Model
+    _BASE_NODES = ['Arc', 'Circle', 'Line', 'Pad', 'Polygon', 'Text']
+
     def serialize(self, **kwargs):
         r"""Get a valid string representation of the footprint in the .kicad_mod format
 
+        :param \**kwargs:
+            See below
+
+        :Keyword Arguments:
+            * *timestamp* (``int``) --
+              edit timestamp of the footprint (default: current time)
+            * *grouped_nodes* (``dict``) --
+              result of ``groupNodes``, to share one walk of the tree between multiple file handlers
+
         :Example:
 
         >>> from KicadModTree import *
@@ -70,6 +149,52 @@ class KicadFileHandler(FileHandler):
         >>> print(file_handler.serialize())
         """
 
+        sexpr = self._serializeHeader(**kwargs)
+
+        grouped_nodes = kwargs.get('grouped_nodes')
+        if grouped_nodes is None:
+            grouped_nodes = self.groupNodes(self.kicad_mod)
+        sexpr.extend(self._serializeTree(grouped_nodes))
+
+        return str(SexprSerializer(sexpr))
+
+    @staticmethod
+    def groupNodes(kicad_mod):
+        r"""Walk the tree of the footprint once, and group all nodes by the name of their class
+
+        Nodes drawing line segments (like ``PolygoneLine``) are added to the 'Line' group as well, instead of their
+        Line childs. The result is not modified by the file handlers, so it can be passed to the serialize method of multiple
+        file handlers, which write the same footprint in different formats.
+
+        :param kicad_mod:
+            Main object representing the footprint
+        :type kicad_mod: ``KicadModTree.Footprint``
+
+        :Example:
+
+        >>> from KicadModTree import *
+        >>> kicad_mod = Footprint("example_footprint")
+        >>> grouped_nodes = KicadFileHandler.groupNodes(kicad_mod)
+        >>> legacy = KicadFileHandler(kicad_mod).serialize(grouped_nodes=grouped_nodes)
+        >>> modern = Kicad7FileHandler(kicad_mod).serialize(grouped_nodes=grouped_nodes)
+        """
+        grouped_nodes = {}
+
+        for single_node in kicad_mod.serializeShapes():
+            node_type = single_node.__class__.__name__
+
+            current_nodes = grouped_nodes.get(node_type)
+            if current_nodes is None:
+                grouped_nodes[node_type] = [single_node]
+            else:
+                current_nodes.append(single_node)
+
+            if isinstance(single_node, PolygoneLine):
+                grouped_nodes.setdefault('Line', []).append(single_node)
+
+        return grouped_nodes
+
+    def _serializeHeader(self, **kwargs):
         sexpr = ['module', self.kicad_mod.name,
                  ['layer', 'F.Cu'],
                  ['tedit', formatTimestamp(kwargs.get('timestamp'))],
@@ -88,6 +213,13 @@ class KicadFileHandler(FileHandler):
             sexpr.append(['attr', self.kicad_mod.attribute])
             sexpr.append(SexprSerializer.NEW_LINE)
 
+        sexpr.extend(self._serializeFootprintMargins())
+
+        return sexpr
+
+    def _serializeFootprintMargins(self):
+        sexpr = []
+
         if self.kicad_mod.maskMargin:
             sexpr.append(['solder_mask_margin', self.kicad_mod.maskMargin])
             sexpr.append(SexprSerializer.NEW_LINE)
@@ -100,62 +232,71 @@ class KicadFileHandler(FileHandler):
             sexpr.append(['solder_paste_ratio', self.kicad_mod.pasteMarginRatio])
             sexpr.append(SexprSerializer.NEW_LINE)
 
-        sexpr.extend(self._serializeTree())
-
-        return str(SexprSerializer(sexpr))
-
-    def _serializeTree(self):
-        nodes = self.kicad_mod.serialize()
-
-        grouped_nodes = {}
-
-        for single_node in nodes:
-            node_type = single_node.__class__.__name__
-
-            current_nodes = grouped_nodes.get(node_type, [])
-            current_nodes.append(single_node)
-
-            grouped_nodes[node_type] = current_nodes
+        return sexpr
 
+    def _serializeTree(self, grouped_nodes):
         sexpr = []
 
         # serialize initial text nodes
-        if 'Text' in grouped_nodes:
-            reference_nodes = list(filter(lambda node: node.type == 'reference', grouped_nodes['Text']))
-            for node in reference_nodes:
-                sexpr.append(self._serialize_Text(node))
-                sexpr.append(SexprSerializer.NEW_LINE)
-                grouped_nodes['Text'].remove(node)
-
-            value_nodes = list(filter(lambda node: node.type == 'value', grouped_nodes['Text']))
-            for node in value_nodes:
-                sexpr.append(self._serialize_Text(node))
-                sexpr.append(SexprSerializer.NEW_LINE)
-                grouped_nodes['Text'].remove(node)
-
-        for key, value in sorted(grouped_nodes.items()):
-            # check if key is a base node, except Model
-            if key not in {'Arc', 'Circle', 'Line', 'Pad', 'Polygon', 'Text'}:
-                continue
-
+        text_nodes = grouped_nodes.get('Text', [])
+        for text_type in ['reference', 'value']:
+            for node in text_nodes:
+                if node.type == text_type:
+                    sexpr.append(self._serializeNode(node))
+                    sexpr.append(SexprSerializer.NEW_LINE)
+
+        for key in self._BASE_NODES:
             # render base nodes
-            for node in value:
-                sexpr.append(self._callSerialize(node))
-                sexpr.append(SexprSerializer.NEW_LINE)
+            for node in grouped_nodes.get(key, []):
+                if key == 'Text' and node.type in ['reference', 'value']:
+                    continue
+                if key == 'Line' and isinstance(node, PolygoneLine):
+                    serialized = self._serializeNode(node, 'PolygoneLineSegments')
+                else:
+                    serialized = self._serializeNode(node)
+                if serialized is not None:
+                    sexpr.append(serialized)
+                    sexpr.append(SexprSerializer.NEW_LINE)
 
         # serialize 3D Models at the end
         if grouped_nodes.get('Model'):
             for node in grouped_nodes.get('Model'):
-                sexpr.append(self._serialize_Model(node))
+                sexpr.append(self._serializeNode(node))
                 sexpr.append(SexprSerializer.NEW_LINE)
 
         return sexpr
 
-    def _callSerialize(self, node):
+    def _serializeNode(self, node, method_type=None):
+        '''
+        serialize a base node into a rendered fragment, which is only rendered once for all equal nodes
+
+        :param method_type: use the method for this type instead of the one for the class of the node
+        '''
+        try:
+            key = (self.__class__, method_type, _get_fragment_key(node))
+            fragment = _FRAGMENT_CACHE.get(key, _MISSING)
+        except TypeError:
+            # some value of the node is not hashable
+            return self._callSerialize(node, method_type)
+
+        if fragment is _MISSING:
+            fragment = self._callSerialize(node, method_type)
+            if fragment is not None and type(fragment) is not SexprFragment:
+                # base nodes are written on their own line into the footprint, which gives their indentation
+                fragment = SexprFragment(SexprSerializer(None).sexpr_to_string(fragment, "  "))
+
+            if len(_FRAGMENT_CACHE) >= _FRAGMENT_CACHE_SIZE:
+                _FRAGMENT_CACHE.clear()
+            _FRAGMENT_CACHE[key] = fragment
+
+        return fragment
+
+    def _callSerialize(self, node, method_type=None):
         '''
         call the corresponding method to serialize the node
         '''
-        method_type = node.__class__.__name__
+        if method_type is None:
+            method_type = node.__class__.__name__
         method_name = "_serialize_{0}".format(method_type)
         if hasattr(self, method_name):
             return getattr(self, method_name)(node)
@@ -211,18 +352,29 @@ class KicadFileHandler(FileHandler):
                 ['end', end_pos.x, end_pos.y]
                ]
 
+    def _serialize_LineSegment(self, node, start_pos, end_pos):
+        # fp_line of a Line, or of a segment of a PolygoneLine, with the positions already transformed
+        return ['fp_line',
+                ['start', start_pos.x, start_pos.y],
+                ['end', end_pos.x, end_pos.y],
+                ['layer', node.layer],
+                ['width', _get_layer_width(node.layer, node.width)]
+               ]  # NOQA
+
     def _serialize_Line(self, node):
-        start_pos = node.getRealPosition(node.start_pos)
-        end_pos = node.getRealPosition(node.end_pos)
+        return self._serialize_LineSegment(node, node.getRealPosition(node.start_pos),
+                                           node.getRealPosition(node.end_pos))
 
-        sexpr = ['fp_line']
-        sexpr += self._serialize_LinePoints(node)
-        sexpr += [
-                ['layer', node.layer],
-                 ['width', _get_layer_width(node.layer, node.width)]
-                ]  # NOQA
+    def _serialize_PolygoneLineSegments(self, node):
+        # all segments are written as one fragment, every point is only transformed once
+        points = [node.getRealPosition(point) for point in node.nodes]
+        if len(points) < 2:
+            return None
 
-        return sexpr
+        serializer = SexprSerializer(None)
+        return SexprFragment("\n  ".join(
+            serializer.sexpr_to_string(self._serialize_LineSegment(node, start_pos, end_pos), "  ")
+            for start_pos, end_pos in zip(points, points[1:])))
 
     def _serialize_Text(self, node):
         sexpr = ['fp_text', node.type, node.text]
@@ -289,24 +441,28 @@ class KicadFileHandler(FileHandler):
 
             # render base nodes
             for p in value:
-                if isinstance(p, Polygon):
-                    sp = ['gr_poly',
-                          self._serialize_PolygonPoints(p, newline_after_pts=True)
-                         ]  # NOQA
-                elif isinstance(p, Line):
-                    sp = ['gr_line'] + self._serialize_LinePoints(p)
-                elif isinstance(p, Circle):
-                    sp = ['gr_circle'] + self._serialize_CirclePoints(p)
-                elif isinstance(p, Arc):
-                    sp = ['gr_arc'] + self._serialize_ArcPoints(p)
-                else:
-                    raise TypeError('Unsuported type of primitive for custom pad.')
-                sp.append(['width', DEFAULT_WIDTH_POLYGON_PAD if p.width is None else p.width])
-                sexpr_primitives.append(sp)
+                sexpr_primitives.append(self._serialize_CustomPadPrimitive(p))
                 sexpr_primitives.append(SexprSerializer.NEW_LINE)
 
         return sexpr_primitives
 
+    def _serialize_CustomPadPrimitive(self, p):
+        if isinstance(p, Polygon):
+            sp = ['gr_poly',
+                  self._serialize_PolygonPoints(p, newline_after_pts=True)
+                 ]  # NOQA
+        elif isinstance(p, Line):
+            sp = ['gr_line'] + self._serialize_LinePoints(p)
+        elif isinstance(p, Circle):
+            sp = ['gr_circle'] + self._serialize_CirclePoints(p)
+        elif isinstance(p, Arc):
+            sp = ['gr_arc'] + self._serialize_ArcPoints(p)
+        else:
+            raise TypeError('Unsuported type of primitive for custom pad.')
+        sp.append(['width', DEFAULT_WIDTH_POLYGON_PAD if p.width is None else p.width])
+
+        return sp
+
     def _serialize_Pad(self, node):
         sexpr = ['pad', node.number, node.type, node.shape]
 
@@ -317,6 +473,8 @@ class KicadFileHandler(FileHandler):
             sexpr.append(['at', position.x, position.y])
 
         sexpr.append(['size', node.size.x, node.size.y])
+        if node.shape == Pad.SHAPE_TRAPEZE and (node.rect_delta.x != 0 or node.rect_delta.y != 0):
+            sexpr.append(['rect_delta', node.rect_delta.x, node.rect_delta.y])
 
         if node.type in [Pad.TYPE_THT, Pad.TYPE_NPTH]:
             if node.drill.x == node.drill.y:
@@ -324,7 +482,7 @@ class KicadFileHandler(FileHandler):
             else:
                 sexpr.append(['drill', 'oval', node.drill.x, node.drill.y])
 
-        sexpr.append(['layers'] + node.layers)
+        sexpr.append(_get_layers_fragment(node.layers))
         if node.shape == Pad.SHAPE_ROUNDRECT:
             sexpr.append(['roundrect_rratio', node.radius_ratio])
 
@@ -0,0 +1,269 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2016-2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import os
+import re
+import stat
+import tempfile
+from collections import deque
+
+from KicadModTree.KicadFileHandler import KicadFileHandler
+from KicadModTree.util.lisp_diff import diffLispStrings
+
+# the edit timestamp changes on every run, so it is ignored when comparing with the existing file
+_TEDIT_RE = re.compile(br'\(tedit [0-9A-Fa-f]+\)')
+
+STATUS_WRITTEN = 'written'
+STATUS_UNCHANGED = 'unchanged'
+STATUS_FAILED = 'failed'
+STATUS_MATCHING = 'matching'
+STATUS_DIFFERING = 'differing'
+STATUS_MISSING = 'missing'
+
+
+def _getUmask():
+    # the umask can only be read by setting it. This changes a process wide setting, so it is done only once when
+    # the module is imported, and not while writer threads create files.
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# temporary files are created with restricted permissions, new files get the ones a normal open would give
+_FILE_MODE = 0o666 & ~_getUmask()
+
+
+def _writeOutput(filename, output):
+    try:
+        with open(filename, 'rb') as f:
+            existing = f.read()
+            # replaced files keep their permissions
+            file_mode = stat.S_IMODE(os.fstat(f.fileno()).st_mode)
+    except (IOError, OSError):
+        existing = None
+        file_mode = _FILE_MODE
+
+    if existing is not None and _TEDIT_RE.sub(b'', existing) == _TEDIT_RE.sub(b'', output):
+        return False
+
+    directory, basename = os.path.split(filename)
+    fd, tmp_filename = tempfile.mkstemp(prefix='.{}.'.format(basename), dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(output)
+        os.chmod(tmp_filename, file_mode)
+        os.replace(tmp_filename, filename)
+    except BaseException:
+        os.remove(tmp_filename)
+        raise
+
+    return True
+
+
+def _writeFootprint(directory, handler_class, extension, footprint, serialize_kwargs):
+    basename = os.path.join(directory, footprint.name)
+    filename = basename + extension
+
+    # the written files are flushed to disk together at the end, this includes the ones written before a failure
+    written = []
+    try:
+        outputs = handler_class(footprint).serialize(**serialize_kwargs)
+
+        # file handlers writing multiple formats return the outputs by file suffix
+        if not isinstance(outputs, dict):
+            outputs = {extension: outputs}
+
+        for suffix, output in outputs.items():
+            if not isinstance(output, bytes):
+                output = output.encode('utf-8')
+            if _writeOutput(basename + suffix, output):
+                written.append(basename + suffix)
+    except Exception as e:
+        return filename, STATUS_FAILED, e, written
+
+    return filename, STATUS_WRITTEN if written else STATUS_UNCHANGED, None, written
+
+
+def _checkFootprint(directory, handler_class, extension, footprint, serialize_kwargs, diff_kwargs):
+    filename = os.path.join(directory, footprint.name + extension)
+
+    try:
+        with open(filename, 'rb') as f:
+            existing = f.read()
+    except (IOError, OSError):
+        return filename, STATUS_MISSING, None
+
+    try:
+        output = handler_class(footprint).serialize(**serialize_kwargs)
+        if isinstance(output, dict):
+            output = output[extension]
+
+        differences = diffLispStrings(existing, output, **diff_kwargs)
+    except Exception as e:
+        return filename, STATUS_FAILED, e
+
+    if differences:
+        return filename, STATUS_DIFFERING, differences
+    return filename, STATUS_MATCHING, None
+
+
+class LibraryWriter(object):
+    r"""Write a stream of footprints into a library directory (like ``Keebio-Switches.pretty``)
+
+    Footprints are serialized and written by a pool of worker threads (or processes). Every file is written to a
+    temporary file first and then moved into place, so readers never see a partially written footprint. Files
+    whose content would not change (apart from the edit timestamp) are not touched. The written data is flushed to
+    disk once, after all footprints are written.
+
+    :param directory:
+        path of the library directory, created if it does not exist
+    :type directory: ``str``
+    :param \**kwargs:
+        See below
+
+    :Keyword Arguments:
+        * *jobs* (``int``) --
+          number of workers (default: None, which means the default of the executor)
+        * *use_processes* (``bool``) --
+          serialize in worker processes instead of threads, the footprints have to be picklable (default: False)
+        * *handler_class* (``FileHandler``) --
+          file handler used to serialize the footprints (default: ``KicadFileHandler``). Handlers which return
+          a dict of outputs (like ``FanOutFileHandler``) write one file per entry, named by its suffix.
+        * *extension* (``str``) --
+          file extension of the footprints (default: '.kicad_mod')
+        * *fsync* (``bool``) --
+          flush the written files to disk at the end (default: True)
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> writer = LibraryWriter('example.pretty', jobs=4)
+    >>> summary = writer.write(Footprint(name) for name in ['a', 'b'])
+    >>> print(summary['written'], summary['unchanged'], summary['failed'])
+    """
+
+    def __init__(self, directory, **kwargs):
+        self.directory = directory
+        self.jobs = kwargs.get('jobs')
+        self.use_processes = kwargs.get('use_processes', False)
+        self.handler_class = kwargs.get('handler_class', KicadFileHandler)
+        self.extension = kwargs.get('extension', '.kicad_mod')
+        self.fsync = kwargs.get('fsync', True)
+
+    def write(self, footprints, **kwargs):
+        r"""Write all footprints of the given iterable
+
+        :param footprints:
+            iterable of ``Footprint``, consumed lazily
+        :param \**kwargs:
+            passed to the serialize method of the file handler (like ``timestamp``)
+
+        :return: dict with the lists of 'written' and 'unchanged' filenames, as well as a dict of 'failed'
+                 filenames mapped to the raised exception. Filenames are given in the order of the footprints.
+        """
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+
+        summary = {STATUS_WRITTEN: [], STATUS_UNCHANGED: [], STATUS_FAILED: {}}
+        written_files = []
+        for filename, status, error, written in self._map(_writeFootprint, footprints, kwargs):
+            if status == STATUS_FAILED:
+                summary[STATUS_FAILED][filename] = error
+            else:
+                summary[status].append(filename)
+            written_files.extend(written)
+
+        if self.fsync and written_files:
+            self._sync(written_files)
+
+        return summary
+
+    def check(self, footprints, **kwargs):
+        r"""Compare the footprints of the given iterable with the files in the library directory
+
+        Both sides are compared as s-expression trees, so formatting changes are ignored and numbers are compared
+        with a tolerance (see ``diffLispTrees``). Nothing is written, which makes it usable as a regression gate.
+
+        :param footprints:
+            iterable of ``Footprint``, consumed lazily
+        :param \**kwargs:
+            See below
+
+        :Keyword Arguments:
+            * *tolerance* (``float``) --
+              maximal difference of equal numbers (default: 1e-6)
+            * *ignore* (``list(str)``) --
+              names of forms which are not compared (default: ('tedit', 'tstamp', 'uuid'))
+            * *serialize_kwargs* (``dict``) --
+              passed to the serialize method of the file handler
+
+        :return: dict with the lists of 'matching' and 'missing' filenames, a dict of 'differing' filenames mapped
+                 to their list of ``LispDifference`` and a dict of 'failed' filenames mapped to the raised exception
+
+        :Example:
+
+        >>> from KicadModTree import *
+        >>> from KicadModTree.util.lisp_diff import formatLispDifference
+        >>> summary = LibraryWriter('example.pretty').check(Footprint(name) for name in ['a', 'b'])
+        >>> for filename, differences in summary['differing'].items():
+        ...     print(filename, *map(formatLispDifference, differences))
+        """
+        serialize_kwargs = kwargs.pop('serialize_kwargs', {})
+
+        summary = {STATUS_MATCHING: [], STATUS_MISSING: [], STATUS_DIFFERING: {}, STATUS_FAILED: {}}
+        for filename, status, result in self._map(_checkFootprint, footprints, serialize_kwargs, kwargs):
+            if status in (STATUS_DIFFERING, STATUS_FAILED):
+                summary[status][filename] = result
+            else:
+                summary[status].append(filename)
+
+        return summary
+
+    def _map(self, function, footprints, *args):
+        # yield function(directory, handler_class, extension, footprint, *args) for all footprints, in their order
+        from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+        executor_class = ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
+        executor = executor_class(self.jobs) if self.jobs else executor_class()
+        max_pending = 4 * (self.jobs or os.cpu_count() or 1)
+
+        # keep only a limited number of footprints in flight, so the input stream is consumed lazily
+        pending = deque()
+        with executor:
+            for footprint in footprints:
+                pending.append(executor.submit(function, self.directory, self.handler_class, self.extension,
+                                               footprint, *args))
+                if len(pending) >= max_pending:
+                    yield pending.popleft().result()
+
+            while pending:
+                yield pending.popleft().result()
+
+    def _sync(self, filenames):
+        # only the written files are flushed, os.sync would flush every filesystem of the machine
+        for filename in filenames:
+            fd = os.open(filename, os.O_RDWR)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+        # make the renames durable as well
+        if hasattr(os, 'O_DIRECTORY'):
+            fd = os.open(self.directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
@@ -13,15 +13,28 @@
 #
 # (C) 2017 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
 
+import os
 import sys
-import argparse
 import csv
+from copy import copy
+from collections import deque, namedtuple
+from importlib.util import find_spec
+from itertools import islice
 
-try:
-    import yaml
-    YAML_AVAILABLE = True
-except ImportError:
-    YAML_AVAILABLE = False
+# pyyaml takes longer to import than the rest of the package, so it is only imported when a yaml file is used
+YAML_AVAILABLE = find_spec('yaml') is not None
+yaml = None
+_YamlLoader = None
+
+
+def _import_yaml():
+    global yaml, _YamlLoader
+    if yaml is None:
+        import yaml as yaml_module
+        # the parser written in C is much faster, but not always compiled into pyyaml
+        _YamlLoader = getattr(yaml_module, 'CSafeLoader', yaml_module.SafeLoader)
+        yaml = yaml_module
+    return yaml
 
 
 class ParserException(Exception):
@@ -29,6 +42,155 @@ class ParserException(Exception):
         Exception.__init__(self, *args, **kwargs)
 
 
+# a single footprint definition of a .yml or .csv file, with the parsed parameters or the errors found in it
+ParsedRow = namedtuple('ParsedRow', ['location', 'name', 'args', 'errors'])
+
+
+class ParameterError(namedtuple('ParameterError', ['parameter', 'message', 'value'])):
+    r"""An error found in a footprint definition
+
+    ``parameter`` is None for errors which do not belong to a single parameter, like exceptions raised by the
+    footprint function.
+    """
+
+    def __str__(self):
+        return self.message
+
+
+_TRUE_STRINGS = frozenset(['true', 'yes', 'on', '1'])
+_FALSE_STRINGS = frozenset(['false', 'no', 'off', '0', ''])
+
+# default values of parameters without an explicit default
+_TYPE_DEFAULTS = {bool: False, int: 0, float: 0.0, str: ''}
+
+# defaults of these types can be shared by all rows, other ones (like lists) are copied for every row
+_IMMUTABLE_TYPES = frozenset([bool, int, float, str, type(None)])
+
+
+def _convert_bool(value):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in _TRUE_STRINGS:
+            return True
+        if lowered in _FALSE_STRINGS:
+            return False
+        raise ValueError("could not convert string to bool: {!r}".format(value))
+    return bool(value)
+
+
+def _create_converter(type):
+    # values of .yml files already have the right type, and are passed through without conversion
+    if type is bool:
+        return _convert_bool
+    if type in (str, int, float):
+        # the builtin types return values of their own type unchanged
+        return type
+
+    def convert(value):
+        if value.__class__ is type:
+            return value
+        return type(value)
+
+    return convert
+
+
+_ParameterSpec = namedtuple('_ParameterSpec', ['name', 'convert', 'required', 'default', 'default_error'])
+
+
+def _call_footprint_function(footprint_function, args_list):
+    # runs in a worker process, exceptions are returned as message as they are not always picklable
+    errors = []
+    for args in args_list:
+        try:
+            footprint_function(args)
+        except Exception as e:
+            errors.append(ParameterError(None, "{}: {}".format(type(e).__name__, e), None))
+        else:
+            errors.append(None)
+    return errors
+
+
+def _compose_yaml_node(loader, anchors):
+    # build the node of the next events, like the composer of pyyaml. The composer of the C loader can only
+    # compose whole documents, while this allows to construct a document entry by entry.
+    event = loader.get_event()
+
+    if isinstance(event, yaml.AliasEvent):
+        if event.anchor not in anchors:
+            raise yaml.composer.ComposerError(None, None, "found undefined alias {}".format(event.anchor),
+                                              event.start_mark)
+        return anchors[event.anchor]
+
+    if isinstance(event, yaml.ScalarEvent):
+        tag = event.tag
+        if tag is None or tag == '!':
+            tag = loader.resolve(yaml.ScalarNode, event.value, event.implicit)
+        node = yaml.ScalarNode(tag, event.value, event.start_mark, event.end_mark, style=event.style)
+        if event.anchor is not None:
+            anchors[event.anchor] = node
+        return node
+
+    is_sequence = isinstance(event, yaml.SequenceStartEvent)
+    node_class = yaml.SequenceNode if is_sequence else yaml.MappingNode
+    tag = event.tag
+    if tag is None or tag == '!':
+        tag = loader.resolve(node_class, None, event.implicit)
+    node = node_class(tag, [], event.start_mark, None, flow_style=event.flow_style)
+    if event.anchor is not None:
+        anchors[event.anchor] = node
+
+    end_event = yaml.SequenceEndEvent if is_sequence else yaml.MappingEndEvent
+    while not loader.check_event(end_event):
+        if is_sequence:
+            node.value.append(_compose_yaml_node(loader, anchors))
+        else:
+            node.value.append((_compose_yaml_node(loader, anchors), _compose_yaml_node(loader, anchors)))
+    node.end_mark = loader.get_event().end_mark
+
+    return node
+
+
+def _construct_yaml_node(loader, node):
+    data = loader.construct_object(node, deep=True)
+    # forget the constructed objects, so memory does not grow with the size of the file
+    loader.constructed_objects = {}
+    loader.recursive_objects = {}
+    return data
+
+
+def _iter_yaml_entries(stream):
+    r"""Yield the (key, value) pairs of the top level mappings of all documents of a yaml stream
+
+    Every entry is constructed as soon as it is parsed, so only a single entry is kept in memory.
+    """
+    _import_yaml()
+    loader = _YamlLoader(stream)
+    try:
+        loader.get_event()  # stream start
+        while not loader.check_event(yaml.StreamEndEvent):
+            loader.get_event()  # document start
+            anchors = {}
+
+            if loader.check_event(yaml.MappingStartEvent):
+                loader.get_event()
+                while not loader.check_event(yaml.MappingEndEvent):
+                    key = _construct_yaml_node(loader, _compose_yaml_node(loader, anchors))
+                    value = _construct_yaml_node(loader, _compose_yaml_node(loader, anchors))
+                    yield key, value
+                loader.get_event()
+            else:
+                data = _construct_yaml_node(loader, _compose_yaml_node(loader, anchors))
+                if data is not None:
+                    raise yaml.constructor.ConstructorError(None, None, "expected a mapping of footprints",
+                                                            loader.peek_event().start_mark)
+
+            loader.get_event()  # document end
+    finally:
+        loader.dispose()
+
+
 class ModArgparser(object):
     r"""A general data loading class, which allows us to specify parts using .yml or .csv files.
 
@@ -59,6 +221,7 @@ class ModArgparser(object):
     def __init__(self, footprint_function):
         self._footprint_function = footprint_function
         self._params = {}
+        self._schema = None
 
     def add_parameter(self, name, **kwargs):
         r"""Add a parameter to the ModArgparser
@@ -90,6 +253,7 @@ class ModArgparser(object):
         """
 
         self._params[name] = kwargs
+        self._schema = None
 
     def run(self):
         r"""Execute the ModArgparser and run all tasks defined via the commandline arguments of this script
@@ -106,14 +270,7 @@ class ModArgparser(object):
         >>> parser.run()  # now run our script which handles the whole part of parsing the files
         """
 
-        parser = argparse.ArgumentParser(description='Parse footprint defintion file(s) and create matching footprints')
-        parser.add_argument('files', metavar='file', type=str, nargs='*', help='.yml or .csv files which contains data')
-        parser.add_argument('-v', '--verbose', help='show some additional information', action='store_true')  # TODO
-        parser.add_argument('--print_yml', help='print example .yml file', action='store_true')
-        parser.add_argument('--print_csv', help='print example .csv file', action='store_true')
-
-        # TODO: allow writing into sub dir
-
+        parser = self._create_argument_parser()
         args = parser.parse_args()
 
         if args.print_yml:
@@ -128,41 +285,145 @@ class ModArgparser(object):
             parser.print_help()
             return
 
+        if args.jobs is not None:
+            self._run_jobs(args.files, args.jobs)
+            return
+
         for filepath in args.files:
             print("use file: {0}".format(filepath))
-            if filepath.endswith('.yml') or filepath.endswith('.yaml'):
-                self._parse_and_execute_yml(filepath)
-            elif filepath.endswith('.csv'):
-                self._parse_and_execute_csv(filepath)
-            else:
-                print("unexpected filetype: {0}".format(filepath))
+            for location, kwargs, error in self._iter_rows(filepath):
+                if error is not None:
+                    print("ERROR: {}".format(error))
+                    continue
+                self._execute_script(**kwargs)  # now we can execute the script
+
+    @staticmethod
+    def _create_argument_parser():
+        import argparse
+
+        parser = argparse.ArgumentParser(description='Parse footprint defintion file(s) and create matching footprints')
+        parser.add_argument('files', metavar='file', type=str, nargs='*', help='.yml or .csv files which contains data')
+        parser.add_argument('-v', '--verbose', help='show some additional information', action='store_true')  # TODO
+        parser.add_argument('--print_yml', help='print example .yml file', action='store_true')
+        parser.add_argument('--print_csv', help='print example .csv file', action='store_true')
+        # the number is required, an optional one would swallow the first file
+        parser.add_argument('-j', '--jobs', type=int, default=None,
+                            help='create the footprints in parallel, using the given number of processes '
+                                 '(0: number of cpus, default: create them one after the other)')
+
+        # TODO: allow writing into sub dir
+
+        return parser
+
+    def _run_jobs(self, files, jobs, chunksize=16):
+        r"""Create the footprints of the given files in a process pool
+
+        The rows are read and validated while the workers create the footprints of the previous ones, in chunks of
+        rows. Only a few chunks per worker are in flight, so memory stays bounded for files of any size. The footprint
+        function has to be picklable (a function defined at module level) for this. The progress is printed in the
+        order of the rows, independent of the order the workers finish them.
+
+        :param files: list of .yml or .csv files
+        :param jobs: number of worker processes, 0 means the number of cpus
+        :param chunksize: number of rows sent to a worker at once
+
+        :return: list of ``ParsedRow`` which failed, with their errors
+        """
+        workers = jobs or os.cpu_count() or 1
+        rows = self._iter_parsed_rows(files)
+        summary = {'count': 0, 'failed': []}
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        pending = deque()
+        with ProcessPoolExecutor(workers) as executor:
+            while True:
+                chunk = list(islice(rows, chunksize))
+                if not chunk:
+                    break
+
+                args_list = [row.args for row in chunk if not row.errors]
+                future = executor.submit(_call_footprint_function, self._footprint_function, args_list) \
+                    if args_list else None
+                pending.append((chunk, future))
+
+                if len(pending) >= 2 * workers:
+                    self._report_chunk(*pending.popleft(), summary=summary)
 
-    def _parse_and_execute_yml(self, filepath):
+            while pending:
+                self._report_chunk(*pending.popleft(), summary=summary)
+
+        failed = summary['failed']
+        print("{} footprints created, {} failed".format(summary['count'] - len(failed), len(failed)))
+
+        return failed
+
+    def _iter_parsed_rows(self, files):
+        for filepath in files:
+            print("use file: {0}".format(filepath))
+            for location, kwargs, error in self._iter_rows(filepath):
+                if error is not None:
+                    yield ParsedRow(location, None, None, [ParameterError(None, error, None)])
+                    continue
+                parsed_args, errors = self._parse_args(**kwargs)
+                yield ParsedRow(location, kwargs.get('name', '<anon>'), parsed_args, errors)
+
+    @staticmethod
+    def _report_chunk(chunk, future, summary):
+        results = iter(future.result() if future is not None else [])
+
+        for row in chunk:
+            if not row.errors:
+                error = next(results)
+                if error is not None:
+                    row = row._replace(errors=[error])
+
+            for error in row.errors:
+                print("ERROR: {}: {}".format(row.location, error))
+            if row.name is not None:
+                print("  - generate {name}.kicad_mod".format(name=row.name))
+            if row.errors:
+                summary['failed'].append(row)
+            summary['count'] += 1
+
+    def _iter_rows(self, filepath):
+        # yields (location, kwargs, error) for every footprint definition of the file
+        if filepath.endswith('.yml') or filepath.endswith('.yaml'):
+            return self._iter_yml_rows(filepath)
+        elif filepath.endswith('.csv'):
+            return self._iter_csv_rows(filepath)
+        else:
+            print("unexpected filetype: {0}".format(filepath))
+            return iter([])
+
+    def _iter_yml_rows(self, filepath):
         if not YAML_AVAILABLE:
             print("pyyaml not available!")
             sys.exit(1)
+        _import_yaml()
 
+        empty = True
         with open(filepath, 'r') as stream:
             try:
-                parsed = yaml.safe_load(stream)  # parse file
-
-                if parsed is None:
-                    print("empty file!")
-                    return
-
-                for footprint in parsed:
-                    kwargs = parsed.get(footprint)
+                # the entries are streamed, so footprints are created while the rest of the file is parsed
+                for footprint, kwargs in _iter_yaml_entries(stream):
+                    empty = False
+                    location = "{}:{}".format(filepath, footprint)
 
                     # name is a reserved key
                     if 'name' in kwargs:
-                        print("ERROR: name is already used for root name!")
+                        yield location, None, "name is already used for root name!"
                         continue
                     kwargs['name'] = footprint
 
-                    self._execute_script(**kwargs)  # now we can execute the script
+                    yield location, kwargs, None
 
             except yaml.YAMLError as exc:
                 print(exc)
+                return
+
+        if empty:
+            print("empty file!")
 
     def _create_example_data_required(self, **kwargs):
         params = {}
@@ -185,7 +446,7 @@ class ModArgparser(object):
 
     def _create_example_datapoint(self, type, default):
         if default:
-            return type(default)
+            return _create_converter(type)(default)
 
         if type is bool:
             return False
@@ -205,22 +466,25 @@ class ModArgparser(object):
 
         data = {'footprint_required': self._create_example_data_required(),
                 'footprint_full': self._create_example_data_full()}
-        print(yaml.dump(data, default_flow_style=False))
+        print(_import_yaml().dump(data, default_flow_style=False))
 
-    def _parse_and_execute_csv(self, filepath):
+    def _iter_csv_rows(self, filepath):
         with open(filepath, 'r') as stream:
             # dialect = csv.Sniffer().sniff(stream.read(1024))  # check which type of formating the csv file likel has
             # stream.seek(0)
 
-            reader = csv.DictReader(stream, dialect=csv.excel)  # parse file
+            reader = csv.reader(stream, dialect=csv.excel)  # parse file
+
+            # we wan't to remove spaces before and after the fields
+            fieldnames = [field.strip() for field in next(reader, [])]
 
             for row in reader:
-                # we wan't to remove spaces before and after the fields
-                kwargs = {}
-                for k, v in row.items():
-                    kwargs[k.strip()] = v.strip()
+                if not row:
+                    continue
+                # fields missing at the end of a row are not set, like empty fields
+                kwargs = dict(zip(fieldnames, map(str.strip, row)))
 
-                self._execute_script(**kwargs)  # now we can execute the script
+                yield "{}:{}".format(filepath, reader.line_num), kwargs, None
 
     def _print_example_csv(self):
         writer = csv.DictWriter(sys.stdout, fieldnames=self._params.keys())
@@ -229,35 +493,64 @@ class ModArgparser(object):
         writer.writerow(self._create_example_data_required(include_name=True))
         writer.writerow(self._create_example_data_full(include_name=True))
 
-    def _execute_script(self, **kwargs):
+    def _compile_schema(self):
+        # type dispatch and defaults are resolved once, instead of for every row
+        schema = []
+        for name, param in self._params.items():
+            type = param.get('type', str)
+            convert = _create_converter(type)
+            default, default_error = None, None
+            if not param.get('required', False):
+                try:
+                    default = convert(param.get('default', _TYPE_DEFAULTS.get(type)))
+                except (ValueError, TypeError) as e:
+                    default_error = "invalid default of parameter {}: {}".format(name, e)
+            schema.append(_ParameterSpec(name, convert, param.get('required', False),
+                                         default, default_error))
+
+        self._schema = schema
+        return schema
+
+    def _parse_args(self, **kwargs):
+        r"""Convert the parameters of a footprint definition
+
+        :return: tuple of the dict of converted parameters and the list of ``ParameterError``
+        """
+        schema = self._schema if self._schema is not None else self._compile_schema()
+
         parsed_args = {}
-        error = False
+        errors = []
+
+        get = kwargs.get
+        for name, convert, required, default, default_error in schema:
+            value = get(name)
+            if value is None or value == '':
+                if required:
+                    errors.append(ParameterError(name, "parameter expected: {}".format(name), value))
+                elif default_error is not None:
+                    errors.append(ParameterError(name, default_error, value))
+                elif default.__class__ in _IMMUTABLE_TYPES:
+                    parsed_args[name] = default
+                else:
+                    parsed_args[name] = copy(default)
+                continue
 
-        for k, v in self._params.items():
             try:
-                if kwargs.get(k) not in [None, '']:
-                    parsed_args[k] = v.get('type', str)(kwargs[k])
-                elif v.get('required', False):
-                    raise ParserException("parameter expected: {}".format(k))
-                else:
-                    type = v.get('type', str)
-                    if type is bool:
-                        parsed_args[k] = type(v.get('default', False))
-                    elif type is int:
-                        parsed_args[k] = type(v.get('default', 0))
-                    elif type is float:
-                        parsed_args[k] = type(v.get('default', 0.0))
-                    elif type is str:
-                        parsed_args[k] = type(v.get('default', ''))
-                    else:
-                        parsed_args[k] = type(v.get('default'))
-            except (ValueError, ParserException) as e:
-                error = True
-                print("ERROR: {}".format(e))
+                parsed_args[name] = convert(value)
+            except (ValueError, TypeError) as e:
+                errors.append(ParameterError(name, str(e), value))
+
+        return parsed_args, errors
+
+    def _execute_script(self, **kwargs):
+        parsed_args, errors = self._parse_args(**kwargs)
+
+        for error in errors:
+            print("ERROR: {}".format(error))
 
         print("  - generate {name}.kicad_mod".format(name=kwargs.get('name', '<anon>')))
 
-        if error:
+        if errors:
             return
 
         self._footprint_function(parsed_args)
@@ -0,0 +1,311 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2016-2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+from __future__ import division
+
+import struct
+import zlib
+from math import ceil, cos, sin, pi
+
+from KicadModTree.FileHandler import FileHandler
+from KicadModTree.ResolvedFootprint import ResolvedFootprint
+from KicadModTree.util.render_util import *
+
+# points of the polygon which approximates the round ends of strokes
+_CAP_POINTS = [(cos(2 * pi * i / 12), sin(2 * pi * i / 12)) for i in range(12)]
+
+
+def _parseColor(color):
+    color = color.lstrip('#')
+    return bytes(bytearray(int(color[i:i + 2], 16) for i in (0, 2, 4)))
+
+
+def _orientPolygon(points):
+    # all polygons of a stroke get the same orientation, so they do not cancel each other out
+    area = 0
+    for (x1, y1), (x2, y2) in zip(points, points[1:] + points[:1]):
+        area += x1 * y2 - x2 * y1
+    return points if area >= 0 else points[::-1]
+
+
+def _strokePolygons(subpaths, width):
+    r = width / 2
+    polygons = []
+
+    for points in subpaths:
+        for x, y in points:
+            polygons.append([(x + r * dx, y + r * dy) for dx, dy in _CAP_POINTS])
+
+        for (x1, y1), (x2, y2) in zip(points, points[1:]):
+            dx, dy = x2 - x1, y2 - y1
+            length = (dx * dx + dy * dy) ** 0.5
+            if length == 0:
+                continue
+            nx, ny = -dy / length * r, dx / length * r
+            polygons.append(_orientPolygon([(x1 + nx, y1 + ny), (x2 + nx, y2 + ny),
+                                            (x2 - nx, y2 - ny), (x1 - nx, y1 - ny)]))
+
+    return polygons
+
+
+class Canvas(object):
+    r"""A simple RGB image, which is filled with polygons by a scanline algorithm
+
+    :param width: width in pixel
+    :param height: height in pixel
+    :param background: color of the background, like '#001023'
+    """
+
+    def __init__(self, width, height, background=DEFAULT_BACKGROUND):
+        self.width = width
+        self.height = height
+        self.pixels = bytearray(_parseColor(background) * (width * height))
+
+    def fill(self, polygons, color, scale=1, offset=(0, 0)):
+        r"""Fill the union of the given polygons, using the nonzero winding rule
+
+        :param polygons: list of lists of ``(x, y)`` points
+        :param color: color, like '#c83434'
+        :param scale: pixel per unit of the points
+        :param offset: ``(x, y)`` pixel position of the origin of the points
+        """
+        ox, oy = offset
+        rows = {}
+
+        # collect all edges by the first pixel row whose center they cross
+        for points in polygons:
+            for (x1, y1), (x2, y2) in zip(points, points[1:] + points[:1]):
+                y1, y2 = y1 * scale + oy, y2 * scale + oy
+                if y1 == y2:
+                    continue
+                x1, x2 = x1 * scale + ox, x2 * scale + ox
+                direction = 1
+                if y1 > y2:
+                    x1, y1, x2, y2 = x2, y2, x1, y1
+                    direction = -1
+
+                first_row = max(int(ceil(y1 - 0.5)), 0)
+                last_row = min(int(ceil(y2 - 0.5)), self.height)
+                if first_row >= last_row:
+                    continue
+
+                # the crossing with the center of a row is x0 + row * slope
+                slope = (x2 - x1) / (y2 - y1)
+                rows.setdefault(first_row, []).append((last_row, x1 + (0.5 - y1) * slope, slope, direction))
+
+        if not rows:
+            return
+
+        pixel = _parseColor(color)
+        pixels = self.pixels
+        width = self.width
+
+        active = []
+        for row in range(min(rows), self.height):
+            active = [edge for edge in active if edge[0] > row]
+            active.extend(rows.pop(row, []))
+            if not active:
+                if not rows:
+                    break
+                continue
+
+            crossings = sorted((x0 + row * slope, direction) for end, x0, slope, direction in active)
+
+            winding = 0
+            start = 0
+            for x, direction in crossings:
+                if winding == 0:
+                    start = x
+                winding += direction
+                if winding == 0:
+                    x1 = max(int(ceil(start - 0.5)), 0)
+                    x2 = min(int(ceil(x - 0.5)), width)
+                    if x1 < x2:
+                        begin = 3 * (row * width + x1)
+                        pixels[begin:begin + 3 * (x2 - x1)] = pixel * (x2 - x1)
+
+    def stroke(self, subpaths, width, color, scale=1, offset=(0, 0)):
+        r"""Draw lines with round ends along the given point lists
+
+        :param subpaths: list of lists of ``(x, y)`` points
+        :param width: width of the lines, in units of the points
+        """
+        self.fill(_strokePolygons(subpaths, width), color, scale, offset)
+
+    def toPng(self):
+        r"""Get the image encoded as png file
+        """
+        stride = 3 * self.width
+        raw = b''.join(b'\x00' + bytes(self.pixels[i:i + stride]) for i in range(0, len(self.pixels), stride))
+
+        def chunk(kind, data):
+            return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff)
+
+        return b''.join([b'\x89PNG\r\n\x1a\n',
+                         chunk(b'IHDR', struct.pack('>IIBBBBB', self.width, self.height, 8, 2, 0, 0, 0)),
+                         chunk(b'IDAT', zlib.compress(raw, 6)),
+                         chunk(b'IEND', b'')])
+
+
+def _drawLayer(canvas, resolved, layer, background, scale, offset):
+    color = LAYER_COLORS.get(layer, DEFAULT_COLOR)
+    # arcs are approximated to half a pixel
+    tolerance = 0.5 / scale
+    geometry = LayerGeometry(resolved, layer, lambda: FlatPathBuilder(tolerance))
+
+    for width, builder in sorted(geometry.fills.items()):
+        canvas.fill([_orientPolygon(p) for p in builder.subpaths], color, scale, offset)
+        if width:
+            canvas.stroke(builder.subpaths, width, color, scale, offset)
+    for width, builder in sorted(geometry.strokes.items()):
+        canvas.stroke(builder.subpaths, width, color, scale, offset)
+    if not geometry.pads.isEmpty():
+        canvas.fill([_orientPolygon(p) for p in geometry.pads.subpaths], color, scale, offset)
+    for width, builder in sorted(geometry.pad_strokes.items()):
+        canvas.stroke(builder.subpaths, width, color, scale, offset)
+    if not geometry.drills.isEmpty():
+        canvas.fill(geometry.drills.subpaths, background, scale, offset)
+
+
+def _drawFootprint(canvas, resolved, layer, background, scale, offset):
+    layers = [layer] if layer is not None else sortLayers(resolved.getLayers())
+    for current_layer in layers:
+        _drawLayer(canvas, resolved, current_layer, background, scale, offset)
+
+
+class PngFileHandler(FileHandler):
+    r"""Implementation of the FileHandler for previews of single layers as .png files
+
+    The image is rasterized in pure python, without any additional dependency. Texts are not drawn.
+
+    :param kicad_mod:
+        Main object representing the footprint
+    :type kicad_mod: ``KicadModTree.Footprint``
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> kicad_mod = Footprint("example_footprint")
+    >>> file_handler = PngFileHandler(kicad_mod)
+    >>> file_handler.writeFile('example_footprint.F.Cu.png', layer='F.Cu')
+    """
+
+    def __init__(self, kicad_mod):
+        FileHandler.__init__(self, kicad_mod)
+
+    def serialize(self, **kwargs):
+        r"""Get the png image of one or all layers of the footprint
+
+        :param \**kwargs:
+            See below
+
+        :Keyword Arguments:
+            * *layer* (``str``) --
+              layer which is drawn (default: None, which means all layers are drawn on top of each other)
+            * *resolved* (``ResolvedFootprint``) --
+              already resolved footprint, to share one walk of the tree between multiple file handlers
+            * *resolution* (``float``) --
+              pixel per mm (default: 20)
+            * *margin* (``float``) --
+              space around the footprint in mm (default: 1)
+            * *background* (``str``) --
+              color of the background, also used for drill holes (default: '#001023')
+
+        :return: the png file as ``bytes``
+        """
+        resolved = kwargs.get('resolved')
+        if resolved is None:
+            resolved = ResolvedFootprint(self.kicad_mod)
+
+        layer = kwargs.get('layer')
+        resolution = kwargs.get('resolution', 20)
+        margin = kwargs.get('margin', 1)
+        background = kwargs.get('background', DEFAULT_BACKGROUND)
+
+        bbox = resolved.getBoundingBox(layer) or (0, 0, 0, 0)
+        width = max(int(ceil((bbox[2] - bbox[0] + 2 * margin) * resolution)), 1)
+        height = max(int(ceil((bbox[3] - bbox[1] + 2 * margin) * resolution)), 1)
+        offset = ((margin - bbox[0]) * resolution, (margin - bbox[1]) * resolution)
+
+        canvas = Canvas(width, height, background)
+        _drawFootprint(canvas, resolved, layer, background, resolution, offset)
+
+        return canvas.toPng()
+
+    def writeFile(self, filename, **kwargs):
+        r"""Write the output of PngFileHandler.serialize to a file
+
+        :param filename:
+            path of the output file
+        :type filename: ``str``
+        """
+        with open(filename, 'wb') as f:
+            f.write(self.serialize(**kwargs))
+
+
+def renderPngContactSheet(footprints, **kwargs):
+    r"""Draw many footprints into one png image, arranged in a grid
+
+    Every footprint is scaled to fit into its cell.
+
+    :param footprints: iterable of ``Footprint``
+    :param \**kwargs:
+        See below
+
+    :Keyword Arguments:
+        * *columns* (``int``) --
+          number of footprints in a row (default: 8)
+        * *cell_size* (``int``) --
+          width and height of a cell in pixel (default: 200)
+        * *layer* (``str``) --
+          layer which is drawn (default: None, which means all layers)
+        * *background* (``str``) --
+          color of the background (default: '#001023')
+
+    :return: the png file as ``bytes``
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> with open('contact_sheet.png', 'wb') as f:
+    ...     f.write(renderPngContactSheet([Footprint("a"), Footprint("b")], columns=2))
+    """
+    columns = kwargs.get('columns', 8)
+    cell_size = kwargs.get('cell_size', 200)
+    layer = kwargs.get('layer')
+    background = kwargs.get('background', DEFAULT_BACKGROUND)
+
+    resolved = [ResolvedFootprint(footprint) for footprint in footprints]
+    rows = max((len(resolved) + columns - 1) // columns, 1)
+
+    canvas = Canvas(columns * cell_size, rows * cell_size, background)
+    padding = 0.05 * cell_size
+
+    for i, footprint in enumerate(resolved):
+        bbox = footprint.getBoundingBox(layer)
+        if bbox is None:
+            continue
+
+        size = max(bbox[2] - bbox[0], bbox[3] - bbox[1], 1e-3)
+        scale = (cell_size - 2 * padding) / size
+
+        # center the footprint in its cell
+        cell_x, cell_y = (i % columns) * cell_size, (i // columns) * cell_size
+        offset = (cell_x + cell_size / 2 - (bbox[0] + bbox[2]) / 2 * scale,
+                  cell_y + cell_size / 2 - (bbox[1] + bbox[3]) / 2 * scale)
+
+        _drawFootprint(canvas, footprint, layer, background, scale, offset)
+
+    return canvas.toPng()
@@ -16,7 +16,7 @@
 
 import warnings
 
-from KicadModTree.Vector import Vector2D
+from KicadModTree.Vector import Vector2D, FixedVector2D
 from KicadModTree.nodes.Node import Node
 
 
@@ -32,6 +32,8 @@ class PolygonPoints(object):
           mirror x direction around offset "point"
         * *y_mirror* (``[int, float](mirror offset)``) --
           mirror y direction around offset "point"
+        * *fixed_point* (``bool``) --
+          store the points as ``FixedVector2D`` in integer nanometres (default: False)
 
     :Example:
 
@@ -39,15 +41,21 @@ class PolygonPoints(object):
     >>> PolyPoint([(0, 0),(1, 0)])
     >>> PolyPoint([{'x': 0, 'y':0}, {'x': 1, 'y':0}])
     """
+
+    # set when the points are also used by a copy (see Node.copy), they are then copied before any modification
+    _nodes_shared = False
+
     def __init__(self, **kwargs):
         self._initMirror(**kwargs)
         self._initNodes(**kwargs)
 
     def _initNodes(self, **kwargs):
+        vector_type = FixedVector2D if kwargs.get('fixed_point') else Vector2D
+
         self.nodes = []
         if 'nodes' in kwargs:
             for n in kwargs['nodes']:
-                self.nodes.append(Vector2D(n))
+                self.nodes.append(vector_type(n))
             if 'polygone' in kwargs:
                 raise KeyError('Use of "nodes" and "polygone" parameter at the same time is not supported.')
         elif 'polygone' in kwargs:
@@ -56,7 +64,7 @@ class PolygonPoints(object):
                 DeprecationWarning
             )
             for n in kwargs['polygone']:
-                self.nodes.append(Vector2D(n))
+                self.nodes.append(vector_type(n))
         else:
             raise KeyError('Either "nodes" or "polygone" parameter is required for creating a PolyPoint instance.')
 
@@ -73,6 +81,25 @@ class PolygonPoints(object):
         if 'y_mirror' in kwargs and type(kwargs['y_mirror']) in [float, int]:
             self.mirror[1] = kwargs['y_mirror']
 
+    @property
+    def nodes(self):
+        if self._nodes_shared:
+            self._nodes = [n.__copy__() for n in self._nodes]
+            self._nodes_shared = False
+        return self._nodes
+
+    @nodes.setter
+    def nodes(self, nodes):
+        self._nodes = nodes
+        self._nodes_shared = False
+
+    def _sharedCopy(self):
+        copy = PolygonPoints.__new__(PolygonPoints)
+        copy.mirror = list(self.mirror)
+        copy._nodes = self._nodes
+        copy._nodes_shared = self._nodes_shared = True
+        return copy
+
     def calculateBoundingBox(self):
         min = max = self.getRealPosition(self.nodes[0])
 
@@ -175,11 +202,13 @@ class PolygonPoints(object):
         return PolygonPoints(nodes=self.nodes)
 
     def __iter__(self):
-        for n in self.nodes:
+        # read only access, points which are modified in place have to be taken from nodes
+        for n in self._nodes:
             yield n
 
     def __getitem__(self, idx):
-        return self.nodes[idx]
+        # read only access like __iter__, shared points are only copied when they are modified through nodes
+        return self._nodes[idx]
 
     def __len__(self):
-        return len(self.nodes)
+        return len(self._nodes)
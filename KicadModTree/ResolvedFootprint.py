@@ -0,0 +1,164 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2016-2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+from collections import namedtuple
+
+from KicadModTree.KicadFileHandler import KicadFileHandler, _get_layer_width
+from KicadModTree.nodes.specialized.Courtyard import getNodeOutlinePoints
+from KicadModTree.nodes.specialized.PolygoneLine import PolygoneLine
+
+# a base node, with all coordinates given in the coordinate system of the footprint
+#
+# geometry depends on the kind of the shape:
+#   'line':    (start, end)
+#   'arc':     (start, mid, end, center, radius, angle)
+#   'circle':  (center, radius)
+#   'polygon': (points, )
+#   'pad':     (position, rotation), the remaining attributes are taken from the node
+#   'text':    (position, rotation)
+ResolvedShape = namedtuple('ResolvedShape', ['kind', 'layers', 'width', 'geometry', 'outline', 'node'])
+
+
+def expandLayers(layers):
+    r"""Expand the wildcard layers of pads (like '*.Cu') into the front and back layer
+
+    :param layers: list of layer names
+    :return: list of layer names without wildcards
+    """
+    expanded = []
+    for layer in layers:
+        if layer.startswith('*.'):
+            expanded.extend(['F' + layer[1:], 'B' + layer[1:]])
+        else:
+            expanded.append(layer)
+    return expanded
+
+
+class ResolvedFootprint(object):
+    r"""Walk the tree of a footprint once, and resolve the real position of all base nodes
+
+    The result is shared between multiple file handlers: the KiCad file handlers use ``grouped_nodes``, while the
+    handlers for previews and summaries use ``shapes``, which are already given in footprint coordinates.
+
+    :param kicad_mod:
+        Main object representing the footprint
+    :type kicad_mod: ``KicadModTree.Footprint``
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> kicad_mod = Footprint("example_footprint")
+    >>> resolved = ResolvedFootprint(kicad_mod)
+    >>> print(resolved.getLayers())
+    """
+
+    _SHAPE_NODES = ['Arc', 'Circle', 'Line', 'Polygon', 'Pad', 'Text']
+
+    def __init__(self, kicad_mod):
+        self.kicad_mod = kicad_mod
+        self.grouped_nodes = KicadFileHandler.groupNodes(kicad_mod)
+
+        self.shapes = []
+        for key in self._SHAPE_NODES:
+            for node in self.grouped_nodes.get(key, []):
+                if key == 'Line' and isinstance(node, PolygoneLine):
+                    self.shapes.extend(self._resolvePolygoneLineSegments(node))
+                else:
+                    self.shapes.append(getattr(self, '_resolve{}'.format(key))(node))
+
+        self._layers = {}
+        for shape in self.shapes:
+            for layer in shape.layers:
+                self._layers.setdefault(layer, []).append(shape)
+
+    def getLayers(self):
+        r"""Get a sorted list of all layers which contain at least one shape
+        """
+        return sorted(self._layers)
+
+    def getShapes(self, layer=None):
+        r"""Get all shapes, or the shapes of the given layer
+
+        :param layer: name of the layer (default: None, which means all layers)
+        """
+        if layer is None:
+            return self.shapes
+        return self._layers.get(layer, [])
+
+    def getModels(self):
+        r"""Get all 3D models of the footprint
+        """
+        return self.grouped_nodes.get('Model', [])
+
+    def getBoundingBox(self, layer=None):
+        r"""Get the bounding box ``(min_x, min_y, max_x, max_y)`` of all shapes, or the shapes of the given layer
+
+        :param layer: name of the layer (default: None, which means all layers)
+        :return: the bounding box, or None if there is no shape
+        """
+        points = [p for shape in self.getShapes(layer) for p in shape.outline]
+        if not points:
+            return None
+
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        return (min(xs), min(ys), max(xs), max(ys))
+
+    @staticmethod
+    def _point(node, point):
+        p = node.getRealPosition(point)
+        return (p['x'], p['y'])
+
+    def _resolveLine(self, node):
+        start = self._point(node, node.start_pos)
+        end = self._point(node, node.end_pos)
+        return ResolvedShape('line', [node.layer], _get_layer_width(node.layer, node.width), (start, end),
+                             [start, end], node)
+
+    def _resolvePolygoneLineSegments(self, node):
+        width = _get_layer_width(node.layer, node.width)
+        points = [self._point(node, point) for point in node.nodes]
+        return [ResolvedShape('line', [node.layer], width, (start, end), [start, end], node)
+                for start, end in zip(points, points[1:])]
+
+    def _resolveArc(self, node):
+        geometry = (self._point(node, node.start_pos),
+                    self._point(node, node.getMidPoint()),
+                    self._point(node, node.getEndPoint()),
+                    self._point(node, node.center_pos),
+                    node.getRadius(),
+                    node.angle)
+        return ResolvedShape('arc', [node.layer], _get_layer_width(node.layer, node.width), geometry,
+                             getNodeOutlinePoints(node), node)
+
+    def _resolveCircle(self, node):
+        center = self._point(node, node.center_pos)
+        return ResolvedShape('circle', [node.layer], _get_layer_width(node.layer, node.width),
+                             (center, node.radius), getNodeOutlinePoints(node), node)
+
+    def _resolvePolygon(self, node):
+        points = [self._point(node, n) for n in node.nodes]
+        return ResolvedShape('polygon', [node.layer], _get_layer_width(node.layer, node.width), (points, ),
+                             points, node)
+
+    def _resolvePad(self, node):
+        position, rotation = node.getRealPosition(node.at, node.rotation)
+        return ResolvedShape('pad', expandLayers(node.layers), 0, ((position['x'], position['y']), rotation),
+                             getNodeOutlinePoints(node), node)
+
+    def _resolveText(self, node):
+        position, rotation = node.getRealPosition(node.at, node.rotation)
+        position = (position['x'], position['y'])
+        return ResolvedShape('text', [node.layer], node.thickness, (position, rotation), [position], node)
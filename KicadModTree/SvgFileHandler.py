@@ -0,0 +1,215 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2016-2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+from KicadModTree.FileHandler import FileHandler
+from KicadModTree.ResolvedFootprint import ResolvedFootprint
+from KicadModTree.util.kicad_util import formatFloat
+from KicadModTree.util.render_util import *
+
+
+# xml.sax.saxutils imports urllib, which makes up most of the import time of the package. It is only imported once
+# svg files are written.
+def _escape(text):
+    from xml.sax.saxutils import escape
+    return escape(text)
+
+
+def _quoteattr(text):
+    from xml.sax.saxutils import quoteattr
+    return quoteattr(text)
+
+
+def _serializeLayer(resolved, layer, background):
+    color = LAYER_COLORS.get(layer, DEFAULT_COLOR)
+    geometry = LayerGeometry(resolved, layer, SvgPathBuilder)
+
+    svg = ['<g id={} stroke-linecap="round" stroke-linejoin="round">'.format(_quoteattr(layer))]
+
+    for width, path in sorted(geometry.fills.items()):
+        svg.append('<path fill="{color}" stroke="{color}" stroke-width="{width}" d="{d}"/>'.format(
+                   color=color, width=formatFloat(width), d=path))
+    for width, path in sorted(geometry.strokes.items()):
+        svg.append('<path fill="none" stroke="{color}" stroke-width="{width}" d="{d}"/>'.format(
+                   color=color, width=formatFloat(width), d=path))
+    if not geometry.pads.isEmpty():
+        svg.append('<path fill="{color}" d="{d}"/>'.format(color=color, d=geometry.pads))
+    for width, path in sorted(geometry.pad_strokes.items()):
+        svg.append('<path fill="none" stroke="{color}" stroke-width="{width}" d="{d}"/>'.format(
+                   color=color, width=formatFloat(width), d=path))
+    if not geometry.drills.isEmpty() and background:
+        svg.append('<path fill="{color}" d="{d}"/>'.format(color=background, d=geometry.drills))
+
+    for shape in geometry.texts:
+        svg.append(_serializeText(shape, color))
+
+    svg.append('</g>')
+
+    return svg
+
+
+def _serializeText(shape, color):
+    node = shape.node
+    (x, y), rotation = shape.geometry
+
+    attributes = 'x="{x}" y="{y}" fill="{color}" font-size="{size}" text-anchor="middle" ' \
+                 'dominant-baseline="central" font-family="sans-serif"'.format(
+                     x=formatFloat(x), y=formatFloat(y), color=color, size=formatFloat(node.size.y))
+    if rotation:
+        # text rotation is counter clockwise, while svg rotates clockwise
+        attributes += ' transform="rotate({r} {x} {y})"'.format(r=formatFloat(-rotation),
+                                                              x=formatFloat(x), y=formatFloat(y))
+
+    return '<text {attributes}>{text}</text>'.format(attributes=attributes, text=_escape(node.text))
+
+
+class SvgFileHandler(FileHandler):
+    r"""Implementation of the FileHandler for previews of single layers as .svg files
+
+    Shapes with the same style are collected into a single path element, so the size of the output grows with the
+    number of different line widths instead of the number of shapes.
+
+    :param kicad_mod:
+        Main object representing the footprint
+    :type kicad_mod: ``KicadModTree.Footprint``
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> kicad_mod = Footprint("example_footprint")
+    >>> file_handler = SvgFileHandler(kicad_mod)
+    >>> file_handler.writeFile('example_footprint.F.Cu.svg', layer='F.Cu')
+    """
+
+    def __init__(self, kicad_mod):
+        FileHandler.__init__(self, kicad_mod)
+
+    def serialize(self, **kwargs):
+        r"""Get the svg image of one or all layers of the footprint
+
+        :param \**kwargs:
+            See below
+
+        :Keyword Arguments:
+            * *layer* (``str``) --
+              layer which is drawn (default: None, which means all layers are drawn on top of each other)
+            * *resolved* (``ResolvedFootprint``) --
+              already resolved footprint, to share one walk of the tree between multiple file handlers
+            * *margin* (``float``) --
+              space around the footprint in mm (default: 1)
+            * *background* (``str``) --
+              color of the background, also used for drill holes (default: '#001023')
+
+        :Example:
+
+        >>> from KicadModTree import *
+        >>> kicad_mod = Footprint("example_footprint")
+        >>> file_handler = SvgFileHandler(kicad_mod)
+        >>> print(file_handler.serialize(layer='F.SilkS'))
+        """
+        resolved = kwargs.get('resolved')
+        if resolved is None:
+            resolved = ResolvedFootprint(self.kicad_mod)
+
+        layer = kwargs.get('layer')
+        margin = kwargs.get('margin', 1)
+        background = kwargs.get('background', DEFAULT_BACKGROUND)
+
+        layers = [layer] if layer is not None else sortLayers(resolved.getLayers())
+
+        bbox = resolved.getBoundingBox(layer) or (0, 0, 0, 0)
+        x, y = bbox[0] - margin, bbox[1] - margin
+        width, height = bbox[2] - bbox[0] + 2 * margin, bbox[3] - bbox[1] + 2 * margin
+
+        title = self.kicad_mod.name if layer is None else '{} {}'.format(self.kicad_mod.name, layer)
+
+        svg = ['<svg xmlns="http://www.w3.org/2000/svg" width="{w}mm" height="{h}mm" viewBox="{x} {y} {w} {h}">'
+               .format(x=formatFloat(x), y=formatFloat(y), w=formatFloat(width), h=formatFloat(height)),
+               '<title>{}</title>'.format(_escape(title))]
+        if background:
+            svg.append('<rect x="{x}" y="{y}" width="{w}" height="{h}" fill="{fill}"/>'.format(
+                x=formatFloat(x), y=formatFloat(y), w=formatFloat(width), h=formatFloat(height), fill=background))
+
+        for current_layer in layers:
+            svg.extend(_serializeLayer(resolved, current_layer, background))
+
+        svg.append('</svg>')
+
+        return '\n'.join(svg) + '\n'
+
+
+def renderSvgContactSheet(footprints, **kwargs):
+    r"""Draw many footprints into one svg image, arranged in a grid with their names below
+
+    Every footprint is scaled to fit into its cell.
+
+    :param footprints: iterable of ``Footprint``
+    :param \**kwargs:
+        See below
+
+    :Keyword Arguments:
+        * *columns* (``int``) --
+          number of footprints in a row (default: 8)
+        * *cell_size* (``float``) --
+          width and height of a cell in mm (default: 30)
+        * *layer* (``str``) --
+          layer which is drawn (default: None, which means all layers)
+        * *background* (``str``) --
+          color of the background (default: '#001023')
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> with open('contact_sheet.svg', 'w') as f:
+    ...     f.write(renderSvgContactSheet([Footprint("a"), Footprint("b")], columns=2))
+    """
+    columns = kwargs.get('columns', 8)
+    cell_size = kwargs.get('cell_size', 30)
+    layer = kwargs.get('layer')
+    background = kwargs.get('background', DEFAULT_BACKGROUND)
+
+    footprints = list(footprints)
+    rows = max((len(footprints) + columns - 1) // columns, 1)
+    label_size = cell_size / 15
+    margin = label_size / 2
+
+    width, height = formatFloat(columns * cell_size), formatFloat(rows * cell_size)
+    svg = ['<svg xmlns="http://www.w3.org/2000/svg" width="{w}mm" height="{h}mm" viewBox="0 0 {w} {h}">'.format(
+           w=width, h=height),
+           '<rect width="{w}" height="{h}" fill="{fill}"/>'.format(w=width, h=height, fill=background)]
+
+    for i, footprint in enumerate(footprints):
+        resolved = ResolvedFootprint(footprint)
+        layers = [layer] if layer is not None else sortLayers(resolved.getLayers())
+
+        x, y = (i % columns) * cell_size, (i // columns) * cell_size
+        bbox = resolved.getBoundingBox(layer) or (0, 0, 0, 0)
+
+        svg.append('<svg x="{x}" y="{y}" width="{w}" height="{h}" viewBox="{vx} {vy} {vw} {vh}">'.format(
+            x=formatFloat(x + margin), y=formatFloat(y + margin),
+            w=formatFloat(cell_size - 2 * margin), h=formatFloat(cell_size - 3 * margin - label_size),
+            vx=formatFloat(bbox[0] - margin), vy=formatFloat(bbox[1] - margin),
+            vw=formatFloat(bbox[2] - bbox[0] + 2 * margin), vh=formatFloat(bbox[3] - bbox[1] + 2 * margin)))
+        for current_layer in layers:
+            svg.extend(_serializeLayer(resolved, current_layer, background))
+        svg.append('</svg>')
+
+        svg.append('<text x="{x}" y="{y}" fill="#ffffff" font-size="{size}" text-anchor="middle" '
+                   'font-family="sans-serif">{text}</text>'.format(
+                       x=formatFloat(x + cell_size / 2), y=formatFloat(y + cell_size - margin),
+                       size=formatFloat(label_size), text=_escape(footprint.name)))
+
+    svg.append('</svg>')
+
+    return '\n'.join(svg) + '\n'
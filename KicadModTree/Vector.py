@@ -18,7 +18,7 @@ from builtins import round
 
 import warnings
 
-from KicadModTree.util.kicad_util import formatFloat
+from KicadModTree.util.kicad_util import formatFloat, formatNanometres, toNanometres, sinCos, NANOMETRES_PER_MM
 from math import sqrt, sin, cos, hypot, atan2, degrees, radians
 
 
@@ -204,14 +204,27 @@ class Vector2D(object):
                 rotation angle is given in degrees. default:True
         """
 
-        op = Vector2D(origin)
-
         if use_degrees:
-            angle = radians(angle)
+            # multiples of 90° only swap and negate the coordinates, see sinCos
+            sin_angle, cos_angle = sinCos(angle)
+        else:
+            sin_angle, cos_angle = sin(angle), cos(angle)
+
+        if sin_angle == 0 and cos_angle == 1:
+            return self
 
-        temp = op.x + cos(angle) * (self.x - op.x) - sin(angle) * (self.y - op.y)
-        self.y = op.y + sin(angle) * (self.x - op.x) + cos(angle) * (self.y - op.y)
-        self.x = temp
+        if isinstance(origin, Vector2D):
+            ox, oy = origin.x, origin.y
+        elif type(origin) is tuple and len(origin) == 2:
+            ox, oy = float(origin[0]), float(origin[1])
+        else:
+            op = Vector2D(origin)
+            ox, oy = op.x, op.y
+
+        dx = self.x - ox
+        dy = self.y - oy
+        self.x = ox + cos_angle * dx - sin_angle * dy
+        self.y = oy + sin_angle * dx + cos_angle * dy
 
         return self
 
@@ -277,6 +290,137 @@ class Vector2D(object):
         return Vector2D(source.x/source.z, source.y/source.z)
 
 
+class FixedVector2D(Vector2D):
+    r"""Representation of a 2D Vector in space, stored as integer nanometres like KiCad does
+
+    The coordinates are still read and written in mm, but every value is rounded to whole nanometres. Additions and
+    subtractions are exact, so there is no float noise which would need to be rounded away again. Vectors with the
+    same coordinates compare equal and have the same hash, as long as they are not modified while they are part of
+    a set or dict.
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> FixedVector2D(-0.635, 1.27)
+    >>> FixedVector2D.fromNanometres(-635000, 1270000)
+    """
+
+    @staticmethod
+    def fromNanometres(x, y):
+        r"""Create a vector from integer nanometres
+
+        :param x: x coordinate in nanometres
+        :param y: y coordinate in nanometres
+        """
+        vector = FixedVector2D.__new__(FixedVector2D)
+        vector._x = int(x)
+        vector._y = int(y)
+        return vector
+
+    @property
+    def x(self):
+        return self._x / NANOMETRES_PER_MM
+
+    @x.setter
+    def x(self, value):
+        self._x = toNanometres(value)
+
+    @property
+    def y(self):
+        return self._y / NANOMETRES_PER_MM
+
+    @y.setter
+    def y(self, value):
+        self._y = toNanometres(value)
+
+    def to_nanometres(self):
+        r"""Get the coordinates as integer nanometres
+
+        :return: tuple of x and y in nanometres
+        """
+        return self._x, self._y
+
+    def round_to(self, base):
+        r"""Round to a specific base (like it's required for a grid)
+
+        :param base: base we want to round to
+        :return: rounded point
+
+        >>> from KicadModTree import *
+        >>> FixedVector2D(0.1234, 0.5678).round_to(0.01)
+        """
+        if base == 0 or base is None:
+            return self.__copy__()
+
+        base = toNanometres(base)
+        return FixedVector2D.fromNanometres(round(self._x / base) * base, round(self._y / base) * base)
+
+    @staticmethod
+    def __nanometres(value):
+        if isinstance(value, FixedVector2D):
+            return value._x, value._y
+        elif type(value) in [int, float]:
+            value = toNanometres(value)
+            return value, value
+        elif not isinstance(value, Vector2D):
+            value = Vector2D(value)
+        return toNanometres(value.x), toNanometres(value.y)
+
+    def __eq__(self, other):
+        if not isinstance(other, Vector2D) or isinstance(other, Vector3D):
+            return False
+        return (self._x, self._y) == FixedVector2D.__nanometres(other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash((self._x, self._y))
+
+    def __add__(self, value):
+        x, y = FixedVector2D.__nanometres(value)
+        return FixedVector2D.fromNanometres(self._x + x, self._y + y)
+
+    def __iadd__(self, value):
+        x, y = FixedVector2D.__nanometres(value)
+        self._x += x
+        self._y += y
+
+        return self
+
+    def __neg__(self):
+        return FixedVector2D.fromNanometres(-self._x, -self._y)
+
+    def __sub__(self, value):
+        x, y = FixedVector2D.__nanometres(value)
+        return FixedVector2D.fromNanometres(self._x - x, self._y - y)
+
+    def __isub__(self, value):
+        x, y = FixedVector2D.__nanometres(value)
+        self._x -= x
+        self._y -= y
+
+        return self
+
+    def __mul__(self, value):
+        return FixedVector2D(Vector2D.__mul__(self, value))
+
+    def __div__(self, value):
+        return FixedVector2D(Vector2D.__div__(self, value))
+
+    def __truediv__(self, obj):
+        return self.__div__(obj)
+
+    def __repr__(self):
+        return "FixedVector2D (x={x}, y={y})".format(x=formatNanometres(self._x), y=formatNanometres(self._y))
+
+    def __str__(self):
+        return "(x={x}, y={y})".format(x=formatNanometres(self._x), y=formatNanometres(self._y))
+
+    def __copy__(self):
+        return FixedVector2D.fromNanometres(self._x, self._y)
+
+
 class Vector3D(Vector2D):
     r"""Representation of a 3D Vector in space
 
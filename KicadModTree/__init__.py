@@ -13,14 +13,68 @@
 #
 # (C) 2016 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
 
+import importlib
+import sys
+import types
+
 from KicadModTree.Vector import *
-from KicadModTree.Point import *  # backwards compatibility
 
 # all different types of nodes
 from KicadModTree.nodes import *
 
 # File Handlers
 from KicadModTree.KicadFileHandler import KicadFileHandler
+from KicadModTree.Kicad7FileHandler import Kicad7FileHandler
+
+# everything else is only imported when it is used first (PEP 562), so short scripts do not pay for the other file
+# handlers and their dependencies
+_LAZY_ATTRIBUTES = {
+    # backwards compatibility
+    'Point': 'KicadModTree.Point',
+    'Point2D': 'KicadModTree.Point',
+    'Point3D': 'KicadModTree.Point',
+
+    # File Handlers
+    'ResolvedFootprint': 'KicadModTree.ResolvedFootprint',
+    'SvgFileHandler': 'KicadModTree.SvgFileHandler',
+    'renderSvgContactSheet': 'KicadModTree.SvgFileHandler',
+    'PngFileHandler': 'KicadModTree.PngFileHandler',
+    'renderPngContactSheet': 'KicadModTree.PngFileHandler',
+    'JsonFileHandler': 'KicadModTree.JsonFileHandler',
+    'FanOutFileHandler': 'KicadModTree.FanOutFileHandler',
+    'LibraryWriter': 'KicadModTree.LibraryWriter',
+
+    # Argparser
+    'ModArgparser': 'KicadModTree.ModArgparser',
+}
+
+# "from KicadModTree import *" still provides all names, scripts which only need a few of them should import them
+# explicitly to profit from the lazy loading
+__all__ = ([name for name in globals() if not name.startswith('_') and name not in ['importlib', 'sys', 'types']] +
+           list(_LAZY_ATTRIBUTES))
+
+
+class _LazyModule(types.ModuleType):
+    def __setattr__(self, name, value):
+        # the import system binds every loaded submodule to the package, which would hide the class of the same
+        # name (like KicadModTree.ResolvedFootprint) when the submodule is imported by another one
+        if isinstance(value, types.ModuleType) and value.__name__ == _LAZY_ATTRIBUTES.get(name):
+            value = getattr(value, name)
+        types.ModuleType.__setattr__(self, name, value)
+
+
+sys.modules[__name__].__class__ = _LazyModule
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
 
-# Argparser
-from KicadModTree.ModArgparser import ModArgparser
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
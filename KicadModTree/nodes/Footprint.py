@@ -51,6 +51,9 @@ class Footprint(Node):
         self.pasteMargin = None
         self.pasteMarginRatio = None
 
+        # outline points of the direct childs, measured once per child
+        self._extents = {}
+
     def setName(self, name):
         self.name = name
 
@@ -74,3 +77,153 @@ class Footprint(Node):
         assert abs(value) <= 1, "Solder paste margin must be between -1 and 1. {} is too large.".format(value)
 
         self.pasteMarginRatio = value
+
+    def getExtents(self, layers=None):
+        r"""Get the outline points of all pads and of the nodes drawn on the given layers
+
+        The outline of every direct child is only calculated the first time it is requested. Call
+        ``invalidateExtents`` after changing a node which is already part of the footprint.
+
+        :param layers: layers of the non-pad nodes to include (default: None, which means no layers)
+        :return: list of ``(x, y)`` tuples in footprint coordinates
+        """
+        from KicadModTree.nodes.specialized.Courtyard import getNodeOutlinePoints
+
+        layers = set(layers or [])
+        extents = {}
+        points = []
+        for child in self.getNormalChilds():
+            child_extents = self._extents.get(child)
+            if child_extents is None:
+                child_extents = []
+                for node in child.serializeShapes():
+                    node_points = getNodeOutlinePoints(node)
+                    if node_points:
+                        child_extents.append((getattr(node, 'layer', None), node_points))
+            extents[child] = child_extents
+
+            for layer, node_points in child_extents:
+                if layer is None or layer in layers:
+                    points.extend(node_points)
+
+        self._extents = extents
+        return points
+
+    def invalidateExtents(self, node=None):
+        r"""Forget the cached outline of the given direct child, or of all childs if no node is given
+
+        :param node: the child which was changed (default: None)
+        """
+        if node is None:
+            self._extents = {}
+        else:
+            self._extents.pop(node, None)
+
+    def bake(self):
+        r"""Apply all ``Translation`` and ``Rotation`` nodes to the geometry of their childs, and remove them
+
+        Every serialization resolves the real position of each point by walking up the parents of the node. Baking
+        applies the transformations once, so footprints which are written multiple times (or measured by
+        ``getExtents``) do not have to resolve them again. The transformations are applied to the nodes in the same
+        order as ``getRealPosition`` does, so the written footprint does not change (except that circles are written
+        with their end point to the right of the center).
+
+        Nodes which can not be rotated or translated themselves (like ``PadArray``) are replaced by their virtual
+        childs, 3D models are kept as they are, because their position is never transformed.
+
+        :return: the footprint itself, which does not contain any transformation anymore
+
+        :Example:
+
+        >>> from KicadModTree import *
+        >>> kicad_mod = Footprint("example_footprint")
+        >>> kicad_mod.append(Translation(1, 2))
+        >>> kicad_mod.getNormalChilds()[0].append(Line(start=[0, 0], end=[1, 0]))
+        >>> kicad_mod.bake()
+        """
+        Footprint._bakeChilds(self, [])
+        self.invalidateExtents()
+        return self
+
+    @staticmethod
+    def _bakeChilds(node, transformations):
+        # replace the childs of the node by their baked version, transformations are ordered from the innermost to
+        # the outermost one
+        childs = Footprint._bakeNodes(node.getNormalChilds(), transformations)
+        node.removeMultiple(node.getNormalChilds())
+        for child in childs:
+            # childs of removed transformations and virtual childs of replaced nodes get a new parent
+            child._parent = None
+        node.extend(childs)
+
+    @staticmethod
+    def _bakeNodes(nodes, transformations):
+        from KicadModTree.nodes.specialized.Rotation import Rotation
+        from KicadModTree.nodes.specialized.Translation import Translation
+
+        baked = []
+        for node in nodes:
+            if isinstance(node, (Translation, Rotation)):
+                baked.extend(Footprint._bakeNodes(node.getNormalChilds(), [node] + transformations))
+                continue
+
+            if transformations and not (callable(getattr(node, 'rotate', None)) and
+                                        callable(getattr(node, 'translate', None))):
+                virtual_childs = node.getVirtualChilds()
+                if virtual_childs:
+                    # virtual childs which are not linked to their parent (like the pads of PadArray) are never
+                    # transformed when they are written, so they are not transformed here either
+                    for child in virtual_childs:
+                        baked.extend(Footprint._bakeNodes([child], transformations if child._parent is node else []))
+                    baked.extend(Footprint._bakeNodes(node.getNormalChilds(), transformations))
+                    continue
+            else:
+                for transformation in transformations:
+                    if isinstance(transformation, Translation):
+                        node.translate(Vector2D(transformation.offset_x, transformation.offset_y))
+                    else:
+                        # Rotation turns the coordinate system, which rotates the nodes the other way round
+                        node.rotate(-transformation.rotation)
+
+            Footprint._bakeChilds(node, transformations)
+            baked.append(node)
+
+        return baked
+
+    def addCourtyard(self, **kwargs):
+        r"""Add a courtyard around all pads, holes and the body of the footprint
+
+        :param \**kwargs:
+            See below
+
+        :Keyword Arguments:
+            * *body_layers* (``list(str)``) --
+              layers which describe the body of the part (default: ['F.Fab', 'B.Fab'])
+            * *mode* (``Courtyard.MODE_RECT``, ``Courtyard.MODE_POLYGON``) --
+              create a rectangle or a tight convex polygon (default: ``Courtyard.MODE_RECT``)
+            * *clearance* (``float``) --
+              distance between the outline and the courtyard (default: 0.25)
+            * *grid* (``float``) --
+              grid on which the courtyard is snapped to (default: 0.01)
+            * *layer* (``str``) --
+              layer on which the courtyard is drawn (default: 'F.CrtYd')
+
+        :return: the added ``Courtyard`` node
+
+        :Example:
+
+        >>> from KicadModTree import *
+        >>> kicad_mod = Footprint("example_footprint")
+        >>> kicad_mod.append(Pad(number=1, type=Pad.TYPE_THT, shape=Pad.SHAPE_RECT,
+        ...                      at=[0, 0], size=[2, 2], drill=1.2, layers=Pad.LAYERS_THT))
+        >>> kicad_mod.addCourtyard(clearance=0.5)
+        """
+        from KicadModTree.nodes.specialized.Courtyard import Courtyard
+
+        courtyard_kwargs = dict(kwargs)
+        body_layers = courtyard_kwargs.pop('body_layers', ['F.Fab', 'B.Fab'])
+
+        courtyard = Courtyard(points=self.getExtents(body_layers), **courtyard_kwargs)
+        self.append(courtyard)
+
+        return courtyard
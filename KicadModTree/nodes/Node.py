@@ -18,6 +18,61 @@ from copy import copy, deepcopy
 from KicadModTree.Vector import *
 
 
+_ATOM_TYPES = frozenset([int, float, complex, str, bytes, bool, type(None), type])
+_MISSING = object()
+
+
+def _cloneValue(value, memo):
+    # structural copy of a value: immutable values are shared, everything else gets a new instance. Objects which
+    # implement _sharedCopy (like PolygonPoints) decide themselves what both copies can share.
+    value_type = value.__class__
+    if value_type in _ATOM_TYPES:
+        return value
+
+    clone = memo.get(id(value), _MISSING)
+    if clone is not _MISSING:
+        return clone
+
+    if value_type is list:
+        clone = []
+        memo[id(value)] = clone
+        clone.extend([item if item.__class__ in _ATOM_TYPES else _cloneValue(item, memo) for item in value])
+    elif value_type is tuple or value_type is frozenset:
+        items = [item if item.__class__ in _ATOM_TYPES else _cloneValue(item, memo) for item in value]
+        if all(item is original for item, original in zip(items, value)):
+            clone = value
+        else:
+            clone = value_type(items)
+        memo[id(value)] = clone
+    elif value_type is dict:
+        clone = {}
+        memo[id(value)] = clone
+        for key, item in value.items():
+            if key.__class__ not in _ATOM_TYPES:
+                key = _cloneValue(key, memo)
+            clone[key] = item if item.__class__ in _ATOM_TYPES else _cloneValue(item, memo)
+    elif hasattr(value_type, '_sharedCopy'):
+        clone = value._sharedCopy()
+        memo[id(value)] = clone
+    elif hasattr(value, '__dict__') and not callable(value):
+        clone = value_type.__new__(value_type)
+        memo[id(value)] = clone
+        state = clone.__dict__
+        for name, item in value.__dict__.items():
+            if item.__class__ in _ATOM_TYPES:
+                state[name] = item
+            elif name == '_parent':
+                # parents outside of the copied tree are kept
+                state[name] = memo.get(id(item), item)
+            else:
+                state[name] = _cloneValue(item, memo)
+    else:
+        clone = deepcopy(value, {})
+        memo[id(value)] = clone
+
+    return clone
+
+
 class MultipleParentsError(RuntimeError):
     def __init__(self, message):
 
@@ -35,7 +90,8 @@ class RecursionDetectedError(RuntimeError):
 class Node(object):
     def __init__(self):
         self._parent = None
-        self._childs = []
+        # childs in the order they were added, stored as dict keys for constant time membership checks and removal
+        self._childs = {}
 
     def append(self, node):
         '''
@@ -47,7 +103,7 @@ class Node(object):
         if node._parent:
             raise MultipleParentsError('muliple parents are not allowed!')
 
-        self._childs.append(node)
+        self._childs[node] = None
 
         node._parent = self
 
@@ -55,7 +111,7 @@ class Node(object):
         '''
         add list of nodes to child
         '''
-        new_nodes = []
+        new_nodes = {}
         for node in nodes:
             if not isinstance(node, Node):
                 raise TypeError('invalid object, has to be based on Node')
@@ -63,13 +119,13 @@ class Node(object):
             if node._parent or node in new_nodes:
                 raise MultipleParentsError('muliple parents are not allowed!')
 
-            new_nodes.append(node)
+            new_nodes[node] = None
 
         # when all went smooth by now, we can set the parent nodes to ourself
         for node in new_nodes:
             node._parent = self
 
-        self._childs.extend(new_nodes)
+        self._childs.update(new_nodes)
 
     def remove(self, node):
         '''
@@ -78,11 +134,24 @@ class Node(object):
         if not isinstance(node, Node):
             raise TypeError('invalid object, has to be based on Node')
 
-        while node in self._childs:
-            self._childs.remove(node)
+        self._childs.pop(node, None)
 
         node._parent = None
 
+    def removeMultiple(self, nodes):
+        '''
+        remove list of childs from node
+        '''
+        nodes = list(nodes)
+        for node in nodes:
+            if not isinstance(node, Node):
+                raise TypeError('invalid object, has to be based on Node')
+
+        childs = self._childs
+        for node in nodes:
+            childs.pop(node, None)
+            node._parent = None
+
     def insert(self, node):
         '''
         moving all childs into the node, and using the node as new parent of those childs
@@ -90,16 +159,21 @@ class Node(object):
         if not isinstance(node, Node):
             raise TypeError('invalid object, has to be based on Node')
 
-        for child in copy(self._childs):
-            self.remove(child)
-            node.append(child)
+        childs = list(self._childs)
+        self.removeMultiple(childs)
+        node.extend(childs)
 
         self.append(node)
 
     def copy(self):
-        copy = deepcopy(self)
-        copy._parent = None
-        return copy
+        '''
+        copy node including all childs, the copy has no parent
+
+        Only the structure is copied: numbers, strings and tuples (like the layers of pads) are shared with the
+        original, vectors and lists are new instances and point lists (``PolygonPoints``) are shared until either
+        of both nodes modifies them.
+        '''
+        return _cloneValue(self, {id(self._parent): None})
 
     def serialize(self):
         nodes = [self]
@@ -107,11 +181,21 @@ class Node(object):
             nodes += child.serialize()
         return nodes
 
+    def serializeShapes(self):
+        '''
+        like serialize, but nodes which draw line segments (like PolygoneLine) are returned instead of their
+        Line childs, which are then never created
+        '''
+        nodes = [self]
+        for child in self.getAllChilds():
+            nodes += child.serializeShapes()
+        return nodes
+
     def getNormalChilds(self):
         '''
         Get all normal childs of this node
         '''
-        return self._childs
+        return list(self._childs)
 
     def getVirtualChilds(self):
         '''
@@ -190,40 +274,90 @@ class Node(object):
 
         return "*"
 
-    def getRenderTree(self, rendered_nodes=None):
+    def iterRenderTree(self, virtual=False, max_depth=None, node_types=None, rendered_nodes=None):
         '''
-        print render tree
+        iterate over the lines of the render tree, one node after the other
+
+        :param virtual: include virtual childs (default: False)
+        :param max_depth: childs deeper than this are only counted, not rendered (default: None, no limit)
+        :param node_types: only render nodes which are instances of these types, the childs of other nodes are
+                           still rendered (default: None, all nodes)
+        '''
+        for node, lines in self._iterRenderTreeNodes(virtual, max_depth, node_types, rendered_nodes):
+            for line in lines:
+                yield line
+
+    def _iterRenderTreeNodes(self, virtual, max_depth, node_types, rendered_nodes):
+        '''
+        iterate over the render tree as pairs of a node and its lines. Summaries of hidden nodes are yielded
+        with None as node.
         '''
         if rendered_nodes is None:
             rendered_nodes = set()
 
-        if self in rendered_nodes:
-            raise RecursionDetectedError('recursive definition of render tree!')
+        stack = [(self, 0)]
+        while stack:
+            node, depth = stack.pop()
 
-        rendered_nodes.add(self)
+            if node in rendered_nodes:
+                raise RecursionDetectedError('recursive definition of render tree!')
 
-        tree_str = "{0} {1}".format(self._getRenderTreeSymbol(), self._getRenderTreeText())
-        for child in self.getNormalChilds():
-            tree_str += '\n  '
-            tree_str += '  '.join(child.getRenderTree(rendered_nodes).splitlines(True))
+            rendered_nodes.add(node)
 
-        return tree_str
+            indent = '  ' * depth
+            is_rendered = node_types is None or isinstance(node, node_types)
+            if is_rendered:
+                text = "{0} {1}".format(node._getRenderTreeSymbol(), node._getRenderTreeText())
+                yield node, [indent + line for line in text.splitlines()]
 
-    def getCompleteRenderTree(self, rendered_nodes=None):
-        '''
-        print virtual render tree
-        '''
-        if rendered_nodes is None:
-            rendered_nodes = set()
+            childs = node.getAllChilds() if virtual else node.getNormalChilds()
+            if max_depth is not None and depth >= max_depth:
+                hidden_nodes = node._countRenderTreeNodes(virtual, node_types)
+                if is_rendered:
+                    # the node itself was already rendered
+                    hidden_nodes -= 1
+                if hidden_nodes:
+                    yield None, ['{0}  ... {1} more nodes'.format(indent, hidden_nodes)]
+                continue
 
-        if self in rendered_nodes:
-            raise RecursionDetectedError('recursive definition of render tree!')
+            stack.extend((child, depth + 1) for child in reversed(childs))
 
-        rendered_nodes.add(self)
+    def _countRenderTreeNodes(self, virtual=False, node_types=None):
+        '''
+        number of nodes in the render tree of this node, including the node itself
+        '''
+        count = 0
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node_types is None or isinstance(node, node_types):
+                count += 1
+            stack.extend(node.getAllChilds() if virtual else node.getNormalChilds())
+        return count
+
+    def writeRenderTree(self, file, virtual=False, max_depth=None, node_types=None, rendered_nodes=None):
+        '''
+        write render tree line by line into a file like object, and return the number of rendered nodes.
+        Nodes which are only summarized because of max_depth are not counted.
+        See iterRenderTree for the supported arguments.
+        '''
+        count = 0
+        for node, lines in self._iterRenderTreeNodes(virtual, max_depth, node_types, rendered_nodes):
+            for line in lines:
+                file.write(line)
+                file.write('\n')
+            if node is not None:
+                count += 1
+        return count
 
-        tree_str = "{0} {1}".format(self._getRenderTreeSymbol(), self._getRenderTreeText())
-        for child in self.getAllChilds():
-            tree_str += '\n  '
-            tree_str += '  '.join(child.getCompleteRenderTree(rendered_nodes).splitlines(True))
+    def getRenderTree(self, rendered_nodes=None):
+        '''
+        print render tree
+        '''
+        return '\n'.join(self.iterRenderTree(rendered_nodes=rendered_nodes))
 
-        return tree_str
+    def getCompleteRenderTree(self, rendered_nodes=None):
+        '''
+        print virtual render tree
+        '''
+        return '\n'.join(self.iterRenderTree(virtual=True, rendered_nodes=rendered_nodes))
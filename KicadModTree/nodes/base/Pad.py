@@ -14,6 +14,8 @@
 # (C) 2016 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
 # (C) 2018 by Rene Poeschl, github @poeschlr
 
+from copy import copy
+
 from KicadModTree.util.paramUtil import *
 from KicadModTree.Vector import *
 from KicadModTree.nodes.Node import Node
@@ -24,6 +26,29 @@ from KicadModTree.nodes.base.Line import Line
 from KicadModTree.nodes.base.Polygon import Polygon
 
 
+def _copyVector(value):
+    # unchecked conversion of a number, [x, y] or vector into a new Vector2D
+    vector = Vector2D.__new__(Vector2D)
+    if isinstance(value, Vector2D):
+        vector.x = value.x
+        vector.y = value.y
+    elif value.__class__ is float or value.__class__ is int:
+        vector.x = vector.y = float(value)
+    else:
+        vector.x = float(value[0])
+        vector.y = float(value[1])
+    return vector
+
+
+_LAYER_SETS = {}
+
+
+def _internLayers(layers):
+    # all pads with the same layers share one immutable tuple
+    layers = tuple(layers)
+    return _LAYER_SETS.setdefault(layers, layers)
+
+
 class RoundRadiusHandler(object):
     r"""Handles round radius setting of a pad
 
@@ -156,6 +181,9 @@ class Pad(Node):
           offset of the pad
         * *drill* (``float``, ``Vector2D``) --
           drill-size of the pad
+        * *rect_delta* (``Vector2D``) --
+          difference of the sides of the trapezoid, only one of x and y may be set (default: [0, 0]).
+          Ignored for every shape except trapezoid.
 
         * *radius_ratio* (``float``) --
           The radius ratio of the rounded rectangle.
@@ -197,7 +225,7 @@ class Pad(Node):
     TYPE_SMT = 'smd'
     TYPE_CONNECT = 'connect'
     TYPE_NPTH = 'np_thru_hole'
-    _TYPES = [TYPE_THT, TYPE_SMT, TYPE_CONNECT, TYPE_NPTH]
+    _TYPES = (TYPE_THT, TYPE_SMT, TYPE_CONNECT, TYPE_NPTH)
 
     SHAPE_CIRCLE = 'circle'
     SHAPE_OVAL = 'oval'
@@ -205,8 +233,9 @@ class Pad(Node):
     SHAPE_ROUNDRECT = 'roundrect'
     SHAPE_TRAPEZE = 'trapezoid'
     SHAPE_CUSTOM = 'custom'
-    _SHAPES = [SHAPE_CIRCLE, SHAPE_OVAL, SHAPE_RECT, SHAPE_ROUNDRECT, SHAPE_TRAPEZE, SHAPE_CUSTOM]
+    _SHAPES = (SHAPE_CIRCLE, SHAPE_OVAL, SHAPE_RECT, SHAPE_ROUNDRECT, SHAPE_TRAPEZE, SHAPE_CUSTOM)
 
+    # pads store their layers as shared tuples (see _internLayers), so a pad can not change the layers of other pads
     LAYERS_SMT = ['F.Cu', 'F.Mask', 'F.Paste']
     LAYERS_THT = ['*.Cu', '*.Mask']
     LAYERS_NPTH = ['*.Cu', '*.Mask']
@@ -231,6 +260,7 @@ class Pad(Node):
         self._initPosition(**kwargs)
         self._initSize(**kwargs)
         self._initOffset(**kwargs)
+        self._initRectDelta(**kwargs)
         self._initDrill(**kwargs)  # requires pad type and offset
         self._initSolderPasteMargin(**kwargs)
         self._initSolderPasteMarginRatio(**kwargs)
@@ -257,6 +287,89 @@ class Pad(Node):
             for p in kwargs['primitives']:
                 self.addPrimitive(p)
 
+    @classmethod
+    def fast(cls, **kwargs):
+        r"""Create a pad from already validated parameters
+
+        Takes the same parameters as the normal constructor, but does not check them, which makes creating many
+        pads several times faster. ``at``, ``size``, ``drill`` and ``offset`` are copied, so they can be shared
+        by multiple pads.
+        Custom pads are not supported, use the normal constructor for them.
+
+        :param \**kwargs:
+            See the normal constructor. *type*, *shape*, *at*, *size* and *layers* are required,
+            as well as *drill* for THT and NPTH pads.
+
+        :Example:
+
+        >>> from KicadModTree import *
+        >>> Pad.fast(number=1, type=Pad.TYPE_THT, shape=Pad.SHAPE_RECT,
+        ...          at=[0, 0], size=[2, 2], drill=1.2, layers=Pad.LAYERS_THT)
+        """
+        pad = cls.__new__(cls)
+        pad._parent = None
+        pad._childs = {}
+
+        pad.number = kwargs.get('number', "")
+        pad.type = pad_type = kwargs['type']
+        pad.at = _copyVector(kwargs['at'])
+        pad.rotation = kwargs.get('rotation', 0)
+        pad.size = _copyVector(kwargs['size'])
+        pad.offset = _copyVector(kwargs.get('offset', 0))
+        pad.rect_delta = _copyVector(kwargs.get('rect_delta', 0))
+        if pad_type == Pad.TYPE_THT or pad_type == Pad.TYPE_NPTH:
+            pad.drill = _copyVector(kwargs['drill'])
+        else:
+            pad.drill = None
+        pad.solder_paste_margin = kwargs.get('solder_paste_margin', 0)
+        pad.solder_paste_margin_ratio = kwargs.get('solder_paste_margin_ratio', 0)
+        pad.solder_mask_margin = kwargs.get('solder_mask_margin', 0)
+        pad.layers = _internLayers(kwargs['layers'])
+        pad._initMirror(**kwargs)
+
+        shape = kwargs['shape']
+        if shape == Pad.SHAPE_OVAL and pad.size.x == pad.size.y:
+            shape = Pad.SHAPE_CIRCLE
+        pad.shape = shape
+
+        if shape == Pad.SHAPE_OVAL or shape == Pad.SHAPE_CIRCLE:
+            pad.radius_ratio = 0.5
+        elif shape == Pad.SHAPE_ROUNDRECT:
+            # may change the shape to a rectangle
+            pad._initRadiusRatio(**kwargs)
+        elif shape == Pad.SHAPE_CUSTOM:
+            raise ValueError('custom pads are not supported by Pad.fast()')
+        else:
+            pad.radius_ratio = 0
+
+        return pad
+
+    def _replicate(self, number, at):
+        # copy of this (already validated) pad at another position, mirrored like the original
+        pad = self.__class__.__new__(self.__class__)
+        pad.__dict__.update(self.__dict__)
+        pad._parent = None
+        pad._childs = {}
+
+        pad.number = number
+        pad.at = _copyVector(at)
+        if self.mirror[0] is not None:
+            pad.at.x = 2 * self.mirror[0] - pad.at.x
+        if self.mirror[1] is not None:
+            pad.at.y = 2 * self.mirror[1] - pad.at.y
+        pad.size = _copyVector(self.size)
+        pad.offset = _copyVector(self.offset)
+        pad.rect_delta = _copyVector(self.rect_delta)
+        if self.drill is not None:
+            pad.drill = _copyVector(self.drill)
+        pad.mirror = list(self.mirror)
+        if 'round_radius_handler' in self.__dict__:
+            pad.round_radius_handler = copy(self.round_radius_handler)
+        if 'primitives' in self.__dict__:
+            pad.primitives = list(self.primitives)
+
+        return pad
+
     def _initMirror(self, **kwargs):
         self.mirror = [None, None]
         if 'x_mirror' in kwargs and type(kwargs['x_mirror']) in [float, int]:
@@ -303,6 +416,9 @@ class Pad(Node):
     def _initOffset(self, **kwargs):
         self.offset = Vector2D(kwargs.get('offset', [0, 0]))
 
+    def _initRectDelta(self, **kwargs):
+        self.rect_delta = Vector2D(kwargs.get('rect_delta', [0, 0]))
+
     def _initDrill(self, **kwargs):
         if self.type in [Pad.TYPE_THT, Pad.TYPE_NPTH]:
             if not kwargs.get('drill'):
@@ -325,7 +441,7 @@ class Pad(Node):
     def _initLayers(self, **kwargs):
         if not kwargs.get('layers'):
             raise KeyError('layers not declared (like "layers=[\'*.Cu\', \'*.Mask\', \'F.SilkS\']")')
-        self.layers = kwargs.get('layers')
+        self.layers = _internLayers(kwargs.get('layers'))
 
     def _initRadiusRatio(self, **kwargs):
         if('round_radius_handler' in kwargs):
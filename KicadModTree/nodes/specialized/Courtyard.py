@@ -0,0 +1,280 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2016 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+from __future__ import division
+
+from math import cos, sin, radians
+
+from KicadModTree.Vector import *
+from KicadModTree.nodes.Node import Node
+from KicadModTree.nodes.base.Pad import Pad
+from KicadModTree.nodes.base.Arc import Arc
+from KicadModTree.nodes.base.Circle import Circle
+from KicadModTree.nodes.base.Line import Line
+from KicadModTree.nodes.base.Polygon import Polygon
+from KicadModTree.util.kicad_util import sinCos
+from KicadModTree.util.paramUtil import round_to
+from .RectLine import RectLine
+from .PolygoneLine import PolygoneLine
+
+# a regular octagon with flat sides facing the axes which encloses the unit circle
+# (its bounding box is exactly the bounding box of the circle)
+_OCTAGON_RADIUS = 1 / cos(radians(22.5))
+_OCTAGON = [(_OCTAGON_RADIUS * cos(radians(22.5 + 45 * i)), _OCTAGON_RADIUS * sin(radians(22.5 + 45 * i)))
+            for i in range(8)]
+
+
+def _circlePoints(cx, cy, r):
+    return [(cx + r * dx, cy + r * dy) for dx, dy in _OCTAGON]
+
+
+def _padOutlinePoints(pad):
+    position, rotation = pad.getRealPosition(pad.at, pad.rotation)
+
+    # pad rotation is the wrong way round compared to Vector2D.rotate
+    s, c = sinCos(-rotation)
+
+    def transform(x, y):
+        return (position.x + c * x - s * y, position.y + s * x + c * y)
+
+    ox, oy = pad.offset.x, pad.offset.y
+    hx, hy = pad.size.x / 2, pad.size.y / 2
+
+    if pad.shape == Pad.SHAPE_CIRCLE:
+        local = _circlePoints(ox, oy, hx)
+    elif pad.shape == Pad.SHAPE_OVAL:
+        if hx > hy:
+            local = _circlePoints(ox - hx + hy, oy, hy) + _circlePoints(ox + hx - hy, oy, hy)
+        else:
+            local = _circlePoints(ox, oy - hy + hx, hx) + _circlePoints(ox, oy + hy - hx, hx)
+    elif pad.shape == Pad.SHAPE_TRAPEZE:
+        # corners like KiCad calculates them, the delta widens one side and narrows the opposite one
+        dx, dy = pad.rect_delta.x / 2, pad.rect_delta.y / 2
+        local = [(ox - hx - dy, oy + hy + dx), (ox - hx + dy, oy - hy - dx),
+                 (ox + hx - dy, oy - hy + dx), (ox + hx + dy, oy + hy - dx)]
+    else:
+        local = [(ox - hx, oy - hy), (ox + hx, oy - hy), (ox + hx, oy + hy), (ox - hx, oy + hy)]
+
+    if pad.shape == Pad.SHAPE_CUSTOM:
+        for p in pad.primitives:
+            for primitive in p.serialize():
+                for x, y in getNodeOutlinePoints(primitive, resolve=False):
+                    local.append((ox + x, oy + y))
+
+    points = [transform(x, y) for x, y in local]
+
+    if pad.drill is not None:
+        points.extend(_circlePoints(position.x, position.y, max(pad.drill.x, pad.drill.y) / 2))
+
+    return points
+
+
+def getNodeOutlinePoints(node, resolve=True):
+    r"""Get a list of points whose convex hull encloses the given base node
+
+    :param node: the base node (``Pad``, ``Line``, ``Arc``, ``Circle`` or ``Polygon``), or a ``PolygoneLine``
+    :param resolve: apply the transformations of the parent nodes (default: True)
+    :return: list of ``(x, y)`` tuples, empty for nodes without outline (``Text``, ``Model``)
+    """
+    if resolve:
+        def real(point):
+            p = node.getRealPosition(point)
+            return (p['x'], p['y'])
+    else:
+        def real(point):
+            return (point[0], point[1])
+
+    if isinstance(node, Pad):
+        return _padOutlinePoints(node)
+
+    if isinstance(node, Line):
+        return [real(node.start_pos), real(node.end_pos)]
+
+    if isinstance(node, Circle):
+        cx, cy = real(node.center_pos)
+        return _circlePoints(cx, cy, node.radius)
+
+    if isinstance(node, Arc):
+        # the extreme points depend on the orientation of the arc in the footprint, so they are searched after
+        # applying the transformations of the parents (which only rotate, and keep the direction of the arc)
+        start = Vector2D(real(node.getStartPoint()))
+        center = Vector2D(real(node.center_pos))
+        points = [(start.x, start.y), real(node.getEndPoint())]
+
+        # add the extreme points of all quadrants the arc is passing through
+        radius, start_angle = start.to_polar(origin=center)
+        lower, upper = sorted([start_angle, start_angle + node.angle])
+        for quadrant in range(-8, 9):
+            if lower < quadrant * 90 < upper:
+                extreme = Vector2D.from_polar(radius, quadrant * 90, origin=center)
+                points.append((extreme.x, extreme.y))
+        return points
+
+    if isinstance(node, Polygon) or isinstance(node, PolygoneLine):
+        return [real(n) for n in node.nodes]
+
+    return []
+
+
+def _convexHull(points):
+    # Andrew's monotone chain algorithm
+    points = sorted(set(points))
+    if len(points) <= 2:
+        return points
+
+    def cross(o, a, b):
+        return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+    lower = []
+    for p in points:
+        while len(lower) >= 2 and cross(lower[-2], lower[-1], p) <= 0:
+            lower.pop()
+        lower.append(p)
+
+    upper = []
+    for p in reversed(points):
+        while len(upper) >= 2 and cross(upper[-2], upper[-1], p) <= 0:
+            upper.pop()
+        upper.append(p)
+
+    return lower[:-1] + upper[:-1]
+
+
+def _removeCollinear(nodes):
+    result = list(nodes)
+    i = 0
+    while len(result) > 3 and i < len(result):
+        prev, cur, nxt = result[i - 1], result[i], result[(i + 1) % len(result)]
+        if abs((cur.x - prev.x) * (nxt.y - prev.y) - (cur.y - prev.y) * (nxt.x - prev.x)) < 1e-9:
+            result.pop(i)
+        else:
+            i += 1
+    return result
+
+
+def _snapOutward(value, grid, direction):
+    snapped = round_to(value, grid)
+    if direction < 0 and snapped > value + 1e-9:
+        snapped -= grid
+    elif direction > 0 and snapped < value - 1e-9:
+        snapped += grid
+    return round(snapped, 6)
+
+
+class Courtyard(Node):
+    r"""Add a courtyard which encloses the given outline points to the render tree
+
+    Normally, this class is created by ``Footprint.addCourtyard``, which collects the outline of the footprint
+
+    :param \**kwargs:
+        See below
+
+    :Keyword Arguments:
+        * *points* (``list(Vector2D)``) --
+          points which have to be enclosed by the courtyard
+        * *mode* (``Courtyard.MODE_RECT``, ``Courtyard.MODE_POLYGON``) --
+          create a rectangle or a tight convex polygon (default: ``Courtyard.MODE_RECT``)
+        * *clearance* (``float``) --
+          distance between the outline and the courtyard (default: 0.25)
+        * *grid* (``float``) --
+          grid on which the courtyard is snapped to, always rounding outwards (default: 0.01)
+        * *layer* (``str``) --
+          layer on which the courtyard is drawn (default: 'F.CrtYd')
+        * *width* (``float``) --
+          width of the line (default: None, which means auto detection)
+
+    :Example:
+
+    >>> from KicadModTree import *
+    >>> Courtyard(points=[[-2, -1], [2, 1]], clearance=0.25, layer='F.CrtYd')
+    """
+
+    MODE_RECT = 'rect'
+    MODE_POLYGON = 'polygon'
+    _MODES = [MODE_RECT, MODE_POLYGON]
+
+    def __init__(self, **kwargs):
+        Node.__init__(self)
+
+        self.mode = kwargs.get('mode', Courtyard.MODE_RECT)
+        if self.mode not in Courtyard._MODES:
+            raise ValueError('{mode} is an invalid mode for courtyards'.format(mode=self.mode))
+
+        self.clearance = kwargs.get('clearance', 0.25)
+        self.grid = kwargs.get('grid', 0.01)
+        self.layer = kwargs.get('layer', 'F.CrtYd')
+        self.width = kwargs.get('width')
+
+        points = [(p[0], p[1]) for p in kwargs['points']]
+        if not points:
+            raise ValueError('a courtyard requires at least one point to enclose')
+
+        if self.mode == Courtyard.MODE_RECT:
+            self.nodes = self._calculateRect(points)
+        else:
+            self.nodes = self._calculatePolygon(points)
+
+        self.virtual_childs = self._createChildNodes(self.nodes)
+
+    def _calculateRect(self, points):
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+
+        start = Vector2D(_snapOutward(min(xs) - self.clearance, self.grid, -1),
+                         _snapOutward(min(ys) - self.clearance, self.grid, -1))
+        end = Vector2D(_snapOutward(max(xs) + self.clearance, self.grid, 1),
+                       _snapOutward(max(ys) + self.clearance, self.grid, 1))
+
+        return [start, end]
+
+    def _calculatePolygon(self, points):
+        hull = _convexHull(points)
+
+        # inflate by the clearance, using the enclosing octagon of the clearance circle
+        inflated = []
+        for x, y in hull:
+            inflated.extend(_circlePoints(x, y, self.clearance))
+        hull = _convexHull(inflated)
+
+        cx = sum(p[0] for p in hull) / len(hull)
+        cy = sum(p[1] for p in hull) / len(hull)
+
+        nodes = []
+        for x, y in hull:
+            node = Vector2D(_snapOutward(x, self.grid, x - cx), _snapOutward(y, self.grid, y - cy))
+            if not nodes or node != nodes[-1]:
+                nodes.append(node)
+        if len(nodes) > 1 and nodes[0] == nodes[-1]:
+            nodes.pop()
+
+        return _removeCollinear(nodes)
+
+    def _createChildNodes(self, nodes):
+        if self.mode == Courtyard.MODE_RECT:
+            child = RectLine(start=nodes[0], end=nodes[1], layer=self.layer, width=self.width)
+        else:
+            child = PolygoneLine(nodes=nodes + [nodes[0]], layer=self.layer, width=self.width)
+        child._parent = self
+
+        return [child]
+
+    def getVirtualChilds(self):
+        return self.virtual_childs
+
+    def _getRenderTreeText(self):
+        render_text = Node._getRenderTreeText(self)
+        render_text += " [mode: {mode}, clearance: {clearance}, layer: {layer}]".format(
+            mode=self.mode, clearance=self.clearance, layer=self.layer)
+
+        return render_text
@@ -26,7 +26,6 @@ from KicadModTree.nodes.specialized.PadArray import *
 from KicadModTree.nodes.Node import Node
 from math import sqrt, floor
 from copy import copy
-import traceback
 
 
 class ExposedPad(Node):
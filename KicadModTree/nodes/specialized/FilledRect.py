@@ -35,7 +35,9 @@ class FilledRect(Node):
         * *layer* (``str``) --
           layer on which the rect is drawn (default: 'F.SilkS')
         * *width* (``float``) --
-          width of the outer line (default: 0.15)
+          width of the outer line (default: None, which means auto detection)
+        * *mode* (``RectFill.MODE_SOLID``, ``RectFill.MODE_HATCHED``) --
+          fill the rect with a single polygon, or with one line every 0.12 (default: ``RectFill.MODE_SOLID``)
 
     :Example:
 
@@ -49,19 +51,58 @@ class FilledRect(Node):
         self.end_pos = Vector2D(kwargs['end'])
 
         self.layer = kwargs.get('layer', 'F.SilkS')
-        self.width = kwargs.get('width', 0.12)  # TODO: better variation to get line width
+        self.width = kwargs.get('width')
 
-        rect_line = RectLine(**kwargs)
-        rect_line._parent = self
+        if kwargs.get('mode', RectFill.MODE_SOLID) == RectFill.MODE_SOLID:
+            # the outline of the filled polygon is the outer line of the rect
+            rect_fill = RectFill(**dict(kwargs, width=kwargs.get('width')))
+            rect_fill._parent = self
 
-        rect_fill = RectFill(**kwargs)
-        rect_fill._parent = self
+            self.virtual_childs = [rect_fill]
+        else:
+            rect_line = RectLine(**kwargs)
+            rect_line._parent = self
 
-        self.virtual_childs = [rect_line, rect_fill]
+            rect_fill = RectFill(**kwargs)
+            rect_fill._parent = self
+
+            self.virtual_childs = [rect_line, rect_fill]
 
     def getVirtualChilds(self):
         return self.virtual_childs
 
+    def rotate(self, angle, origin=(0, 0), use_degrees=True):
+        r""" Rotate filled rect around given origin
+
+        :params:
+            * *angle* (``float``)
+                rotation angle
+            * *origin* (``Vector2D``)
+                origin point for the rotation. default: (0, 0)
+            * *use_degrees* (``boolean``)
+                rotation angle is given in degrees. default:True
+        """
+
+        self.start_pos.rotate(angle=angle, origin=origin, use_degrees=use_degrees)
+        self.end_pos.rotate(angle=angle, origin=origin, use_degrees=use_degrees)
+        for child in self.virtual_childs:
+            child.rotate(angle=angle, origin=origin, use_degrees=use_degrees)
+        return self
+
+    def translate(self, distance_vector):
+        r""" Translate filled rect
+
+        :params:
+            * *distance_vector* (``Vector2D``)
+                2D vector defining by how much and in what direction to translate.
+        """
+
+        self.start_pos += distance_vector
+        self.end_pos += distance_vector
+        for child in self.virtual_childs:
+            child.translate(distance_vector)
+        return self
+
     def _getRenderTreeText(self):
         render_text = Node._getRenderTreeText(self)
 
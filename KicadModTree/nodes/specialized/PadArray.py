@@ -242,6 +242,7 @@ class PadArray(Node):
         else:
             delta_pos = Vector2D(0, 0)
 
+        templates = {}
         for i, number in enumerate(pad_numbers):
             includePad = True
 
@@ -290,7 +291,17 @@ class PadArray(Node):
                                 **current_pad_params
                                 ))
                         continue
-                pads.append(Pad(number=number, at=current_pad_pos, **current_pad_params))
+
+                # pads with the same parameters are validated once and then replicated
+                template_key = (current_pad_params is end_pad_params, current_pad_params['shape'],
+                                current_pad_params.get('radius_ratio'), current_pad_params.get('maximum_radius'))
+                template = templates.get(template_key)
+                if template is None:
+                    template = templates[template_key] = Pad(number=number, at=current_pad_pos,
+                                                             **current_pad_params)
+                    pads.append(template)
+                else:
+                    pads.append(template._replicate(number, current_pad_pos))
 
         return pads
 
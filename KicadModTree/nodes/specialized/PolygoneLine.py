@@ -47,11 +47,20 @@ class PolygoneLine(Node):
 
         self._initPolyPoint(**kwargs)
 
-        self.virtual_childs = self._createChildNodes(self.nodes)
+        # the Line childs are only created when they are requested, file handlers write the segments directly
+        self._virtual_childs = None
 
     def _initPolyPoint(self, **kwargs):
         self.nodes = PolygonPoints(**kwargs)
 
+    def getSegments(self):
+        r"""Get the line segments of the polygone line, without creating Line nodes
+
+        :return: list of ``(start, end)`` tuples of ``Vector2D``, not transformed by the parent nodes
+        """
+        nodes = list(self.nodes)
+        return list(zip(nodes, nodes[1:]))
+
     def _createChildNodes(self, polygone_line):
         nodes = []
 
@@ -62,9 +71,53 @@ class PolygoneLine(Node):
 
         return nodes
 
+    @property
+    def virtual_childs(self):
+        if self._virtual_childs is None:
+            self._virtual_childs = self._createChildNodes(self.nodes)
+        return self._virtual_childs
+
+    @virtual_childs.setter
+    def virtual_childs(self, virtual_childs):
+        self._virtual_childs = virtual_childs
+
     def getVirtualChilds(self):
         return self.virtual_childs
 
+    def rotate(self, angle, origin=(0, 0), use_degrees=True):
+        r""" Rotate polygone line around given origin
+
+        :params:
+            * *angle* (``float``)
+                rotation angle
+            * *origin* (``Vector2D``)
+                origin point for the rotation. default: (0, 0)
+            * *use_degrees* (``boolean``)
+                rotation angle is given in degrees. default:True
+        """
+
+        self.nodes.rotate(angle=angle, origin=origin, use_degrees=use_degrees)
+        self._virtual_childs = None
+        return self
+
+    def translate(self, distance_vector):
+        r""" Translate polygone line
+
+        :params:
+            * *distance_vector* (``Vector2D``)
+                2D vector defining by how much and in what direction to translate.
+        """
+
+        self.nodes.translate(distance_vector)
+        self._virtual_childs = None
+        return self
+
+    def serializeShapes(self):
+        nodes = [self]
+        for child in self.getNormalChilds():
+            nodes += child.serializeShapes()
+        return nodes
+
     def _getRenderTreeText(self):
         render_text = Node._getRenderTreeText(self)
         render_text += " ["
@@ -15,7 +15,7 @@
 
 from KicadModTree.Vector import *
 from KicadModTree.nodes.Node import Node
-from KicadModTree.nodes.base import Line
+from KicadModTree.nodes.base import Line, Polygon
 
 
 class RectFill(Node):
@@ -34,7 +34,9 @@ class RectFill(Node):
         * *layer* (``str``) --
           layer on which the rect fill is drawn (default: 'F.SilkS')
         * *width* (``float``) --
-          width of the filling lines (default: 0.12)
+          width of the outline of the filling, or of the filling lines in hatched mode (default: 0.12)
+        * *mode* (``RectFill.MODE_SOLID``, ``RectFill.MODE_HATCHED``) --
+          fill the rect with a single polygon, or with one line every ``width`` (default: ``RectFill.MODE_SOLID``)
 
     :Example:
 
@@ -42,15 +44,38 @@ class RectFill(Node):
     >>> RectFill(start=[-3, -2], end=[3, 2], layer='F.SilkS')
     """
 
+    MODE_SOLID = 'solid'
+    MODE_HATCHED = 'hatched'
+    _MODES = [MODE_SOLID, MODE_HATCHED]
+
     def __init__(self, **kwargs):
         Node.__init__(self)
+
+        self.mode = kwargs.get('mode', RectFill.MODE_SOLID)
+        if self.mode not in RectFill._MODES:
+            raise ValueError('{mode} is an invalid mode for rect fills'.format(mode=self.mode))
+
         self.start_pos = Vector2D(kwargs['start'])
         self.end_pos = Vector2D(kwargs['end'])
 
         self.layer = kwargs.get('layer', 'F.SilkS')
         self.width = kwargs.get('width', 0.12)  # TODO: auto detection
 
-        self.virtual_childs = self._createChildNodes(self.start_pos, self.end_pos, self.layer, self.width)
+        if self.mode == RectFill.MODE_SOLID:
+            self.virtual_childs = self._createPolygon(self.start_pos, self.end_pos, self.layer, self.width)
+        else:
+            self.virtual_childs = self._createChildNodes(self.start_pos, self.end_pos, self.layer, self.width)
+
+    def _createPolygon(self, start_pos, end_pos, layer, width):
+        polygon = Polygon(nodes=[start_pos,
+                                 [end_pos.x, start_pos.y],
+                                 end_pos,
+                                 [start_pos.x, end_pos.y]],
+                          layer=layer,
+                          width=width)
+        polygon._parent = self
+
+        return [polygon]
 
     def _createChildNodes(self, start_pos, end_pos, layer, width):
         nodes = []
@@ -72,6 +97,38 @@ class RectFill(Node):
     def getVirtualChilds(self):
         return self.virtual_childs
 
+    def rotate(self, angle, origin=(0, 0), use_degrees=True):
+        r""" Rotate rect fill around given origin
+
+        :params:
+            * *angle* (``float``)
+                rotation angle
+            * *origin* (``Vector2D``)
+                origin point for the rotation. default: (0, 0)
+            * *use_degrees* (``boolean``)
+                rotation angle is given in degrees. default:True
+        """
+
+        self.start_pos.rotate(angle=angle, origin=origin, use_degrees=use_degrees)
+        self.end_pos.rotate(angle=angle, origin=origin, use_degrees=use_degrees)
+        for child in self.virtual_childs:
+            child.rotate(angle=angle, origin=origin, use_degrees=use_degrees)
+        return self
+
+    def translate(self, distance_vector):
+        r""" Translate rect fill
+
+        :params:
+            * *distance_vector* (``Vector2D``)
+                2D vector defining by how much and in what direction to translate.
+        """
+
+        self.start_pos += distance_vector
+        self.end_pos += distance_vector
+        for child in self.virtual_childs:
+            child.translate(distance_vector)
+        return self
+
     def _getRenderTreeText(self):
         render_text = Node._getRenderTreeText(self)
 
@@ -75,13 +75,48 @@ class RectLine(PolygoneLine):
             self.end_pos.x = x2 + offset[0]
             self.end_pos.y = y2 + offset[1]
 
-        polygone_line = [{'x': self.start_pos.x, 'y': self.start_pos.y},
-                         {'x': self.start_pos.x, 'y': self.end_pos.y},
-                         {'x': self.end_pos.x, 'y': self.end_pos.y},
-                         {'x': self.end_pos.x, 'y': self.start_pos.y},
-                         {'x': self.start_pos.x, 'y': self.start_pos.y}]
-
-        PolygoneLine.__init__(self, polygone=polygone_line, layer=kwargs['layer'], width=kwargs.get('width'))
+        if self.start_pos.x == self.end_pos.x and self.start_pos.y == self.end_pos.y:
+            # a single point, there is no segment to draw
+            polygone_line = [self.start_pos]
+        elif self.start_pos.x == self.end_pos.x or self.start_pos.y == self.end_pos.y:
+            # a rect without area is drawn as single segment, instead of four overlapping and zero-length ones
+            polygone_line = [self.start_pos, self.end_pos]
+        else:
+            polygone_line = [{'x': self.start_pos.x, 'y': self.start_pos.y},
+                             {'x': self.start_pos.x, 'y': self.end_pos.y},
+                             {'x': self.end_pos.x, 'y': self.end_pos.y},
+                             {'x': self.end_pos.x, 'y': self.start_pos.y},
+                             {'x': self.start_pos.x, 'y': self.start_pos.y}]
+
+        PolygoneLine.__init__(self, nodes=polygone_line, layer=kwargs['layer'], width=kwargs.get('width'))
+
+    def rotate(self, angle, origin=(0, 0), use_degrees=True):
+        r""" Rotate rect around given origin
+
+        :params:
+            * *angle* (``float``)
+                rotation angle
+            * *origin* (``Vector2D``)
+                origin point for the rotation. default: (0, 0)
+            * *use_degrees* (``boolean``)
+                rotation angle is given in degrees. default:True
+        """
+
+        self.start_pos.rotate(angle=angle, origin=origin, use_degrees=use_degrees)
+        self.end_pos.rotate(angle=angle, origin=origin, use_degrees=use_degrees)
+        return PolygoneLine.rotate(self, angle=angle, origin=origin, use_degrees=use_degrees)
+
+    def translate(self, distance_vector):
+        r""" Translate rect
+
+        :params:
+            * *distance_vector* (``Vector2D``)
+                2D vector defining by how much and in what direction to translate.
+        """
+
+        self.start_pos += distance_vector
+        self.end_pos += distance_vector
+        return PolygoneLine.translate(self, distance_vector)
 
     def _getRenderTreeText(self):
         render_text = Node._getRenderTreeText(self)
@@ -13,8 +13,6 @@
 #
 # (C) 2016 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
 
-import math
-
 from KicadModTree.Vector import *
 from KicadModTree.nodes.Node import Node
 
@@ -36,24 +34,24 @@ class Rotation(Node):
         self.rotation = r  # in degree
 
     def getRealPosition(self, coordinate, rotation=None):
-        if rotation is None:
-            rotation = 0
-
         parsed_coordinate = Vector2D(coordinate)
 
-        phi = self.rotation*math.pi/180
-        rotation_coordinate = {'x': parsed_coordinate.x*math.cos(phi) + parsed_coordinate.y*math.sin(phi),
-                               'y': -parsed_coordinate.x*math.sin(phi) + parsed_coordinate.y*math.cos(phi)}
+        # multiples of 90° only swap and negate the coordinates, see sinCos
+        sin_phi, cos_phi = sinCos(self.rotation)
+        rotation_coordinate = {'x': parsed_coordinate.x*cos_phi + parsed_coordinate.y*sin_phi,
+                               'y': -parsed_coordinate.x*sin_phi + parsed_coordinate.y*cos_phi}
+
+        # the rotation is only returned when it was requested
+        if rotation is not None:
+            rotation += self.rotation
 
         if not self._parent:
             if rotation is None:
                 return rotation_coordinate
             else:
-                return rotation_coordinate, rotation + self.rotation
+                return rotation_coordinate, rotation
         else:
-            if rotation is None:
-                rotation = 0
-            return self._parent.getRealPosition(rotation_coordinate, rotation + self.rotation)
+            return self._parent.getRealPosition(rotation_coordinate, rotation)
 
     def _getRenderTreeText(self):
         render_text = Node._getRenderTreeText(self)
@@ -20,6 +20,7 @@ from .PolygoneLine import PolygoneLine
 from .RectLine import RectLine
 from .RectFill import RectFill
 from .FilledRect import FilledRect
+from .Courtyard import Courtyard
 
 from .PadArray import PadArray
 from .ExposedPad import ExposedPad
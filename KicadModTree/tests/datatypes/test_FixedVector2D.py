@@ -0,0 +1,75 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import unittest
+from KicadModTree import *
+from KicadModTree.util.kicad_util import formatNanometres
+
+
+class FixedVector2DTests(unittest.TestCase):
+
+    def test_init(self):
+        p1 = FixedVector2D(-0.635, 1.27)
+        self.assertEqual(p1.to_nanometres(), (-635000, 1270000))
+        self.assertEqual(p1.x, -0.635)
+        self.assertEqual(p1.y, 1.27)
+
+        self.assertEqual(FixedVector2D.fromNanometres(-635000, 1270000), p1)
+        self.assertEqual(FixedVector2D({'x': 1e-7, 'y': 2}).to_nanometres(), (0, 2000000))
+
+        p1.x = 0.1
+        self.assertEqual(p1.to_nanometres(), (100000, 1270000))
+
+    def test_exact_arithmetic(self):
+        p1 = FixedVector2D(0.1, -0.635)
+        p2 = p1 + [0.2, 0.635]
+        self.assertEqual(p2.to_nanometres(), (300000, 0))
+        self.assertEqual(p2, FixedVector2D(0.3, 0))
+        self.assertEqual(p2 - p1, FixedVector2D(0.2, 0.635))
+        self.assertEqual(-p1, FixedVector2D(-0.1, 0.635))
+
+        p1 += (0.2, 0.635)
+        self.assertEqual(p1, p2)
+        p1 -= 0.3
+        self.assertEqual(p1.to_nanometres(), (0, -300000))
+
+        self.assertEqual((p2 * 3).to_nanometres(), (900000, 0))
+        self.assertEqual((p2 / 3).to_nanometres(), (100000, 0))
+        self.assertEqual(FixedVector2D(0.1234, 0.5678).round_to(0.01), FixedVector2D(0.12, 0.57))
+
+    def test_hash(self):
+        points = {FixedVector2D(0.1, 0.2), FixedVector2D(0.3, 0.2) - (0.2, 0), FixedVector2D(0.2, 0.1)}
+        self.assertEqual(len(points), 2)
+
+        self.assertEqual(FixedVector2D(0.1, 0.2), Vector2D(0.1, 0.2))
+        self.assertEqual(Vector2D(0.1, 0.2), FixedVector2D(0.1, 0.2))
+        self.assertNotEqual(FixedVector2D(0.1, 0.2), Vector3D(0.1, 0.2, 0))
+
+    def test_format(self):
+        self.assertEqual(formatNanometres(0), '0')
+        self.assertEqual(formatNanometres(-635000), '-0.635')
+        self.assertEqual(formatNanometres(2000000), '2')
+        self.assertEqual(formatNanometres(-1), '-0.000001')
+        self.assertEqual(str(FixedVector2D(-0.635, 2)), '(x=-0.635, y=2)')
+
+    def test_polygon(self):
+        polygon = Polygon(nodes=[(0, 0), (0.1, 0), (0.1, 0.2)], fixed_point=True, x_mirror=0.05)
+        self.assertIsInstance(polygon.nodes[0], FixedVector2D)
+        polygon.translate([0.2, 0])
+        self.assertEqual([p.to_nanometres() for p in polygon.nodes], [(300000, 0), (200000, 0), (200000, 200000)])
+
+        kicad_mod = Footprint('fixed_point')
+        kicad_mod.append(polygon)
+        self.assertIn('(pts (xy 0.3 0) (xy 0.2 0) (xy 0.2 0.2))', KicadFileHandler(kicad_mod).serialize())
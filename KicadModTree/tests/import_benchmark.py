@@ -0,0 +1,45 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import os
+import subprocess
+import sys
+import timeit
+
+ROOT_DIRECTORY = os.path.join(os.path.dirname(os.path.realpath(__file__)), "../../")
+
+STATEMENTS = ['import KicadModTree',
+              'from KicadModTree import *',
+              'import KicadModTree; KicadModTree.ModArgparser']
+
+
+def measure_import(statement, repeat=10):
+    r"""Best time of a new interpreter running the statement, in seconds
+
+    Every run starts a new process, so nothing is cached in sys.modules.
+    """
+    command = [sys.executable, '-c', statement]
+    run = lambda: subprocess.check_call(command, cwd=ROOT_DIRECTORY)  # NOQA
+    return min(timeit.repeat(run, number=1, repeat=repeat))
+
+
+def run_benchmark():
+    interpreter = measure_import('pass')
+    for statement in STATEMENTS:
+        print("{:<50} {:6.1f} ms".format(statement, (measure_import(statement) - interpreter) * 1000))
+
+
+if __name__ == '__main__':
+    run_benchmark()
@@ -18,3 +18,18 @@ from .test_kicad5_padshapes import Kicad5PadsTests
 from .test_exposed_pad import ExposedPadTests
 from .test_arc import ArcTests
 from .test_rotation import RotationTests
+from .test_courtyard import CourtyardTests
+from .test_lisp_parser import LispParserTests
+from .test_library_writer import LibraryWriterTests
+from .test_kicad7_file_handler import Kicad7FileHandlerTests
+from .test_fan_out import FanOutTests
+from .test_render import RenderTests
+from .test_plate_util import PlateUtilTests
+from .test_lisp_diff import LispDiffTests
+from .test_mod_argparser import ModArgparserTests
+from .test_pad import PadTests
+from .test_fragment_cache import FragmentCacheTests
+from .test_polygone_line import PolygoneLineTests
+from .test_lazy_import import LazyImportTests
+from .test_bake import BakeTests
+from .test_switch_maker import SwitchMakerTests
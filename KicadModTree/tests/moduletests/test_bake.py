@@ -0,0 +1,74 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import unittest
+
+from KicadModTree import *
+
+
+def createFootprint():
+    kicad_mod = Footprint('bake')
+    kicad_mod.append(Model(filename='example.wrl', at=[1, 2, 0]))
+
+    translation = Translation(1.27, -0.635)
+    kicad_mod.append(translation)
+
+    rotation = Rotation(90)
+    translation.append(rotation)
+    rotation.append(Text(type=Text.TYPE_REFERENCE, text='REF**', at=[0, -3], layer='F.SilkS'))
+    rotation.append(RectLine(start=[-1, -2], end=[3, 4], layer='F.Fab'))
+    rotation.append(FilledRect(start=[0, 0], end=[1, 2], layer='F.SilkS'))
+    rotation.append(PolygoneLine(polygone=[[0, 0], [1, 1], [2, 0]], layer='F.SilkS'))
+    rotation.append(Arc(center=[0, 0], start=[1, 0], angle=90, layer='F.Fab'))
+
+    rotation = Rotation(30)
+    translation.append(rotation)
+    rotation.append(RectLine(start=[-1, -2], end=[3, 4], layer='F.Fab'))
+    rotation.append(RectFill(start=[-1, -2], end=[3, 4], layer='F.Fab'))
+    rotation.append(Pad(number=1, type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT, at=[5, 5], size=[1, 2],
+                        rotation=10, layers=Pad.LAYERS_SMT))
+    rotation.append(PadArray(pincount=3, spacing=[2.54, 0], type=Pad.TYPE_THT, shape=Pad.SHAPE_CIRCLE, size=1.5,
+                             drill=0.8, layers=Pad.LAYERS_THT))
+
+    kicad_mod.append(Line(start=[0, 0], end=[1, 1], layer='F.Fab'))
+    return kicad_mod
+
+
+class BakeTests(unittest.TestCase):
+
+    def testBake(self):
+        baked = createFootprint()
+        self.assertIs(baked.bake(), baked)
+
+        for handler in [KicadFileHandler, Kicad7FileHandler, SvgFileHandler]:
+            self.assertEqual(handler(baked).serialize(timestamp=0), handler(createFootprint()).serialize(timestamp=0))
+
+        for node in baked.serialize():
+            self.assertNotIsInstance(node, (Translation, Rotation))
+            self.assertNotIsInstance(node, PadArray)
+
+        output = Kicad7FileHandler(baked).serialize()
+        self.assertEqual(Kicad7FileHandler(baked.bake()).serialize(), output)
+
+    def testRotatedRect(self):
+        kicad_mod = Footprint('bake')
+        kicad_mod.append(RectLine(start=[0, 0], end=[2, 1], layer='F.Fab').rotate(90, origin=[1, 1]))
+        self.assertIn('(fp_rect (start 2 0) (end 1 2)', Kicad7FileHandler(kicad_mod).serialize())
+
+        kicad_mod = Footprint('bake')
+        kicad_mod.append(RectLine(start=[0, 0], end=[2, 1], layer='F.Fab').rotate(30))
+        output = Kicad7FileHandler(kicad_mod).serialize()
+        self.assertNotIn('fp_rect', output)
+        self.assertEqual(output.count('fp_line'), 4)
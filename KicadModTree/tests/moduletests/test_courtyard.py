@@ -0,0 +1,95 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import unittest
+
+from KicadModTree import *
+
+
+RESULT_COURTYARD_RECT = """(module courtyard (layer F.Cu) (tedit 0)
+  (fp_line (start -1.5 -1.5) (end -1.5 3) (layer F.CrtYd) (width 0.05))
+  (fp_line (start -1.5 3) (end 4.5 3) (layer F.CrtYd) (width 0.05))
+  (fp_line (start 4.5 3) (end 4.5 -1.5) (layer F.CrtYd) (width 0.05))
+  (fp_line (start 4.5 -1.5) (end -1.5 -1.5) (layer F.CrtYd) (width 0.05))
+  (pad 1 thru_hole rect (at 0 0) (size 2 2) (drill 1.2) (layers *.Cu *.Mask))
+  (pad 2 smd rect (at 3 2 90) (size 1 2) (layers F.Cu F.Mask F.Paste))
+)"""
+
+RESULT_COURTYARD_POLYGON = """(module courtyard (layer F.Cu) (tedit 0)
+  (fp_circle (center 4 0) (end 5 0) (layer F.Fab) (width 0.1))
+  (fp_line (start -1.25 -1.11) (end -1.11 -1.25) (layer F.CrtYd) (width 0.05))
+  (fp_line (start -1.11 -1.25) (end 4.52 -1.25) (layer F.CrtYd) (width 0.05))
+  (fp_line (start 4.52 -1.25) (end 5.11 -0.67) (layer F.CrtYd) (width 0.05))
+  (fp_line (start 5.11 -0.67) (end 5.25 -0.52) (layer F.CrtYd) (width 0.05))
+  (fp_line (start 5.25 -0.52) (end 5.25 0.52) (layer F.CrtYd) (width 0.05))
+  (fp_line (start 5.25 0.52) (end 5.11 0.67) (layer F.CrtYd) (width 0.05))
+  (fp_line (start 5.11 0.67) (end 4.52 1.25) (layer F.CrtYd) (width 0.05))
+  (fp_line (start 4.52 1.25) (end -1.11 1.25) (layer F.CrtYd) (width 0.05))
+  (fp_line (start -1.11 1.25) (end -1.25 1.11) (layer F.CrtYd) (width 0.05))
+  (fp_line (start -1.25 1.11) (end -1.25 -1.11) (layer F.CrtYd) (width 0.05))
+  (pad 1 thru_hole rect (at 0 0) (size 2 2) (drill 1.2) (layers *.Cu *.Mask))
+)"""
+
+
+class CourtyardTests(unittest.TestCase):
+
+    def testCourtyardRect(self):
+        kicad_mod = Footprint("courtyard")
+        kicad_mod.append(Pad(number=1, type=Pad.TYPE_THT, shape=Pad.SHAPE_RECT,
+                             at=[0, 0], size=[2, 2], drill=1.2, layers=Pad.LAYERS_THT))
+        kicad_mod.append(Pad(number=2, type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT,
+                             at=[3, 2], size=[1, 2], rotation=90, layers=Pad.LAYERS_SMT))
+        kicad_mod.addCourtyard(clearance=0.5)
+
+        file_handler = KicadFileHandler(kicad_mod)
+        self.assertEqual(file_handler.serialize(timestamp=0), RESULT_COURTYARD_RECT)
+
+    def testCourtyardPolygon(self):
+        kicad_mod = Footprint("courtyard")
+        kicad_mod.append(Pad(number=1, type=Pad.TYPE_THT, shape=Pad.SHAPE_RECT,
+                             at=[0, 0], size=[2, 2], drill=1.2, layers=Pad.LAYERS_THT))
+        kicad_mod.append(Circle(center=[4, 0], radius=1, layer='F.Fab'))
+        kicad_mod.addCourtyard(mode=Courtyard.MODE_POLYGON)
+
+        file_handler = KicadFileHandler(kicad_mod)
+        self.assertEqual(file_handler.serialize(timestamp=0), RESULT_COURTYARD_POLYGON)
+
+    def testCourtyardIgnoresOtherLayers(self):
+        kicad_mod = Footprint("courtyard")
+        kicad_mod.append(Pad(number=1, type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT,
+                             at=[0, 0], size=[2, 2], layers=Pad.LAYERS_SMT))
+        kicad_mod.append(Line(start=[-10, 0], end=[10, 0], layer='Dwgs.User'))
+        courtyard = kicad_mod.addCourtyard(clearance=0.25)
+        self.assertEqual(courtyard.nodes, [Vector2D(-1.25, -1.25), Vector2D(1.25, 1.25)])
+
+        courtyard = kicad_mod.addCourtyard(clearance=0.25, body_layers=['Dwgs.User'])
+        self.assertEqual(courtyard.nodes, [Vector2D(-10.25, -1.25), Vector2D(10.25, 1.25)])
+
+    def testCourtyardRotatedArc(self):
+        kicad_mod = Footprint("courtyard")
+        rotation = Rotation(45)
+        kicad_mod.append(rotation)
+        # the quarter arc passes through the rightmost point of its circle after the rotation
+        rotation.append(Arc(center=[0, 0], start=[1, 0], angle=90, layer='F.Fab'))
+        courtyard = kicad_mod.addCourtyard(clearance=0)
+        self.assertEqual(courtyard.nodes, [Vector2D(0.7, -0.71), Vector2D(1, 0.71)])
+
+    def testCourtyardTrapezoid(self):
+        kicad_mod = Footprint("courtyard")
+        kicad_mod.append(Pad(number=1, type=Pad.TYPE_SMT, shape=Pad.SHAPE_TRAPEZE, at=[0, 0], size=[2, 2],
+                             rect_delta=[0, 1], layers=Pad.LAYERS_SMT))
+        courtyard = kicad_mod.addCourtyard(clearance=0)
+        self.assertEqual(courtyard.nodes, [Vector2D(-1.5, -1), Vector2D(1.5, 1)])
+        self.assertIn('(size 2 2) (rect_delta 0 1)', KicadFileHandler(kicad_mod).serialize())
@@ -0,0 +1,102 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from functools import partial
+
+from KicadModTree import *
+
+
+RESULT_SVG_SILKS = """<svg xmlns="http://www.w3.org/2000/svg" width="8mm" height="6mm" viewBox="-4 -3 8 6">
+<title>test F.SilkS</title>
+<rect x="-4" y="-3" width="8" height="6" fill="#001023"/>
+<g id="F.SilkS" stroke-linecap="round" stroke-linejoin="round">
+<path fill="none" stroke="#f2eda1" stroke-width="0.12" d="M1 0 A1 1 0 0 1 0.707107 0.707107 A1 1 0 0 1 0 1 \
+M-3 -2 L-3 2 M-3 2 L3 2 M3 2 L3 -2 M3 -2 L-3 -2"/>
+</g>
+</svg>
+"""
+
+RESULT_SVG_CU = """<svg xmlns="http://www.w3.org/2000/svg" width="4mm" height="3mm" viewBox="-2 -1.5 4 3">
+<title>test F.Cu</title>
+<g id="F.Cu" stroke-linecap="round" stroke-linejoin="round">
+<path fill="#c83434" d="M-0.5 -0.5 L0.5 -0.5 A0.5 0.5 0 0 1 0.5 0.5 L-0.5 0.5 A0.5 0.5 0 0 1 -0.5 -0.5 Z"/>
+</g>
+</svg>
+"""
+
+
+def create_footprint():
+    kicad_mod = Footprint("test")
+    kicad_mod.setDescription("A example footprint")
+
+    kicad_mod.append(RectLine(start=[-3, -2], end=[3, 2], layer='F.SilkS'))
+    kicad_mod.append(Arc(center=[0, 0], start=[1, 0], angle=90, layer='F.SilkS'))
+
+    translation = Translation(0.25, 0)
+    translation.append(Pad(number=1, type=Pad.TYPE_THT, shape=Pad.SHAPE_OVAL, at=[0, 0], size=[2, 1], drill=0.8,
+                           layers=Pad.LAYERS_THT))
+    kicad_mod.append(translation)
+
+    return kicad_mod
+
+
+class FanOutTests(unittest.TestCase):
+
+    def testOutputs(self):
+        kicad_mod = create_footprint()
+        outputs = FanOutFileHandler(kicad_mod).serialize(timestamp=0)
+
+        self.assertEqual(list(outputs), ['.kicad_mod', '.B.Cu.svg', '.B.Mask.svg', '.F.Cu.svg', '.F.Mask.svg',
+                                         '.F.SilkS.svg', '.json'])
+        self.assertEqual(outputs['.kicad_mod'], KicadFileHandler(kicad_mod).serialize(timestamp=0))
+        self.assertEqual(outputs['.F.SilkS.svg'], RESULT_SVG_SILKS)
+
+    def testSvgPads(self):
+        kicad_mod = Footprint("test")
+        kicad_mod.append(Pad(number=1, type=Pad.TYPE_SMT, shape=Pad.SHAPE_OVAL, at=[0, 0], size=[2, 1],
+                             layers=Pad.LAYERS_SMT))
+
+        file_handler = SvgFileHandler(kicad_mod)
+        self.assertEqual(file_handler.serialize(layer='F.Cu', background=None), RESULT_SVG_CU)
+
+    def testJsonSummary(self):
+        summary = json.loads(JsonFileHandler(create_footprint()).serialize())
+
+        self.assertEqual(summary['name'], 'test')
+        self.assertEqual(summary['description'], 'A example footprint')
+        self.assertEqual(summary['bbox'], [-3, -2, 3, 2])
+        self.assertEqual(summary['layers']['F.SilkS']['shapes'], 5)
+        self.assertEqual(summary['pads'], [{'number': 1, 'type': 'thru_hole', 'shape': 'oval', 'at': [0.25, 0],
+                                            'rotation': 0, 'size': [2, 1], 'drill': [0.8, 0.8],
+                                            'layers': ['*.Cu', '*.Mask']}])
+
+    def testLibraryWriter(self):
+        directory = tempfile.mkdtemp(suffix='.pretty')
+        try:
+            writer = LibraryWriter(directory, handler_class=partial(FanOutFileHandler, svg_layers=['F.Cu']))
+
+            summary = writer.write([create_footprint()], timestamp=0)
+            self.assertEqual(summary['written'], [os.path.join(directory, 'test.kicad_mod')])
+            self.assertEqual(sorted(os.listdir(directory)), ['test.F.Cu.svg', 'test.json', 'test.kicad_mod'])
+
+            summary = writer.write([create_footprint()], timestamp=0)
+            self.assertEqual(summary['unchanged'], [os.path.join(directory, 'test.kicad_mod')])
+        finally:
+            shutil.rmtree(directory)
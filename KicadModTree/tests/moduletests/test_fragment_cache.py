@@ -0,0 +1,80 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import unittest
+
+from KicadModTree import *
+
+
+def createPad():
+    return Pad(number=1, type=Pad.TYPE_THT, shape=Pad.SHAPE_CIRCLE, at=[1, 2], size=2, drill=1.2,
+               layers=Pad.LAYERS_THT)
+
+
+class FragmentCacheTests(unittest.TestCase):
+
+    def testModifiedNode(self):
+        kicad_mod = Footprint('cache')
+        pad = createPad()
+        kicad_mod.append(pad)
+        self.assertIn('(at 1 2)', KicadFileHandler(kicad_mod).serialize())
+
+        pad.at.x = 3
+        self.assertIn('(at 3 2)', KicadFileHandler(kicad_mod).serialize())
+
+        pad.layers = ['F.Cu']
+        self.assertIn('(layers F.Cu)', KicadFileHandler(kicad_mod).serialize())
+
+    def testModifiedTransformation(self):
+        kicad_mod = Footprint('cache')
+        translation = Translation(1, 0)
+        kicad_mod.append(translation)
+        translation.append(createPad())
+        self.assertIn('(at 2 2)', KicadFileHandler(kicad_mod).serialize())
+
+        translation.offset_x = 2
+        self.assertIn('(at 3 2)', KicadFileHandler(kicad_mod).serialize())
+
+    def testEqualNodes(self):
+        first, second = Footprint('first'), Footprint('second')
+        first.append(createPad())
+        second.append(Translation(0, 0))
+        second.getNormalChilds()[0].append(createPad())
+
+        first_output = KicadFileHandler(first).serialize(timestamp=0)
+        second_output = KicadFileHandler(second).serialize(timestamp=0)
+        self.assertEqual(first_output.replace('first', 'second'), second_output)
+
+    def testSkippedLines(self):
+        kicad_mod = Footprint('cache')
+        kicad_mod.append(Line(start=[0, 0], end=[0, 1], layer='F.Fab'))
+        self.assertIn('fp_line', Kicad7FileHandler(kicad_mod).serialize())
+
+        kicad_mod = Footprint('cache')
+        kicad_mod.append(RectLine(start=[0, 0], end=[2, 1], layer='F.Fab'))
+        output = Kicad7FileHandler(kicad_mod).serialize()
+        self.assertIn('fp_rect', output)
+        self.assertNotIn('fp_line', output)
+
+    def testEqualValuesOfDifferentTypes(self):
+        # 1 == 1.0 == True, but they do not render the same
+        def createText(text):
+            kicad_mod = Footprint('cache')
+            kicad_mod.append(Text(type=Text.TYPE_USER, text=text, at=[0, 0], layer='F.Fab'))
+            return kicad_mod
+
+        self.assertIn('(fp_text user 1 ', KicadFileHandler(createText(1)).serialize())
+        with self.assertRaises(RuntimeError):
+            KicadFileHandler(createText(True)).serialize()
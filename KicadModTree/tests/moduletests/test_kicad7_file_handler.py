@@ -0,0 +1,118 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import unittest
+
+from KicadModTree import *
+
+
+RESULT_MINIMUM = """(footprint test (version 20221018) (generator kicad_mod_tree)
+  (layer F.Cu)
+)"""
+
+RESULT_SIMPLE_FOOTPRINT = """(footprint test (version 20221018) (generator kicad_mod_tree)
+  (layer F.Cu)
+  (descr "A example footprint")
+  (tags example)
+  (attr through_hole)
+  (fp_text reference REF** (at 0 -3) (layer F.SilkS)
+    (effects (font (size 1 1) (thickness 0.15)))
+  )
+  (fp_text value test (at 1.5 3) (layer F.Fab)
+    (effects (font (size 1 1) (thickness 0.15)))
+  )
+  (fp_arc (start 1 0) (mid 0.707107 0.707107) (end 0 1) (stroke (width 0.12) (type solid)) (layer F.SilkS))
+  (fp_circle (center 1.5 0) (end 2.5 0) (stroke (width 0.1) (type solid)) (fill none) (layer F.Fab))
+  (fp_line (start -2 -2.5) (end 5 -2.5) (stroke (width 0.12) (type solid)) (layer F.SilkS))
+  (fp_rect (start -2 -2) (end 5 2) (stroke (width 0.12) (type solid)) (fill none) (layer F.SilkS))
+  (pad 1 thru_hole rect (at 0 0) (size 2 2) (drill 1.2) (layers *.Cu *.Mask))
+  (pad 2 thru_hole circle (at 3 0) (size 2 2) (drill 1.2) (layers *.Cu *.Mask))
+  (fp_poly (pts (xy 0 0) (xy 1 0) (xy 0 1)) (stroke (width 0.1) (type solid)) (fill solid) (layer F.Fab))
+  (model example.3dshapes/example_footprint.wrl
+    (offset (xyz 2.54 0 0))
+    (scale (xyz 1 1 1))
+    (rotate (xyz 0 0 0))
+  )
+)"""
+
+RESULT_VIRTUAL = """(footprint test (version 20221018) (generator kicad_mod_tree)
+  (layer F.Cu)
+  (attr board_only exclude_from_pos_files exclude_from_bom)
+)"""
+
+
+def create_simple_footprint():
+    kicad_mod = Footprint("test")
+
+    kicad_mod.setDescription("A example footprint")
+    kicad_mod.setTags("example")
+    kicad_mod.setAttribute("through_hole")
+
+    kicad_mod.append(Text(type='reference', text='REF**', at=[0, -3], layer='F.SilkS'))
+    kicad_mod.append(Text(type='value', text="test", at=[1.5, 3], layer='F.Fab'))
+
+    kicad_mod.append(RectLine(start=[-2, -2], end=[5, 2], layer='F.SilkS'))
+    kicad_mod.append(Line(start=[-2, -2.5], end=[5, -2.5], layer='F.SilkS'))
+    kicad_mod.append(Arc(center=[0, 0], start=[1, 0], angle=90, layer='F.SilkS'))
+    kicad_mod.append(Circle(center=[1.5, 0], radius=1, layer='F.Fab'))
+    kicad_mod.append(Polygon(nodes=[[0, 0], [1, 0], [0, 1]], layer='F.Fab'))
+
+    kicad_mod.append(Pad(number=1, type=Pad.TYPE_THT, shape=Pad.SHAPE_RECT,
+                         at=[0, 0], size=[2, 2], drill=1.2, layers=Pad.LAYERS_THT))
+    kicad_mod.append(Pad(number=2, type=Pad.TYPE_THT, shape=Pad.SHAPE_CIRCLE,
+                         at=[3, 0], size=[2, 2], drill=1.2, layers=Pad.LAYERS_THT))
+
+    kicad_mod.append(Model(filename="example.3dshapes/example_footprint.wrl",
+                           at=[0.1, 0, 0], scale=[1, 1, 1], rotate=[0, 0, 0]))
+
+    return kicad_mod
+
+
+class Kicad7FileHandlerTests(unittest.TestCase):
+
+    def testMinimumFootprint(self):
+        kicad_mod = Footprint("test")
+
+        file_handler = Kicad7FileHandler(kicad_mod)
+        self.assertEqual(file_handler.serialize(), RESULT_MINIMUM)
+
+    def testSimpleFootprint(self):
+        file_handler = Kicad7FileHandler(create_simple_footprint())
+        self.assertEqual(file_handler.serialize(), RESULT_SIMPLE_FOOTPRINT)
+
+    def testVirtualAttribute(self):
+        kicad_mod = Footprint("test")
+        kicad_mod.setAttribute("virtual")
+
+        file_handler = Kicad7FileHandler(kicad_mod)
+        self.assertEqual(file_handler.serialize(), RESULT_VIRTUAL)
+
+    def testDegeneratedRectLine(self):
+        kicad_mod = Footprint("test")
+        kicad_mod.append(RectLine(start=[0, 0], end=[2, 0], layer='F.SilkS'))
+
+        output = Kicad7FileHandler(kicad_mod).serialize()
+        self.assertNotIn('fp_rect', output)
+        self.assertIn('(fp_line (start 0 0) (end 2 0)', output)
+
+    def testSharedGroupedNodes(self):
+        kicad_mod = create_simple_footprint()
+        grouped_nodes = KicadFileHandler.groupNodes(kicad_mod)
+
+        legacy = KicadFileHandler(kicad_mod).serialize(grouped_nodes=grouped_nodes, timestamp=0)
+        modern = Kicad7FileHandler(kicad_mod).serialize(grouped_nodes=grouped_nodes)
+
+        self.assertEqual(legacy, KicadFileHandler(kicad_mod).serialize(timestamp=0))
+        self.assertEqual(modern, RESULT_SIMPLE_FOOTPRINT)
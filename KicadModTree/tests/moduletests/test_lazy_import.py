@@ -0,0 +1,69 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import os
+import subprocess
+import sys
+import unittest
+
+import KicadModTree
+
+
+ROOT_DIRECTORY = os.path.join(os.path.dirname(os.path.realpath(__file__)), "../../../")
+
+
+def loadedModules(statement):
+    # modules in sys.modules of a new interpreter after running the statement
+    script = '{}\nimport sys\nprint(" ".join(sys.modules))'.format(statement)
+    return set(subprocess.check_output([sys.executable, '-c', script], cwd=ROOT_DIRECTORY).decode().split())
+
+
+class LazyImportTests(unittest.TestCase):
+
+    def testDeferredModules(self):
+        modules = loadedModules('import KicadModTree')
+        self.assertIn('KicadModTree.Kicad7FileHandler', modules)
+        for name in ['KicadModTree.ModArgparser', 'KicadModTree.SvgFileHandler', 'KicadModTree.Point', 'yaml',
+                     'xml.sax.saxutils', 'concurrent.futures', 'argparse']:
+            self.assertNotIn(name, modules)
+
+        # scripts like switch-maker.py import the names they use explicitly
+        modules = loadedModules('from KicadModTree import Footprint, Pad, LibraryWriter')
+        for name in ['KicadModTree.ModArgparser', 'KicadModTree.SvgFileHandler', 'KicadModTree.Point', 'yaml',
+                     'concurrent.futures', 'argparse']:
+            self.assertNotIn(name, modules)
+
+        modules = loadedModules('from KicadModTree import *')
+        self.assertIn('KicadModTree.ModArgparser', modules)
+        for name in ['yaml', 'xml.sax.saxutils', 'concurrent.futures']:
+            self.assertNotIn(name, modules)
+
+    def testLazyAttributes(self):
+        from KicadModTree.ModArgparser import ModArgparser
+        self.assertIs(KicadModTree.ModArgparser, ModArgparser)
+        self.assertIn('SvgFileHandler', dir(KicadModTree))
+        self.assertIn('LibraryWriter', KicadModTree.__all__)
+        with self.assertRaises(AttributeError):
+            KicadModTree.NoSuchNode
+
+    def testLazyAttributesAfterSubmodules(self):
+        # PngFileHandler imports the ResolvedFootprint module, which must not hide the class of the same name
+        script = ('from KicadModTree import PngFileHandler\n'
+                  'from KicadModTree import ResolvedFootprint\n'
+                  'import KicadModTree\n'
+                  'KicadModTree.renderSvgContactSheet\n'
+                  'print(ResolvedFootprint.__name__, KicadModTree.SvgFileHandler.__name__)')
+        output = subprocess.check_output([sys.executable, '-c', script], cwd=ROOT_DIRECTORY).decode().split()
+        self.assertEqual(output, ['ResolvedFootprint', 'SvgFileHandler'])
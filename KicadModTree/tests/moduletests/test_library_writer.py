@@ -0,0 +1,122 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from KicadModTree import *
+
+
+def create_footprints(count, offset=0):
+    for i in range(count):
+        kicad_mod = Footprint("fp_{}".format(i))
+        kicad_mod.append(Pad(number=1, type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT,
+                             at=[i + offset, 0], size=[1, 1], layers=Pad.LAYERS_SMT))
+        yield kicad_mod
+
+
+class LibraryWriterTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(suffix='.pretty')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def testWriteLibrary(self):
+        writer = LibraryWriter(self.directory, jobs=2)
+
+        summary = writer.write(create_footprints(10), timestamp=0)
+        self.assertEqual(len(summary['written']), 10)
+        self.assertEqual(summary['unchanged'], [])
+        self.assertEqual(summary['failed'], {})
+        self.assertEqual(sorted(os.listdir(self.directory)),
+                         sorted('fp_{}.kicad_mod'.format(i) for i in range(10)))
+
+        filename = os.path.join(self.directory, 'fp_0.kicad_mod')
+        with open(filename) as f:
+            self.assertEqual(f.read(), KicadFileHandler(next(create_footprints(1))).serialize(timestamp=0))
+
+    def testSkipUnchanged(self):
+        writer = LibraryWriter(self.directory, jobs=2)
+        writer.write(create_footprints(5))
+
+        summary = writer.write(create_footprints(5), timestamp=0)
+        self.assertEqual(summary['written'], [])
+        self.assertEqual(len(summary['unchanged']), 5)
+
+        summary = writer.write(create_footprints(5, offset=1))
+        self.assertEqual(len(summary['written']), 5)
+        self.assertEqual(summary['unchanged'], [])
+
+    def testSyncWrittenFiles(self):
+        writer = LibraryWriter(self.directory)
+        writer.write(create_footprints(2))
+
+        # only the written files (and the directory) are flushed, not every filesystem of the machine
+        with mock.patch('os.sync', side_effect=AssertionError, create=True), \
+                mock.patch('os.fsync', wraps=os.fsync) as fsync:
+            summary = writer.write(create_footprints(3))
+        self.assertEqual(summary['written'], [os.path.join(self.directory, 'fp_2.kicad_mod')])
+        self.assertEqual(fsync.call_count, 2 if hasattr(os, 'O_DIRECTORY') else 1)
+
+    def testSyncAfterFailure(self):
+        class FailingHandler(object):
+            def __init__(self, footprint):
+                self.footprint = footprint
+
+            def serialize(self, **kwargs):
+                # the second output fails after the first one was written
+                return {'.kicad_mod': KicadFileHandler(self.footprint).serialize(**kwargs), '.json': None}
+
+        writer = LibraryWriter(self.directory, handler_class=FailingHandler)
+        with mock.patch.object(writer, '_sync') as sync:
+            summary = writer.write(create_footprints(1))
+        filename = os.path.join(self.directory, 'fp_0.kicad_mod')
+        self.assertEqual(list(summary['failed']), [filename])
+        sync.assert_called_once_with([filename])
+
+    def testFileMode(self):
+        filename = os.path.join(self.directory, 'fp_0.kicad_mod')
+        writer = LibraryWriter(self.directory)
+
+        # the process wide umask is not changed while writing
+        with mock.patch('os.umask', side_effect=AssertionError):
+            writer.write(create_footprints(1))
+        umask = os.umask(0)
+        os.umask(umask)
+        self.assertEqual(os.stat(filename).st_mode & 0o777, 0o666 & ~umask)
+
+        # replaced files keep their permissions
+        os.chmod(filename, 0o600)
+        writer.write(create_footprints(1, offset=1))
+        self.assertEqual(os.stat(filename).st_mode & 0o777, 0o600)
+
+    def testCheckLibrary(self):
+        writer = LibraryWriter(self.directory)
+        writer.write(create_footprints(3))
+
+        summary = writer.check(create_footprints(4))
+        self.assertEqual(len(summary['matching']), 3)
+        self.assertEqual(summary['missing'], [os.path.join(self.directory, 'fp_3.kicad_mod')])
+        self.assertEqual(summary['differing'], {})
+
+        summary = writer.check(create_footprints(3, offset=0.5))
+        self.assertEqual(summary['matching'], [])
+        differences = summary['differing'][os.path.join(self.directory, 'fp_0.kicad_mod')]
+        self.assertEqual(differences, [('module/pad[0]/at[0]', ['at', '0', '0'], ['at', '0.5', '0'])])
@@ -0,0 +1,73 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import unittest
+
+from KicadModTree.util.lisp_diff import *
+
+
+SEXPR_EXPECTED = """(module test (layer F.Cu) (tedit 5A0D6F30)
+  (fp_line (start -1 -1) (end 1 -1) (layer F.SilkS) (width 0.12))
+  (fp_line (start 1 -1) (end 1 1) (layer F.SilkS) (width 0.12))
+  (pad 1 smd rect (at -1 0) (size 1 1) (layers F.Cu F.Paste F.Mask))
+  (pad 2 smd rect (at 1 0) (size 1 1) (layers F.Cu F.Paste F.Mask))
+)"""
+
+SEXPR_REFORMATTED = """(module test (layer F.Cu) (tedit 0) (fp_line (start -1.0 -1.0) (end 1 -1) (layer F.SilkS)
+  (width 0.1200000001)) (fp_line (start 1 -1) (end 1 1) (layer F.SilkS) (width 0.12))
+  (pad 1 smd rect (at -1 0) (size 1 1) (layers F.Cu F.Paste F.Mask))
+  (pad 2 smd rect (at 1 0) (size 1 1) (layers F.Cu F.Paste F.Mask)))"""
+
+SEXPR_CHANGED = """(module test (layer F.Cu) (tedit 0)
+  (fp_line (start 1 -1) (end 1 1) (layer F.SilkS) (width 0.12))
+  (fp_line (start 1 1) (end -1 1) (layer F.SilkS) (width 0.12))
+  (pad 1 smd rect (at -1 0) (size 1 1) (layers F.Cu F.Paste F.Mask))
+  (pad 2 smd rect (at 1.5 0) (size 1 1) (layers F.Cu F.Paste F.Mask))
+)"""
+
+RESULT_FORMATTED = """module/fp_line[0]: removed (fp_line (start -1 -1) (end 1 -1) (layer F.SilkS) (width 0.12))
+module/fp_line[1]: added (fp_line (start 1 1) (end -1 1) (layer F.SilkS) (width 0.12))
+module/pad[1]/at[0]:
+  - (at 1 0)
+  + (at 1.5 0)"""
+
+
+class LispDiffTests(unittest.TestCase):
+
+    def testEqual(self):
+        self.assertEqual(diffLispStrings(SEXPR_EXPECTED, SEXPR_EXPECTED), [])
+        self.assertEqual(diffLispStrings(SEXPR_EXPECTED, SEXPR_REFORMATTED), [])
+
+    def testTolerance(self):
+        differences = diffLispStrings(SEXPR_EXPECTED, SEXPR_REFORMATTED, tolerance=0)
+        self.assertEqual([d.path for d in differences], ['module/fp_line[0]/width[0]'])
+
+    def testIgnore(self):
+        differences = diffLispStrings(SEXPR_EXPECTED, SEXPR_REFORMATTED, ignore=[])
+        self.assertEqual(differences, [('module/tedit[0]', ['tedit', '5A0D6F30'], ['tedit', '0'])])
+
+    def testMinimalDifferences(self):
+        differences = diffLispStrings(SEXPR_EXPECTED, SEXPR_CHANGED)
+        self.assertEqual('\n'.join(formatLispDifference(d) for d in differences), RESULT_FORMATTED)
+
+    def testDifferentForms(self):
+        differences = diffLispTrees(['module', 'a', ['at', '1']], ['module', 'a', ['pos', '1']])
+        self.assertEqual(differences, [('module/at[0]', ['at', '1'], ['pos', '1'])])
+
+        differences = diffLispTrees(['module', 'a', ['at', '1']], ['module', 'b', ['at', '1']])
+        self.assertEqual(differences, [('module', ['module', 'a', ['at', '1']], ['module', 'b', ['at', '1']])])
+
+        differences = diffLispTrees(['module', 'a', ['layers', 'F.Cu']], ['module', 'a', ['layers', 'F.Cu', 'F.Mask']])
+        self.assertEqual(differences, [('module/layers[0]', ['layers', 'F.Cu'], ['layers', 'F.Cu', 'F.Mask'])])
@@ -0,0 +1,90 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import os
+import tempfile
+import unittest
+
+from KicadModTree.util.kicad_util import *
+
+
+SEXPR_FOOTPRINT = """(module test (layer F.Cu) (tedit 0)
+  (descr "A example footprint")
+  (fp_text value "with \\"quotes\\" (and brackets)" (at 0 3) (layer F.Fab))
+  (pad 1 thru_hole rect (at 0 0) (size 2 2) (drill 1.2) (layers *.Cu *.Mask))
+)"""
+
+TREE_FOOTPRINT = ['module', 'test', ['layer', 'F.Cu'], ['tedit', '0'],
+                  ['descr', 'A example footprint'],
+                  ['fp_text', 'value', 'with "quotes" (and brackets)', ['at', '0', '3'], ['layer', 'F.Fab']],
+                  ['pad', '1', 'thru_hole', 'rect', ['at', '0', '0'], ['size', '2', '2'], ['drill', '1.2'],
+                   ['layers', '*.Cu', '*.Mask']]]
+
+
+class LispParserTests(unittest.TestCase):
+
+    def testTokenizer(self):
+        self.assertEqual(lispTokenizer('(descr "a (b)")'), ['(', 'descr', 'a (b)', ')'])
+        self.assertEqual(lispTokenizer(b'(tags "")'), ['(', 'tags', '', ')'])
+
+    def testTokenSpans(self):
+        spans = list(lispTokenSpans(b'(at 1 "x y")'))
+        self.assertEqual(spans, [(TOKEN_OPEN, 0, 1), (TOKEN_ATOM, 1, 3), (TOKEN_ATOM, 4, 5),
+                                 (TOKEN_STRING, 7, 10), (TOKEN_CLOSE, 11, 12)])
+
+    def testParseString(self):
+        self.assertEqual(parseLispString(SEXPR_FOOTPRINT), TREE_FOOTPRINT)
+        self.assertEqual(parseLispString(SEXPR_FOOTPRINT.encode('utf-8')), TREE_FOOTPRINT)
+
+    def testParseFile(self):
+        fd, filename = tempfile.mkstemp(suffix='.kicad_mod')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(SEXPR_FOOTPRINT)
+            self.assertEqual(parseLispFile(filename), TREE_FOOTPRINT)
+        finally:
+            os.remove(filename)
+
+    def testParseErrors(self):
+        with self.assertRaises(RuntimeError):
+            parseLispString('(module test')
+        with self.assertRaises(RuntimeError):
+            parseLispString('(module test))')
+        with self.assertRaises(RuntimeError):
+            parseLispString('(module "test)')
+
+    def testLazyParse(self):
+        footprint = parseLispLazy(SEXPR_FOOTPRINT)
+        self.assertEqual(footprint.name, 'module')
+        self.assertEqual(footprint[1], 'test')
+        self.assertEqual(footprint.find('descr')[1], 'A example footprint')
+        self.assertIsNone(footprint.find('tags'))
+        self.assertEqual(len(footprint), 7)
+        self.assertEqual(footprint.materialize(), TREE_FOOTPRINT)
+
+        pad = footprint.find('pad')
+        self.assertEqual(pad.find('layers').materialize(), ['layers', '*.Cu', '*.Mask'])
+
+    def testLazyParseBuffer(self):
+        footprint = parseLispLazy(SEXPR_FOOTPRINT.encode('utf-8'))
+        self.assertEqual(footprint.find('fp_text')[2], 'with "quotes" (and brackets)')
+        self.assertEqual(footprint.materialize(), TREE_FOOTPRINT)
+
+    def testFormQuery(self):
+        forms = list(iterLispForms(SEXPR_FOOTPRINT, 'at'))
+        self.assertEqual([f.materialize() for f in forms], [['at', '0', '3'], ['at', '0', '0']])
+
+        pad = parseLispLazy(SEXPR_FOOTPRINT).find('pad')
+        self.assertEqual([f.materialize() for f in pad.iterForms('at')], [['at', '0', '0']])
@@ -0,0 +1,165 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+from KicadModTree import *
+
+
+CSV_PARAMS = """name, pincount, pitch
+a, 2, 1.27
+b, , 2.54
+c, 3, 2.54
+d, 13
+"""
+
+YML_PARAMS = """defaults: &defaults
+  pitch: 2.54
+a:
+  <<: *defaults
+  pincount: 2
+b: {pincount: 3, name: b}
+---
+c: {pincount: 4, pitch: 1}
+"""
+
+
+def create_footprint(args):
+    if args['pincount'] > 10:
+        raise ValueError('too many pins')
+
+    kicad_mod = Footprint(args['name'])
+    for i in range(args['pincount']):
+        kicad_mod.append(Pad(number=i + 1, type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT, at=[i * args['pitch'], 0],
+                             size=[1, 1], layers=Pad.LAYERS_SMT))
+    KicadFileHandler(kicad_mod).writeFile(os.path.join(args['directory'], args['name'] + '.kicad_mod'))
+
+
+class ModArgparserTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def testRunJobs(self):
+        filename = os.path.join(self.directory, 'params.csv')
+        with open(filename, 'w') as f:
+            f.write(CSV_PARAMS)
+
+        parser = ModArgparser(create_footprint)
+        parser.add_parameter("name", type=str, required=True)
+        parser.add_parameter("pincount", type=int, required=True)
+        parser.add_parameter("pitch", type=float, required=False, default=2.54)
+        parser.add_parameter("directory", type=str, required=False, default=self.directory)
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            failed = parser._run_jobs([filename], 2)
+
+        self.assertEqual([(row.location, row.name, row.errors) for row in failed],
+                         [(filename + ':3', 'b', [('pincount', 'parameter expected: pincount', '')]),
+                          (filename + ':5', 'd', [(None, 'ValueError: too many pins', None)])])
+        self.assertEqual(sorted(os.listdir(self.directory)), ['a.kicad_mod', 'c.kicad_mod', 'params.csv'])
+
+        lines = output.getvalue().splitlines()
+        self.assertEqual([line for line in lines if 'generate' in line],
+                         ['  - generate a.kicad_mod', '  - generate b.kicad_mod',
+                          '  - generate c.kicad_mod', '  - generate d.kicad_mod'])
+        self.assertEqual(lines[-1], '2 footprints created, 2 failed')
+
+    def testJobsArgument(self):
+        parser = ModArgparser._create_argument_parser()
+
+        args = parser.parse_args(['-j', '4', 'file.csv'])
+        self.assertEqual((args.jobs, args.files), (4, ['file.csv']))
+
+        args = parser.parse_args(['file.csv'])
+        self.assertEqual((args.jobs, args.files), (None, ['file.csv']))
+
+        # the file is not taken as the number of processes
+        with redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            parser.parse_args(['-j', 'file.csv'])
+
+    def testParseArgs(self):
+        parser = ModArgparser(create_footprint)
+        parser.add_parameter("name", type=str, required=True)
+        parser.add_parameter("pincount", type=int, required=True)
+        parser.add_parameter("pitch", type=float, required=False, default=2.54)
+        parser.add_parameter("smd", type=bool, required=False)
+
+        # values of .yml files are already typed
+        args, errors = parser._parse_args(name='a', pincount=2, pitch=1, smd=True)
+        self.assertEqual(errors, [])
+        self.assertEqual(args, {'name': 'a', 'pincount': 2, 'pitch': 1.0, 'smd': True})
+        self.assertIs(type(args['pitch']), float)
+
+        args, errors = parser._parse_args(name='a', pincount='2', pitch='', smd='false')
+        self.assertEqual(errors, [])
+        self.assertEqual(args, {'name': 'a', 'pincount': 2, 'pitch': 2.54, 'smd': False})
+
+        args, errors = parser._parse_args(name='a', pincount='two', smd='maybe')
+        self.assertEqual([(error.parameter, error.value) for error in errors], [('pincount', 'two'), ('smd', 'maybe')])
+        self.assertEqual(str(errors[0]), "invalid literal for int() with base 10: 'two'")
+
+    def testParseDefaults(self):
+        parser = ModArgparser(create_footprint)
+        parser.add_parameter("name", type=str, required=True)
+        parser.add_parameter("smd", type=bool, required=False, default='false')
+        parser.add_parameter("tht", type=bool, required=False, default='yes')
+
+        args, errors = parser._parse_args(name='a')
+        self.assertEqual(errors, [])
+        self.assertEqual(args, {'name': 'a', 'smd': False, 'tht': True})
+
+        self.assertEqual(parser._create_example_data_full(), {'smd': False, 'tht': True})
+
+    def testMutableDefaults(self):
+        parser = ModArgparser(create_footprint)
+        parser.add_parameter("name", type=str, required=True)
+        parser.add_parameter("flags", type=list, required=False, default=[])
+
+        first, errors = parser._parse_args(name='a')
+        second, errors = parser._parse_args(name='b')
+        self.assertEqual(first['flags'], [])
+        self.assertIsNot(first['flags'], second['flags'])
+
+    def testStreamRows(self):
+        filename = os.path.join(self.directory, 'params.yml')
+        with open(filename, 'w') as f:
+            f.write(YML_PARAMS)
+
+        parser = ModArgparser(create_footprint)
+        rows = list(parser._iter_rows(filename))
+        self.assertEqual(rows, [(filename + ':defaults', {'name': 'defaults', 'pitch': 2.54}, None),
+                                (filename + ':a', {'name': 'a', 'pitch': 2.54, 'pincount': 2}, None),
+                                (filename + ':b', None, 'name is already used for root name!'),
+                                (filename + ':c', {'name': 'c', 'pincount': 4, 'pitch': 1}, None)])
+
+        filename = os.path.join(self.directory, 'params.csv')
+        with open(filename, 'w') as f:
+            f.write(CSV_PARAMS + "\n")
+
+        rows = list(parser._iter_rows(filename))
+        self.assertEqual([row[1] for row in rows], [{'name': 'a', 'pincount': '2', 'pitch': '1.27'},
+                                                    {'name': 'b', 'pincount': '', 'pitch': '2.54'},
+                                                    {'name': 'c', 'pincount': '3', 'pitch': '2.54'},
+                                                    {'name': 'd', 'pincount': '13'}])
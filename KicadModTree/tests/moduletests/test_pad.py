@@ -0,0 +1,88 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import unittest
+
+from KicadModTree import *
+
+
+PAD_PARAMS = [
+    dict(number=1, type=Pad.TYPE_THT, shape=Pad.SHAPE_RECT, at=[1, 2], size=2, drill=1.2, layers=Pad.LAYERS_THT),
+    dict(number=2, type=Pad.TYPE_THT, shape=Pad.SHAPE_OVAL, at=(0, -1), size=[1.7, 1.7], drill=[1, 1],
+         rotation=45, offset=[0.1, 0], layers=Pad.LAYERS_THT),
+    dict(type=Pad.TYPE_NPTH, shape=Pad.SHAPE_CIRCLE, at=Vector2D(3, 3), size=Vector2D(4, 4), drill=4,
+         layers=Pad.LAYERS_NPTH),
+    dict(number='A1', type=Pad.TYPE_SMT, shape=Pad.SHAPE_ROUNDRECT, at=[0, 0], size=[1, 0.5],
+         radius_ratio=0.25, maximum_radius=0.1, solder_paste_margin=-0.05, layers=Pad.LAYERS_SMT),
+    dict(number=3, type=Pad.TYPE_SMT, shape=Pad.SHAPE_ROUNDRECT, at=[0, 0], size=[1, 0.5], radius_ratio=0,
+         layers=Pad.LAYERS_SMT),
+    dict(number=4, type=Pad.TYPE_THT, shape=Pad.SHAPE_OVAL, at=[1, 2], size=[1, 2], drill=0.8, offset=[0.2, 0.3],
+         x_mirror=0, y_mirror=1, layers=Pad.LAYERS_THT),
+]
+
+
+def serialize(*nodes):
+    kicad_mod = Footprint('pads')
+    kicad_mod.extend(nodes)
+    return KicadFileHandler(kicad_mod).serialize(timestamp=0)
+
+
+class PadTests(unittest.TestCase):
+
+    def testFastPad(self):
+        for params in PAD_PARAMS:
+            self.assertEqual(serialize(Pad.fast(**params)), serialize(Pad(**params)))
+
+    def testFastPadCopiesVectors(self):
+        at = Vector2D(1, 1)
+        pad1 = Pad.fast(type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT, at=at, size=1, layers=Pad.LAYERS_SMT)
+        pad2 = Pad.fast(type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT, at=at, size=1, layers=Pad.LAYERS_SMT)
+        pad1.translate([1, 0])
+        self.assertEqual(pad2.at, Vector2D(1, 1))
+        self.assertEqual(at, Vector2D(1, 1))
+
+    def testPadArrayReplication(self):
+        params = dict(pincount=4, spacing=[1, 0], type=Pad.TYPE_THT, shape=Pad.SHAPE_CIRCLE, size=1.5, drill=0.8,
+                      layers=Pad.LAYERS_THT, x_mirror=0, end_pads_size_reduction={'x+': 0.2})
+        pads = PadArray(**params).getVirtualChilds()
+
+        pad1_params = dict(params, size=[1.3, 1.5], shape=Pad.SHAPE_ROUNDRECT, radius_ratio=0.25, maximum_radius=0.25)
+        expected = [Pad(number=1, at=[-0.1, 0], **pad1_params),
+                    Pad(number=2, at=[1, 0], **params),
+                    Pad(number=3, at=[2, 0], **params),
+                    Pad(number=4, at=[2.9, 0], **dict(params, size=[1.3, 1.5]))]
+        self.assertEqual(serialize(*pads), serialize(*expected))
+
+    def testReplicatedCustomPad(self):
+        template = Pad(number=1, type=Pad.TYPE_SMT, shape=Pad.SHAPE_CUSTOM, at=[0, 0], size=1,
+                       primitives=[Circle(center=[0, 0], radius=0.5)], layers=Pad.LAYERS_SMT)
+        pad1, pad2 = template._replicate(1, [0, 0]), template._replicate(2, [1, 0])
+        self.assertIsNot(pad1.primitives, pad2.primitives)
+        self.assertIsNot(pad1.mirror, pad2.mirror)
+
+        pad1.addPrimitive(Circle(center=[0.5, 0], radius=0.5))
+        self.assertEqual(len(pad2.primitives), 1)
+        self.assertEqual(len(template.primitives), 1)
+
+    def testSharedLayers(self):
+        pad1 = Pad(type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT, at=[0, 0], size=1, layers=['F.Cu', 'F.Mask', 'F.Paste'])
+        pad2 = Pad.fast(type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT, at=[1, 0], size=1, layers=Pad.LAYERS_SMT)
+        self.assertIs(pad1.layers, pad2.layers)
+        self.assertEqual(pad1.layers, tuple(Pad.LAYERS_SMT))
+        self.assertIn('(layers F.Cu F.Mask F.Paste)', serialize(pad1, pad2))
+
+        # the constants are still lists, which can be extended by the callers
+        pad3 = Pad(type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT, at=[2, 0], size=1, layers=Pad.LAYERS_SMT + ['F.SilkS'])
+        self.assertIn('(layers F.Cu F.Mask F.Paste F.SilkS)', serialize(pad3))
@@ -0,0 +1,128 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import unittest
+
+from KicadModTree.util.plate_util import mergeRectangles, outlinesToDxf, outlinesToSvg
+
+
+RESULT_SVG = """<svg xmlns="http://www.w3.org/2000/svg" width="3mm" height="1mm" viewBox="0 0 3 1">
+<path fill="none" stroke="#000000" stroke-width="0.1" d="M0 0 L3 0 L3 1 L0 1 Z"/>
+</svg>
+"""
+
+RESULT_DXF = """0
+SECTION
+2
+HEADER
+9
+$ACADVER
+1
+AC1009
+0
+ENDSEC
+0
+SECTION
+2
+ENTITIES
+0
+POLYLINE
+8
+CUTOUTS
+66
+1
+10
+0
+20
+0
+30
+0
+70
+1
+0
+VERTEX
+8
+CUTOUTS
+10
+0
+20
+0
+0
+VERTEX
+8
+CUTOUTS
+10
+3
+20
+0
+0
+VERTEX
+8
+CUTOUTS
+10
+3
+20
+-1
+0
+VERTEX
+8
+CUTOUTS
+10
+0
+20
+-1
+0
+SEQEND
+8
+CUTOUTS
+0
+ENDSEC
+0
+EOF
+"""
+
+
+class PlateUtilTests(unittest.TestCase):
+
+    def testSeparateRectangles(self):
+        outlines = mergeRectangles([(0, 0, 1, 1), (2, 0, 3, 1)])
+        self.assertEqual(outlines, [[(0, 0), (1, 0), (1, 1), (0, 1)],
+                                    [(2, 0), (3, 0), (3, 1), (2, 1)]])
+
+    def testSharedEdge(self):
+        outlines = mergeRectangles([(0, 0, 1, 1), (1, 0, 3, 1)])
+        self.assertEqual(outlines, [[(0, 0), (3, 0), (3, 1), (0, 1)]])
+
+    def testSnapToTolerance(self):
+        outlines = mergeRectangles([(0, 0, 1, 1), (1.0004, 0, 3, 0.9996)], tolerance=0.001)
+        self.assertEqual(outlines, [[(0, 0), (3, 0), (3, 1), (0, 1)]])
+
+        outlines = mergeRectangles([(0, 0, 1, 1), (1.002, 0, 3, 1)], tolerance=0.001)
+        self.assertEqual(len(outlines), 2)
+
+    def testUnionWithHole(self):
+        outlines = mergeRectangles([(0, 0, 3, 1), (0, 2, 3, 3), (0, 0, 1, 3), (2, 0, 3, 3)])
+        self.assertEqual(outlines, [[(0, 0), (3, 0), (3, 3), (0, 3)],
+                                    [(1, 1), (1, 2), (2, 2), (2, 1)]])
+
+    def testOverlappingCross(self):
+        outlines = mergeRectangles([(0, 1, 3, 2), (1, 0, 2, 3)])
+        self.assertEqual(outlines, [[(0, 1), (1, 1), (1, 0), (2, 0), (2, 1), (3, 1),
+                                     (3, 2), (2, 2), (2, 3), (1, 3), (1, 2), (0, 2)]])
+
+    def testSerialize(self):
+        outlines = mergeRectangles([(0, 0, 1, 1), (1, 0, 3, 1)])
+        self.assertEqual(outlinesToSvg(outlines), RESULT_SVG)
+        self.assertEqual(outlinesToDxf(outlines, 'CUTOUTS'), RESULT_DXF)
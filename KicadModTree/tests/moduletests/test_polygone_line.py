@@ -0,0 +1,118 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import unittest
+
+from KicadModTree import *
+
+
+POINTS = [[0, 0], [1, 0], [1, 2], [-1, 3]]
+
+
+class PolygoneLineTests(unittest.TestCase):
+
+    def testSegments(self):
+        polygone_line = PolygoneLine(nodes=POINTS, layer='F.Fab', width=0.2)
+        kicad_mod = Footprint('polygone_line')
+        kicad_mod.append(Translation(1, 1))
+        kicad_mod.getNormalChilds()[0].append(polygone_line)
+
+        lines = Footprint('polygone_line')
+        lines.append(Translation(1, 1))
+        for start, end in zip(POINTS, POINTS[1:]):
+            lines.getNormalChilds()[0].append(Line(start=start, end=end, layer='F.Fab', width=0.2))
+
+        for handler in [KicadFileHandler, Kicad7FileHandler, SvgFileHandler]:
+            self.assertEqual(handler(kicad_mod).serialize(timestamp=0), handler(lines).serialize(timestamp=0))
+
+        # the Line nodes are not required for writing the footprint
+        self.assertIsNone(polygone_line._virtual_childs)
+
+    def testVirtualChilds(self):
+        polygone_line = PolygoneLine(nodes=POINTS, layer='F.Fab')
+        lines = polygone_line.getVirtualChilds()
+        self.assertEqual([(line.start_pos, line.end_pos) for line in lines], polygone_line.getSegments())
+        self.assertIs(lines[0].getParent(), polygone_line)
+        self.assertIs(polygone_line.getVirtualChilds(), lines)
+
+    def testRectLine(self):
+        kicad_mod = Footprint('rect_line')
+        kicad_mod.append(RectLine(start=[0, 0], end=[2, 1], layer='F.Fab'))
+        self.assertEqual(KicadFileHandler(kicad_mod).serialize(timestamp=0).count('fp_line'), 4)
+
+        output = Kicad7FileHandler(kicad_mod).serialize()
+        self.assertEqual(output.count('fp_rect'), 1)
+        self.assertNotIn('fp_line', output)
+
+    def testDegenerateRectLine(self):
+        kicad_mod = Footprint('rect_line')
+        kicad_mod.append(RectLine(start=[1, 0], end=[1, 2], layer='F.Fab'))
+        kicad_mod.append(RectLine(start=[0, 3], end=[2, 3], layer='F.Fab'))
+        kicad_mod.append(RectLine(start=[5, 5], end=[5, 5], layer='F.Fab'))
+
+        for handler in [KicadFileHandler, Kicad7FileHandler]:
+            output = handler(kicad_mod).serialize(timestamp=0)
+            self.assertEqual(output.count('fp_line'), 2)
+            self.assertIn('(fp_line (start 1 0) (end 1 2)', output)
+            self.assertIn('(fp_line (start 0 3) (end 2 3)', output)
+            self.assertNotIn('fp_rect', output)
+
+    def testRectFill(self):
+        kicad_mod = Footprint('rect_fill')
+        kicad_mod.append(RectFill(start=[0, 0], end=[2, 1], layer='F.Fab'))
+        output = KicadFileHandler(kicad_mod).serialize(timestamp=0)
+        self.assertEqual(output.count('fp_poly'), 1)
+        self.assertNotIn('fp_line', output)
+
+        output = Kicad7FileHandler(kicad_mod).serialize()
+        self.assertIn('(fill solid)', output)
+        self.assertEqual(output.count('fp_rect'), 1)
+        self.assertNotIn('fp_poly', output)
+
+        kicad_mod = Footprint('rect_fill')
+        kicad_mod.append(RectFill(start=[0, 0], end=[2, 1], layer='F.Fab', mode=RectFill.MODE_HATCHED))
+        self.assertEqual(KicadFileHandler(kicad_mod).serialize(timestamp=0).count('fp_line'), 8)
+
+        self.assertRaises(ValueError, RectFill, start=[0, 0], end=[2, 1], mode='dotted')
+
+    def testFilledRect(self):
+        kicad_mod = Footprint('filled_rect')
+        kicad_mod.append(FilledRect(start=[0, 0], end=[2, 1], layer='F.Fab'))
+        output = KicadFileHandler(kicad_mod).serialize(timestamp=0)
+        self.assertIn('(fp_poly (pts (xy 0 0) (xy 2 0) (xy 2 1) (xy 0 1)) (layer F.Fab) (width 0.1))', output)
+        self.assertNotIn('fp_line', output)
+
+        self.assertIsNone(FilledRect(start=[0, 0], end=[2, 1]).width)
+        self.assertEqual(FilledRect(start=[0, 0], end=[2, 1], width=0.2).width, 0.2)
+
+        kicad_mod = Footprint('filled_rect')
+        kicad_mod.append(FilledRect(start=[0, 0], end=[2, 1], layer='F.Fab', mode=RectFill.MODE_HATCHED))
+        self.assertEqual(KicadFileHandler(kicad_mod).serialize(timestamp=0).count('fp_line'), 12)
+
+    def testCopySharedPoints(self):
+        polygon = Polygon(nodes=POINTS, layer='F.Fab')
+        copy = polygon.copy()
+        self.assertIs(copy.nodes._nodes, polygon.nodes._nodes)
+
+        # reading the points does not copy them
+        self.assertIs(copy.nodes[0], polygon.nodes[0])
+        self.assertIs(copy.nodes._nodes, polygon.nodes._nodes)
+
+        copy.translate([1, 1])
+        self.assertEqual(list(copy.nodes), [Vector2D(x + 1, y + 1) for x, y in POINTS])
+        self.assertEqual(list(polygon.nodes), [Vector2D(p) for p in POINTS])
+
+        polygon.rotate(90)
+        self.assertEqual(list(copy.nodes), [Vector2D(x + 1, y + 1) for x, y in POINTS])
@@ -0,0 +1,117 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import struct
+import unittest
+import zlib
+
+from KicadModTree import *
+from KicadModTree.PngFileHandler import Canvas
+from KicadModTree.util.render_util import FlatPathBuilder
+
+RESULT_CUSTOM_PAD = """<svg xmlns="http://www.w3.org/2000/svg" width="3.5mm" height="4mm" viewBox="-1.5 -2 3.5 4">
+<title>test F.Cu</title>
+<g id="F.Cu" stroke-linecap="round" stroke-linejoin="round">
+<path fill="#c83434" d="M0.5 0 A0.5 0.5 0 0 1 -0.5 0 A0.5 0.5 0 0 1 0.5 0 Z M0 0 L1 0 L1 1 Z"/>
+<path fill="none" stroke="#c83434" stroke-width="0.2" d="M0 0 L0 -1"/>
+</g>
+</svg>
+"""
+
+
+def read_png(data):
+    # returns width, height and the rows of pixels as bytes, only for unfiltered 8 bit RGB images
+    assert data[:8] == b'\x89PNG\r\n\x1a\n'
+    pos = 8
+    chunks = {}
+    while pos < len(data):
+        length, = struct.unpack('>I', data[pos:pos + 4])
+        kind = data[pos + 4:pos + 8]
+        chunks[kind] = chunks.get(kind, b'') + data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+
+    width, height = struct.unpack('>II', chunks[b'IHDR'][:8])
+    raw = zlib.decompress(chunks[b'IDAT'])
+    stride = 3 * width + 1
+    return width, height, [raw[i + 1:i + stride] for i in range(0, len(raw), stride)]
+
+
+class RenderTests(unittest.TestCase):
+
+    def testCanvasFill(self):
+        canvas = Canvas(4, 3, '#000000')
+        canvas.fill([[(1, 0), (3, 0), (3, 2), (1, 2)]], '#ff0000')
+
+        width, height, rows = read_png(canvas.toPng())
+        self.assertEqual((width, height), (4, 3))
+        self.assertEqual(rows[0], b'\x00\x00\x00' + b'\xff\x00\x00' * 2 + b'\x00\x00\x00')
+        self.assertEqual(rows[1], rows[0])
+        self.assertEqual(rows[2], b'\x00\x00\x00' * 4)
+
+    def testCanvasNonzero(self):
+        # overlapping polygons with the same orientation stay filled
+        canvas = Canvas(4, 1, '#000000')
+        canvas.fill([[(0, 0), (3, 0), (3, 1), (0, 1)], [(1, 0), (4, 0), (4, 1), (1, 1)]], '#ffffff')
+
+        width, height, rows = read_png(canvas.toPng())
+        self.assertEqual(rows[0], b'\xff' * 12)
+
+    def testFlatArc(self):
+        builder = FlatPathBuilder(tolerance=0.001)
+        builder.moveTo((1, 0))
+        builder.arcTo(1, True, (0, 1))
+
+        points = builder.subpaths[0]
+        self.assertEqual(points[0], (1, 0))
+        self.assertEqual(points[-1], (0, 1))
+        for x, y in points:
+            self.assertAlmostEqual(x * x + y * y, 1)
+            self.assertGreaterEqual(y, 0)
+
+    def testSvgCustomPad(self):
+        kicad_mod = Footprint("test")
+        kicad_mod.append(Pad(number=1, type=Pad.TYPE_SMT, shape=Pad.SHAPE_CUSTOM, at=[0, 0], size=[1, 1],
+                             layers=['F.Cu'], primitives=[Polygon(nodes=[[0, 0], [1, 0], [1, 1]]),
+                                                          Line(start=[0, 0], end=[0, -1], width=0.2)]))
+
+        file_handler = SvgFileHandler(kicad_mod)
+        self.assertEqual(file_handler.serialize(layer='F.Cu', background=None), RESULT_CUSTOM_PAD)
+
+    def testPngPad(self):
+        kicad_mod = Footprint("test")
+        kicad_mod.append(Pad(number=1, type=Pad.TYPE_THT, shape=Pad.SHAPE_RECT, at=[0, 0], size=[2, 2], drill=1,
+                             layers=['F.Cu']))
+
+        width, height, rows = read_png(PngFileHandler(kicad_mod).serialize(layer='F.Cu', resolution=10))
+        self.assertEqual((width, height), (40, 40))
+
+        copper, background = b'\xc8\x34\x34', b'\x00\x10\x23'
+        self.assertEqual(rows[5][3 * 5:3 * 6], background)
+        self.assertEqual(rows[12][3 * 12:3 * 13], copper)
+        self.assertEqual(rows[20][3 * 20:3 * 21], background)
+
+    def testContactSheets(self):
+        footprints = []
+        for i in range(3):
+            kicad_mod = Footprint("fp_{}".format(i))
+            kicad_mod.append(Circle(center=[0, 0], radius=i + 1, layer='F.SilkS'))
+            footprints.append(kicad_mod)
+
+        svg = renderSvgContactSheet(footprints, columns=2, cell_size=20)
+        self.assertIn('width="40mm" height="40mm"', svg)
+        self.assertEqual(svg.count('<text'), 3)
+
+        width, height, rows = read_png(renderPngContactSheet(footprints, columns=2, cell_size=50))
+        self.assertEqual((width, height), (100, 100))
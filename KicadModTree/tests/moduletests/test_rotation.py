@@ -1,6 +1,7 @@
 import unittest
 import math
 from KicadModTree import *
+from KicadModTree.util.kicad_util import sinCos
 
 RESULT_rotText = """(module test_rotate (layer F.Cu) (tedit 0)
   (fp_text user -1 (at 2 0) (layer F.SilkS)
@@ -251,3 +252,35 @@ class RotationTests(unittest.TestCase):
         file_handler = KicadFileHandler(kicad_mod)
         file_handler.writeFile('test.kicad_mod')
         self.assertEqual(file_handler.serialize(timestamp=0), RESULT_rotPad)
+
+    def testSinCos(self):
+        self.assertEqual(sinCos(90), (1, 0))
+        self.assertEqual(sinCos(-90), (-1, 0))
+        self.assertEqual(sinCos(540.0), (0, -1))
+        self.assertAlmostEqual(sinCos(30)[0], 0.5)
+
+    def testVectorRotation(self):
+        for angle, expected in [(0, (1, 2)), (90, (-2, 1)), (180, (-1, -2)), (270, (2, -1)), (-90, (2, -1))]:
+            self.assertEqual(Vector2D(1, 2).rotate(angle), Vector2D(expected))
+
+        self.assertEqual(Vector2D(1, 2).rotate(90, origin=(1, 1)), Vector2D(0, 1))
+        self.assertEqual(Vector2D(1, 2).rotate(90, origin=Vector2D(1, 1)), Vector2D(0, 1))
+
+        pad = Pad(type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT, at=[0.635, 1.27], size=1, layers=Pad.LAYERS_SMT)
+        pad.rotate(90)
+        self.assertEqual(pad.at, Vector2D(-1.27, 0.635))
+        self.assertEqual(pad.rotation, -90)
+
+    def testRealPosition(self):
+        kicad_mod = Footprint('rotation')
+        rotation = Rotation(90)
+        kicad_mod.append(rotation)
+        line = Line(start=[1, 2], end=[3, 4], layer='F.Fab')
+        rotation.append(line)
+
+        self.assertEqual(line.getRealPosition(line.start_pos), Vector3D(2, -1))
+        position, angle = line.getRealPosition(line.end_pos, 10)
+        self.assertEqual(position, Vector3D(4, -3))
+        self.assertEqual(angle, 100)
+
+        self.assertIn('(fp_line (start 2 -1) (end 4 -3) (layer F.Fab)', KicadFileHandler(kicad_mod).serialize())
@@ -0,0 +1,70 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+import importlib.util
+import os
+import unittest
+
+
+ROOT_DIRECTORY = os.path.join(os.path.dirname(os.path.realpath(__file__)), "../../../")
+
+SIZES = [1, 1.25, 1.5, 1.75, 2, 2.25, 2.75]
+
+
+def loadSwitchMaker():
+    spec = importlib.util.spec_from_file_location('switch_maker', os.path.join(ROOT_DIRECTORY, 'switch-maker.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class SwitchMakerTests(unittest.TestCase):
+
+    def setUp(self):
+        self.switch_maker = loadSwitchMaker()
+        self.maker = self.switch_maker.KeyboardSwitchMaker()
+        self.spec = self.switch_maker.load_variant_spec(os.path.join(ROOT_DIRECTORY, 'switch-variants.yml'))
+
+    def testEnabledVariants(self):
+        # the footprints make_switches created before the variants were moved into switch-variants.yml
+        expected = [('MX-Hotswap-{}u'.format(size), size, ['mx-hotswap'], {'anti_shear': False}) for size in SIZES]
+        expected += [('MX-Hotswap-{}u-Antishear'.format(size), size, ['mx-hotswap'], {'anti_shear': True})
+                     for size in SIZES]
+
+        jobs = list(self.maker.iter_variant_jobs(self.spec))
+        self.assertEqual(sorted(jobs, key=lambda job: job[0]), sorted(expected, key=lambda job: job[0]))
+
+    def testDisabledVariants(self):
+        for variant in self.spec['variants']:
+            variant['enabled'] = True
+        jobs = dict((name, (size, sw_types, options))
+                    for name, size, sw_types, options in self.maker.iter_variant_jobs(self.spec))
+
+        self.assertEqual(jobs['MX-Alps-1.5u-LEDFlip'], (1.5, ['mx', 'alps'], {'led_flip': True}))
+
+        # make_hotswap_outemu created these with the normal hotswap, they use the outemu option now
+        for size in SIZES:
+            self.assertEqual(jobs['MX-Hotswap-Outemu-{}u'.format(size)], (size, ['mx-hotswap'], {'outemu': True}))
+
+        stabflip = set(name for name in jobs if 'Stabflip' in name)
+        self.assertEqual(stabflip, set('MX-Hotswap-Stabflip-Outemu-{}u'.format(size) for size in [2, 2.25, 2.75]))
+        self.assertEqual(jobs['MX-Hotswap-Stabflip-Outemu-2u'],
+                         (2, ['mx-hotswap'], {'outemu': True, 'reversed_stabs': True}))
+
+    def testConflictingVariants(self):
+        spec = {'variants': [{'name': 'MX-{size}u', 'types': [['mx']], 'sizes': [1]},
+                             {'name': 'MX-{size}u', 'types': [['alps']], 'sizes': [1]}]}
+        with self.assertRaises(ValueError):
+            list(self.maker.iter_variant_jobs(spec))
@@ -13,6 +13,7 @@
 #
 # (C) 2016 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
 
+import io
 import unittest
 
 from KicadModTree.nodes.Node import *
@@ -23,6 +24,11 @@ class TestChildNode(Node):
         Node.__init__(self)
 
 
+class MultiLineNode(Node):
+    def _getRenderTreeText(self):
+        return "MultiLineNode\nsecond line"
+
+
 class NodeTests(unittest.TestCase):
 
     def testInit(self):
@@ -264,3 +270,81 @@ class NodeTests(unittest.TestCase):
         node.insert(insertNode)
         self.assertEqual(len(node.getNormalChilds()), 1)
         self.assertEqual(len(insertNode.getNormalChilds()), 200)
+
+    def testCopy(self):
+        node = Node()
+        parentNode = Node()
+        parentNode.append(node)
+
+        childNode = TestChildNode()
+        childNode.at = Vector2D(1, 2)
+        childNode.layers = ('F.Cu', 'F.Mask')
+        childNode.sizes = [Vector2D(1, 1), Vector2D(2, 2)]
+        node.append(childNode)
+
+        copyNode = node.copy()
+        self.assertIs(copyNode.getParent(), None)
+        self.assertIs(node.getParent(), parentNode)
+        self.assertEqual(len(copyNode.getNormalChilds()), 1)
+
+        copyChildNode = copyNode.getNormalChilds()[0]
+        self.assertIsInstance(copyChildNode, TestChildNode)
+        self.assertIsNot(copyChildNode, childNode)
+        self.assertIs(copyChildNode.getParent(), copyNode)
+        self.assertIs(copyChildNode.layers, childNode.layers)
+        self.assertIsNot(copyChildNode.sizes, childNode.sizes)
+
+        copyChildNode.at.x = 3
+        copyChildNode.sizes[0] += (1, 1)
+        self.assertEqual(childNode.at, Vector2D(1, 2))
+        self.assertEqual(childNode.sizes, [Vector2D(1, 1), Vector2D(2, 2)])
+        self.assertEqual(copyChildNode.sizes, [Vector2D(2, 2), Vector2D(2, 2)])
+
+    def testRemoveMultiple(self):
+        node = Node()
+        childNodes = [Node() for i in range(0, 200)]
+        node.extend(childNodes)
+
+        node.removeMultiple(childNodes[::2])
+        self.assertEqual(node.getNormalChilds(), childNodes[1::2])
+        for childNode in childNodes[::2]:
+            self.assertIs(childNode.getParent(), None)
+
+        with self.assertRaises(TypeError):
+            node.removeMultiple([childNodes[1], None])
+        self.assertEqual(node.getNormalChilds(), childNodes[1::2])
+        self.assertEqual(childNodes[1].getParent(), node)
+
+        node.extend(childNodes[::2])
+        self.assertEqual(node.getNormalChilds(), childNodes[1::2] + childNodes[::2])
+
+    def testRenderTree(self):
+        node = Node()
+        childNode1 = TestChildNode()
+        childNode2 = Node()
+        node.extend([childNode1, childNode2])
+        childNode1.append(Node())
+        childNode1.getNormalChilds()[0].append(TestChildNode())
+
+        self.assertEqual(node.getRenderTree(),
+                         "+ Node\n  * TestChildNode\n    * Node\n      * TestChildNode\n  * Node")
+        self.assertEqual(list(node.iterRenderTree()), node.getRenderTree().splitlines())
+
+        self.assertEqual(list(node.iterRenderTree(max_depth=1)),
+                         ["+ Node", "  * TestChildNode", "    ... 2 more nodes", "  * Node"])
+        self.assertEqual(list(node.iterRenderTree(node_types=TestChildNode)),
+                         ["  * TestChildNode", "      * TestChildNode"])
+
+        output = io.StringIO()
+        self.assertEqual(node.writeRenderTree(output, max_depth=0), 1)
+        self.assertEqual(output.getvalue(), "+ Node\n  ... 4 more nodes\n")
+
+        # the count is independent of the number of lines of a node
+        childNode2.append(MultiLineNode())
+        output = io.StringIO()
+        self.assertEqual(node.writeRenderTree(output), 6)
+        self.assertEqual(output.getvalue().count('\n'), 7)
+
+        childNode2._childs[node] = None
+        with self.assertRaises(RecursionDetectedError):
+            node.getRenderTree()
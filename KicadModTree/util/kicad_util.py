@@ -13,20 +13,84 @@
 #
 # (C) 2016-2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
 
+import io
+import math
+import mmap
+import os
 import time
 import re
 
 
+# formated floats by value, the footprints of a library only use a limited number of distinct values. Once it is
+# full, the cache is simply started again.
+_FLOAT_STRINGS = {}
+_FLOAT_STRINGS_SIZE = 65536
+
+# KiCad stores all lengths as integer nanometres
+NANOMETRES_PER_MM = 1000000
+
+
 def formatFloat(val):
     '''
     return well formated float
     '''
-    result = ('%f' % val).rstrip('0').rstrip('.')
-    if result == '-0':
-        result = '0'
+    result = _FLOAT_STRINGS.get(val)
+    if result is None:
+        result = ('%f' % val).rstrip('0').rstrip('.')
+        if result == '-0':
+            result = '0'
+
+        if len(_FLOAT_STRINGS) >= _FLOAT_STRINGS_SIZE:
+            _FLOAT_STRINGS.clear()
+        _FLOAT_STRINGS[val] = result
+    return result
+
+
+# sin and cos by angle in degrees (see sinCos), the values of multiples of 90° are exact
+_SIN_COS = {0: (0., 1.), 90: (1., 0.), 180: (0., -1.), 270: (-1., 0.)}
+_SIN_COS_SIZE = 4096
+
+
+def sinCos(angle):
+    '''
+    return sin and cos of an angle in degrees. They are exactly 0 and +-1 for multiples of 90°, so rotating by these
+    angles only swaps and negates coordinates, without leaving noise like cos(90°) = 6.123e-17
+    '''
+    result = _SIN_COS.get(angle)
+    if result is None:
+        result = _SIN_COS.get(angle % 360)
+        if result is None:
+            phi = math.radians(angle)
+            result = (math.sin(phi), math.cos(phi))
+
+        if len(_SIN_COS) < _SIN_COS_SIZE:
+            _SIN_COS[angle] = result
     return result
 
 
+def toNanometres(val):
+    '''
+    return length in mm as integer nanometres
+    '''
+    return int(round(val * NANOMETRES_PER_MM))
+
+
+def formatNanometres(val):
+    '''
+    return length in integer nanometres formated like formatFloat (in mm), without any float rounding
+    '''
+    millimetres, nanometres = divmod(abs(val), NANOMETRES_PER_MM)
+    result = str(millimetres)
+    if nanometres:
+        result += ('.%06d' % nanometres).rstrip('0')
+    if val < 0:
+        result = '-' + result
+    return result
+
+
+_WHITESPACE_RE = re.compile(r'\s')
+
+
 def lispString(string):
     '''
     add quotation marks to string, when it include a white space or is empty
@@ -34,81 +98,114 @@ def lispString(string):
     if type(string) is not str:
         string = str(string)
 
-    if len(string) == 0 or re.match(".*\s.*", string):
+    if len(string) == 0 or _WHITESPACE_RE.search(string):
         return '"{}"'.format(string.replace('"', '\\"'))  # escape text
 
     return string
 
 
-def lispTokenizer(input):
+TOKEN_OPEN = 'open'
+TOKEN_CLOSE = 'close'
+TOKEN_ATOM = 'atom'
+TOKEN_STRING = 'string'
+
+_TOKEN_KINDS = [None, TOKEN_OPEN, TOKEN_CLOSE, TOKEN_STRING, TOKEN_ATOM, None]
+
+_TOKEN_PATTERN = r'(\()|(\))|"((?:[^"\\]|\\.)*)"|([^\s()"]+)|(\S)'
+_TOKEN_RE = re.compile(_TOKEN_PATTERN, re.DOTALL)
+_TOKEN_RE_BYTES = re.compile(_TOKEN_PATTERN.encode('ascii'), re.DOTALL)
+
+
+def lispTokenSpans(input):
     '''
-    Convert a string of characters into a list of tokens.
+    Lazily yield the tokens of a string or buffer (bytes, mmap, ...) as (kind, start, end) tuples.
+
+    Quoted strings are reported without their quotation marks. No token text is copied.
     '''
-    input = input.replace('(', ' ( ').replace(')', ' ) ')
+    token_re = _TOKEN_RE if isinstance(input, str) else _TOKEN_RE_BYTES
 
-    # split input, including whitespaces
-    base_tokens = re.split(r'(\s+)', input)
+    for match in token_re.finditer(input):
+        group = match.lastindex
+        kind = _TOKEN_KINDS[group]
+        if kind is None:
+            raise RuntimeError("missing closing quotation mark")
+        yield kind, match.start(group), match.end(group)
 
-    tokens = []
-    in_string = False
 
-    for token in base_tokens:
-        if not in_string and token.isspace():
-            continue
+def lispTokenText(input, kind, start, end):
+    '''
+    Get the text of a token yielded by lispTokenSpans
+    '''
+    if isinstance(input, str):
+        text = input[start:end]
+    else:
+        with memoryview(input) as view:
+            text = str(view[start:end], 'utf-8')
 
-        if len(token) == 0:
-            continue
+    if kind == TOKEN_STRING and '\\' in text:
+        text = re.sub(r'\\(.)', r'\1', text)
 
-        if token[0] == '"':
-            if in_string:
-                tokens[-1] += token[1:]
-                in_string = False
-            else:
-                tokens.append(token[1:])
-                in_string = True
+    return text
 
-        elif token[-1] == '"':
-            if in_string:
-                tokens[-1] += token[:-1]
-                in_string = False
-            else:
-                tokens.append(token[:-1])
-                in_string = True
 
+def lispTokenizer(input):
+    '''
+    Convert a string of characters into a list of tokens.
+    '''
+    tokens = []
+    for kind, start, end in lispTokenSpans(input):
+        if kind == TOKEN_OPEN:
+            tokens.append('(')
+        elif kind == TOKEN_CLOSE:
+            tokens.append(')')
         else:
-            if in_string:
-                tokens[-1] += token
-            else:
-                tokens.append(token)
-
-    if in_string:
-        raise RuntimeError("missing closing quotation mark")
-
-    # TOOD: remove invalid spaces from quotation (when having brackets inside)
+            tokens.append(lispTokenText(input, kind, start, end))
 
     return tokens
 
 
 def parseLispString(input):
+    '''
+    Parse a string or buffer (bytes, mmap, ...) into a nested list of strings
+    '''
     syntax_tree = []
     current_node = syntax_tree
     scope = [syntax_tree]
 
-    for token in lispTokenizer(input):
-        if token == "(":
-            scope.append([])
-            current_node.append(scope[-1])
-            current_node = scope[-1]
+    # same as iterating over lispTokenSpans, but inlined as this is the hot loop of the parser
+    is_str = isinstance(input, str)
+    token_re = _TOKEN_RE if is_str else _TOKEN_RE_BYTES
+    view = None if is_str else memoryview(input)
 
-        elif token == ")":
-            if len(scope) <= 1:
-                raise RuntimeError("missing opening brackets")
+    try:
+        for match in token_re.finditer(input):
+            group = match.lastindex
+            if group == 1:
+                scope.append([])
+                current_node.append(scope[-1])
+                current_node = scope[-1]
 
-            scope.pop()
-            current_node = scope[-1]
+            elif group == 2:
+                if len(scope) <= 1:
+                    raise RuntimeError("missing opening brackets")
 
-        else:
-            current_node.append(token)
+                scope.pop()
+                current_node = scope[-1]
+
+            elif group == 5:
+                raise RuntimeError("missing closing quotation mark")
+
+            else:
+                if is_str:
+                    text = match.group(group)
+                else:
+                    text = str(view[match.start(group):match.end(group)], 'utf-8')
+                if group == 3 and '\\' in text:
+                    text = re.sub(r'\\(.)', r'\1', text)
+                current_node.append(text)
+    finally:
+        if view is not None:
+            view.release()
 
     if len(scope) > 1:
         raise RuntimeError("missing closing brackets")
@@ -119,6 +216,214 @@ def parseLispString(input):
     return syntax_tree
 
 
+def parseLispFile(filename):
+    '''
+    Parse a .kicad_mod or .kicad_pcb file, reading it through a memory map instead of loading it into a string
+    '''
+    with io.open(filename, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
+
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return parseLispString(buffer)
+        finally:
+            buffer.close()
+
+
+_SCAN_PATTERN = r'(\()\s*([^\s()"]*)|(\))|"(?:[^"\\]|\\.)*"|(")'
+_SCAN_RE = re.compile(_SCAN_PATTERN, re.DOTALL)
+_SCAN_RE_BYTES = re.compile(_SCAN_PATTERN.encode('ascii'), re.DOTALL)
+
+
+def _findClosingBracket(input, start):
+    scan_re = _SCAN_RE if isinstance(input, str) else _SCAN_RE_BYTES
+
+    depth = 0
+    for match in scan_re.finditer(input, start):
+        group = match.lastindex
+        if group in (1, 2):
+            depth += 1
+        elif group == 3:
+            depth -= 1
+            if depth == 0:
+                return match.start()
+        elif group == 4:
+            raise RuntimeError("missing closing quotation mark")
+
+    raise RuntimeError("missing closing brackets")
+
+
+def iterLispForms(input, name, start=0, end=None):
+    '''
+    Stream all forms named `name` (like all `pad` forms) of a string or buffer as LazyLispList
+
+    The content of a matching form is not searched any further.
+    '''
+    is_str = isinstance(input, str)
+    scan_re = _SCAN_RE if is_str else _SCAN_RE_BYTES
+    head = name if is_str else name.encode('utf-8')
+    if end is None:
+        end = len(input)
+
+    pos = start
+    while True:
+        match = scan_re.search(input, pos, end)
+        if match is None:
+            return
+
+        group = match.lastindex
+        if group == 4:
+            raise RuntimeError("missing closing quotation mark")
+
+        if group == 2 and match.group(2) == head:
+            form = LazyLispList(input, match.start())
+            yield form
+            pos = form.end + 1
+        else:
+            pos = match.end()
+
+
+class LazyLispList(object):
+    r"""A list of a s-expression which is only parsed when its content is accessed
+
+    Sub-lists are skipped by bracket matching and returned as LazyLispList themselves, atoms and quoted strings
+    are returned as ``str``. The input has to stay available (and unmodified) as long as the list is used.
+
+    :param input: the string or buffer (bytes, mmap, ...) containing the s-expression
+    :param start: index of the opening bracket of the list
+
+    :Example:
+
+    >>> from KicadModTree.util.kicad_util import *
+    >>> footprint = parseLispLazy('(module test (layer F.Cu) (pad 1 smd rect (at 0 0)))')
+    >>> footprint.name, footprint[1]
+    ('module', 'test')
+    >>> [pad[1] for pad in footprint.findAll('pad')]
+    ['1']
+    """
+
+    def __init__(self, input, start):
+        self._input = input
+        self.start = start
+        self._end = None
+        self._items = None
+
+    @property
+    def end(self):
+        r"""index of the closing bracket of the list"""
+        if self._end is None:
+            self._end = _findClosingBracket(self._input, self.start)
+        return self._end
+
+    @property
+    def name(self):
+        r"""the first atom of the list (like ``module`` or ``pad``), None if it does not start with one"""
+        if self._items is not None:
+            return self._items[0] if self._items and isinstance(self._items[0], str) else None
+
+        scan_re = _SCAN_RE if isinstance(self._input, str) else _SCAN_RE_BYTES
+        match = scan_re.match(self._input, self.start)
+        if match is None or match.lastindex != 2 or match.start(2) == match.end(2):
+            return None
+        return lispTokenText(self._input, TOKEN_ATOM, match.start(2), match.end(2))
+
+    def _getItems(self):
+        if self._items is not None:
+            return self._items
+
+        input = self._input
+        token_re = _TOKEN_RE if isinstance(input, str) else _TOKEN_RE_BYTES
+        end = self.end
+
+        items = []
+        pos = self.start + 1
+        while True:
+            match = token_re.search(input, pos, end)
+            if match is None:
+                break
+
+            group = match.lastindex
+            if group == 1:
+                sub_list = LazyLispList(input, match.start())
+                items.append(sub_list)
+                pos = sub_list.end + 1
+            elif group == 5:
+                raise RuntimeError("missing closing quotation mark")
+            else:
+                items.append(lispTokenText(input, _TOKEN_KINDS[group], match.start(group), match.end(group)))
+                pos = match.end()
+
+        self._items = items
+        return items
+
+    def find(self, name):
+        r"""get the first direct sub-list named `name`, or None"""
+        for form in self.findAll(name):
+            return form
+        return None
+
+    def findAll(self, name):
+        r"""stream all direct sub-lists named `name`"""
+        for item in self._getItems():
+            if isinstance(item, LazyLispList) and item.name == name:
+                yield item
+
+    def iterForms(self, name):
+        r"""stream all sub-lists named `name` at any depth, see ``iterLispForms``"""
+        return iterLispForms(self._input, name, self.start + 1, self.end)
+
+    def materialize(self):
+        r"""parse the whole list into nested python lists, like ``parseLispString``"""
+        if isinstance(self._input, str):
+            return parseLispString(self._input[self.start:self.end + 1])
+
+        with memoryview(self._input) as view:
+            return parseLispString(view[self.start:self.end + 1])
+
+    def __len__(self):
+        return len(self._getItems())
+
+    def __getitem__(self, key):
+        return self._getItems()[key]
+
+    def __iter__(self):
+        return iter(self._getItems())
+
+    def __repr__(self):
+        return "LazyLispList ({name}, start={start})".format(name=self.name, start=self.start)
+
+
+def parseLispLazy(input):
+    r"""Get the first list of a string or buffer as LazyLispList, without parsing its content
+
+    :Example:
+
+    >>> from KicadModTree.util.kicad_util import *
+    >>> import mmap
+    >>> with open('example.kicad_mod', 'rb') as f:
+    ...     buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    ...     footprint = parseLispLazy(buffer)
+    ...     print(footprint[1], footprint.find('descr')[1])
+    """
+    token_re = _TOKEN_RE if isinstance(input, str) else _TOKEN_RE_BYTES
+    match = token_re.search(input)
+    if match is None or match.lastindex != 1:
+        raise RuntimeError("missing opening brackets")
+
+    return LazyLispList(input, match.start())
+
+
+class SexprFragment(str):
+    '''
+    An already rendered s-expression, which is written as it is by the SexprSerializer
+
+    Fragments are not indented any further, so fragments spanning multiple lines have to be rendered
+    with the prefix of their position in the output.
+    '''
+    __slots__ = ()
+
+
 class SexprSerializer(object):
     '''
     Converts a nested python list into a sexpr syntax which can be parsed by KiCad
@@ -140,50 +445,48 @@ class SexprSerializer(object):
             return formatFloat(primitive)
         elif pType is str:
             return lispString(primitive)
+        elif pType is SexprFragment:
+            return primitive
         else:
             raise RuntimeError("unexpected type: {}".format(pType))
 
     def sexpr_to_string(self, sexpr, prefix=None):
-        if prefix is None:
-            prefix = ""
+        parts = []
+        self._writeSexpr(sexpr, prefix or "", parts.append)
+        return "".join(parts)
 
-        serial_string = "("
+    def _writeSexpr(self, sexpr, prefix, write):
+        # the tokens are emitted into a single output, instead of building (and re-indenting) a string per list.
+        # An element which directly follows a line break is indented by one additional space, which applies to
+        # all lines of this element as well.
+        write("(")
 
-        # see: https://stackoverflow.com/questions/3190706/nonlocal-keyword-in-python-2-x
-        loop_ctrl = {'first': True, 'indentation': False}
+        first = True
+        indentation = False
 
-        def get_separator():
-            if loop_ctrl['first']:
-                loop_ctrl['first'] = False
-                return_str = ""
+        for attr in sexpr:
+            if attr is SexprSerializer.NEW_LINE:
+                write("\n")
+                write(prefix)
+                indentation = True
+                continue
+
+            if first:
+                first = False
+                separator = " " if indentation else ""
             else:
-                return_str = " "
-
-            if loop_ctrl['indentation']:
-                return_str += " "
-                loop_ctrl['indentation'] = False
+                separator = "  " if indentation else " "
+            if separator:
+                write(separator)
 
-            return return_str
-
-        for attr in sexpr:
             if isinstance(attr, (tuple, list)):
-                return_string = self.sexpr_to_string(attr, prefix + " ")
-
-                if loop_ctrl['indentation']:
-                    return_string = return_string.replace('\n', '\n ')
-                serial_string += get_separator()
-
-                serial_string += return_string
-            elif attr == SexprSerializer.NEW_LINE:
-                serial_string += "\n"
-                serial_string += prefix
-                loop_ctrl['indentation'] = True
+                self._writeSexpr(attr, prefix + ("  " if indentation else " "), write)
             else:
-                serial_string += get_separator()
-                serial_string += self.primitive_to_string(attr)
+                write(self.primitive_to_string(attr))
+
+            indentation = False
 
-        serial_string += ")"
-        return serial_string
+        write(")")
 
     def __str__(self):
         '''
@@ -0,0 +1,212 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2016-2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+from collections import namedtuple
+from difflib import SequenceMatcher
+
+from KicadModTree.util.kicad_util import parseLispString, lispString
+
+# forms which change on every run of a generator
+DEFAULT_IGNORED_FORMS = ('tedit', 'tstamp', 'uuid')
+
+LispDifference = namedtuple('LispDifference', ['path', 'expected', 'actual'])
+LispDifference.__doc__ = r"""A differing sub-form of two s-expression trees
+
+The path names the enclosing forms, like ``module/pad[2]/at`` for the ``at`` form of the third pad.
+``expected`` is None for an added form and ``actual`` is None for a removed one.
+"""
+
+
+def _toFloat(atom):
+    try:
+        return float(atom)
+    except ValueError:
+        return None
+
+
+def _atomsEqual(a, b, tolerance):
+    if a == b:
+        return True
+
+    a_value, b_value = _toFloat(a), _toFloat(b)
+    if a_value is None or b_value is None:
+        return False
+    return abs(a_value - b_value) <= tolerance
+
+
+def _formName(form):
+    if isinstance(form, list) and form and not isinstance(form[0], list):
+        return form[0]
+    return None
+
+
+def _alignKey(item, tolerance):
+    # key used to align the children of two forms, numbers are rounded to the tolerance
+    value = _toFloat(item)
+    if value is None or not tolerance or value != value or abs(value) == float('inf'):
+        return item
+    return round(value / tolerance)
+
+
+class _LispDiffer(object):
+    def __init__(self, tolerance, ignore):
+        self.tolerance = tolerance
+        self.ignore = set(ignore)
+        self.differences = []
+        self.keys = {}
+        self.atom_keys = {}
+
+    def _children(self, form):
+        return [child for child in form if _formName(child) not in self.ignore]
+
+    @staticmethod
+    def _childPaths(path, children):
+        counts = {}
+        paths = []
+        for child in children:
+            name = _formName(child)
+            paths.append('{}/{}[{}]'.format(path, name, counts.get(name, 0)))
+            counts[name] = counts.get(name, 0) + 1
+        return paths
+
+    def _key(self, item):
+        # keys of forms are cached by their identity, keys of atoms by their text
+        if not isinstance(item, list):
+            key = self.atom_keys.get(item)
+            if key is None:
+                key = self.atom_keys[item] = _alignKey(item, self.tolerance)
+            return key
+
+        key = self.keys.get(id(item))
+        if key is None:
+            key = self.keys[id(item)] = tuple([self._key(child) for child in item])
+        return key
+
+    def diff(self, expected, actual, path):
+        if _formName(expected) != _formName(actual):
+            self.differences.append(LispDifference(path, expected, actual))
+            return
+
+        expected_children, actual_children = self._children(expected), self._children(actual)
+        steps = self._align(expected_children, actual_children)
+
+        # differences of atoms are reported as the smallest form containing them
+        for i, j in steps:
+            if i is None or j is None:
+                atom_changed = not isinstance(actual_children[j] if i is None else expected_children[i], list)
+            else:
+                a, b = expected_children[i], actual_children[j]
+                if isinstance(a, list) and isinstance(b, list):
+                    continue
+                atom_changed = isinstance(a, list) or isinstance(b, list) or not _atomsEqual(a, b, self.tolerance)
+
+            if atom_changed:
+                self.differences.append(LispDifference(path, expected, actual))
+                return
+
+        expected_paths = self._childPaths(path, expected_children)
+        actual_paths = self._childPaths(path, actual_children)
+        for i, j in steps:
+            if j is None:
+                self.differences.append(LispDifference(expected_paths[i], expected_children[i], None))
+            elif i is None:
+                self.differences.append(LispDifference(actual_paths[j], None, actual_children[j]))
+            elif isinstance(expected_children[i], list) and expected_children[i] != actual_children[j]:
+                self.diff(expected_children[i], actual_children[j], expected_paths[i])
+
+    def _align(self, expected_children, actual_children):
+        # list of (expected index, actual index) in the order of the forms, one of them is None for a removed or
+        # added child. Children which are equal after rounding are aligned first, so a removed and an added
+        # form are not reported as a change of all forms in between.
+        if len(expected_children) == len(actual_children) and \
+                sum(1 for a, b in zip(expected_children, actual_children) if a != b) <= 1:
+            return list(zip(range(len(expected_children)), range(len(actual_children))))
+
+        a_keys = [self._key(child) for child in expected_children]
+        b_keys = [self._key(child) for child in actual_children]
+
+        steps = []
+        matcher = SequenceMatcher(None, a_keys, b_keys, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == 'equal':
+                steps.extend(zip(range(i1, i2), range(j1, j2)))
+                continue
+
+            # pair the replaced children by their form names, in order
+            a_names = [_formName(child) for child in expected_children[i1:i2]]
+            b_names = [_formName(child) for child in actual_children[j1:j2]]
+            inner = SequenceMatcher(None, a_names, b_names, autojunk=False)
+            for inner_tag, k1, k2, l1, l2 in inner.get_opcodes():
+                count = min(k2 - k1, l2 - l1) if inner_tag in ('equal', 'replace') else 0
+                steps.extend((i1 + k1 + n, j1 + l1 + n) for n in range(count))
+                steps.extend((i, None) for i in range(i1 + k1 + count, i1 + k2))
+                steps.extend((None, j) for j in range(j1 + l1 + count, j1 + l2))
+
+        return steps
+
+
+def diffLispTrees(expected, actual, **kwargs):
+    r"""Compare two parsed s-expression trees structurally
+
+    Numbers are equal when they differ by at most the tolerance, so ``1`` equals ``1.0``, and the formatting of
+    the files does not matter at all. Only the smallest differing sub-forms are reported: a differing number in
+    ``(at 1 2)`` reports the ``at`` form, an added ``fp_line`` reports just this line.
+
+    :param expected: nested list, as returned by ``parseLispString``
+    :param actual: nested list, as returned by ``parseLispString``
+    :param \**kwargs:
+        See below
+
+    :Keyword Arguments:
+        * *tolerance* (``float``) --
+          maximal difference of equal numbers (default: 1e-6)
+        * *ignore* (``list(str)``) --
+          names of forms which are not compared (default: ('tedit', 'tstamp', 'uuid'))
+
+    :return: list of ``LispDifference``, empty when both trees are equal
+
+    :Example:
+
+    >>> from KicadModTree.util.lisp_diff import diffLispTrees
+    >>> diffLispTrees(['module', 'a', ['at', '1', '2']], ['module', 'a', ['at', '1.0', '2.5']])
+    [LispDifference(path='module/at[0]', expected=['at', '1', '2'], actual=['at', '1.0', '2.5'])]
+    """
+    differ = _LispDiffer(kwargs.get('tolerance', 1e-6), kwargs.get('ignore', DEFAULT_IGNORED_FORMS))
+    if expected != actual:
+        differ.diff(expected, actual, _formName(expected) or '')
+    return differ.differences
+
+
+def diffLispStrings(expected, actual, **kwargs):
+    r"""Parse two s-expression strings (or buffers) and compare them with ``diffLispTrees``
+    """
+    return diffLispTrees(parseLispString(expected), parseLispString(actual), **kwargs)
+
+
+def _formatForm(form):
+    if not isinstance(form, list):
+        return lispString(form)
+    return '(' + ' '.join(_formatForm(item) for item in form) + ')'
+
+
+def formatLispDifference(difference):
+    r"""Get a human readable description of a ``LispDifference``
+    """
+    if difference.expected is None:
+        return '{}: added {}'.format(difference.path, _formatForm(difference.actual))
+    if difference.actual is None:
+        return '{}: removed {}'.format(difference.path, _formatForm(difference.expected))
+    return '{}:\n  - {}\n  + {}'.format(difference.path, _formatForm(difference.expected),
+                                         _formatForm(difference.actual))
@@ -0,0 +1,199 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2016-2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+from KicadModTree.util.kicad_util import formatFloat
+
+
+def _snap(value, tolerance):
+    return int(round(value / tolerance))
+
+
+def _clusterRectangles(rects):
+    # group rectangles which overlap or touch, using a sweep over the x axis
+    parent = list(range(len(rects)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    order = sorted(range(len(rects)), key=lambda i: rects[i][0])
+    active = []
+    for i in order:
+        x0, y0, x1, y1 = rects[i]
+        active = [j for j in active if rects[j][2] >= x0]
+        for j in active:
+            if rects[j][1] <= y1 and y0 <= rects[j][3]:
+                parent[find(i)] = find(j)
+        active.append(i)
+
+    clusters = {}
+    for i in range(len(rects)):
+        clusters.setdefault(find(i), []).append(rects[i])
+    return [clusters[key] for key in sorted(clusters)]
+
+
+def _removeCollinear(loop):
+    result = []
+    count = len(loop)
+    for i in range(count):
+        prev, cur, nxt = loop[i - 1], loop[i], loop[(i + 1) % count]
+        if (cur[0] - prev[0]) * (nxt[1] - prev[1]) - (cur[1] - prev[1]) * (nxt[0] - prev[0]) != 0:
+            result.append(cur)
+    return result
+
+
+def _unionOutline(rects):
+    # outline of the union of axis aligned rectangles, on a grid given by all rectangle edges
+    xs = sorted(set(x for r in rects for x in (r[0], r[2])))
+    ys = sorted(set(y for r in rects for y in (r[1], r[3])))
+    x_index = dict((x, i) for i, x in enumerate(xs))
+    y_index = dict((y, i) for i, y in enumerate(ys))
+
+    covered = set()
+    for x0, y0, x1, y1 in rects:
+        for i in range(x_index[x0], x_index[x1]):
+            for j in range(y_index[y0], y_index[y1]):
+                covered.add((i, j))
+
+    # boundary edges of the covered cells, oriented clockwise around the covered area
+    edges = {}
+    for i, j in covered:
+        x0, x1, y0, y1 = xs[i], xs[i + 1], ys[j], ys[j + 1]
+        if (i, j - 1) not in covered:
+            edges.setdefault((x0, y0), []).append((x1, y0))
+        if (i + 1, j) not in covered:
+            edges.setdefault((x1, y0), []).append((x1, y1))
+        if (i, j + 1) not in covered:
+            edges.setdefault((x1, y1), []).append((x0, y1))
+        if (i - 1, j) not in covered:
+            edges.setdefault((x0, y1), []).append((x0, y0))
+
+    loops = []
+    while edges:
+        start = min(edges)
+        loop = [start]
+        point = start
+        while True:
+            targets = edges[point]
+            target = targets.pop()
+            if not targets:
+                del edges[point]
+            if target == start:
+                break
+            loop.append(target)
+            point = target
+        loops.append(_removeCollinear(loop))
+
+    return loops
+
+
+def mergeRectangles(rects, tolerance=0.001):
+    r"""Get the outlines of the union of axis aligned rectangles
+
+    All coordinates are snapped to the tolerance first, so edges which are closer than the tolerance are merged.
+    Rectangles which overlap or share an edge become one outline, holes of the union are returned as separate
+    outlines. Outer outlines are clockwise and holes counter clockwise, in a coordinate system with the y axis
+    pointing down.
+
+    :param rects: iterable of ``(x0, y0, x1, y1)`` tuples
+    :param tolerance: grid the coordinates are snapped to (default: 0.001)
+    :return: list of outlines, every outline is a list of ``(x, y)`` points
+
+    :Example:
+
+    >>> from KicadModTree.util.plate_util import mergeRectangles
+    >>> mergeRectangles([(0, 0, 2, 1), (1, 0, 3, 1)])
+    [[(0.0, 0.0), (3.0, 0.0), (3.0, 1.0), (0.0, 1.0)]]
+    """
+    snapped = []
+    for x0, y0, x1, y1 in rects:
+        x0, x1 = sorted((_snap(x0, tolerance), _snap(x1, tolerance)))
+        y0, y1 = sorted((_snap(y0, tolerance), _snap(y1, tolerance)))
+        if x0 < x1 and y0 < y1:
+            snapped.append((x0, y0, x1, y1))
+
+    outlines = []
+    for cluster in _clusterRectangles(snapped):
+        if len(cluster) == 1:
+            x0, y0, x1, y1 = cluster[0]
+            loops = [[(x0, y0), (x1, y0), (x1, y1), (x0, y1)]]
+        else:
+            loops = _unionOutline(cluster)
+
+        for loop in loops:
+            outlines.append([(x * tolerance, y * tolerance) for x, y in loop])
+
+    return outlines
+
+
+def outlinesToSvg(outlines, **kwargs):
+    r"""Get a svg image of closed outlines, as used by laser cutters
+
+    :param outlines: list of outlines, every outline is a list of ``(x, y)`` points in mm
+    :param \**kwargs:
+        See below
+
+    :Keyword Arguments:
+        * *stroke* (``str``) --
+          color of the lines (default: '#000000')
+        * *stroke_width* (``float``) --
+          width of the lines in mm (default: 0.1)
+    """
+    stroke = kwargs.get('stroke', '#000000')
+    stroke_width = kwargs.get('stroke_width', 0.1)
+
+    points = [p for outline in outlines for p in outline] or [(0, 0)]
+    x0, y0 = min(p[0] for p in points), min(p[1] for p in points)
+    x1, y1 = max(p[0] for p in points), max(p[1] for p in points)
+
+    path = []
+    for outline in outlines:
+        path.append('M' + ' L'.join('{} {}'.format(formatFloat(x), formatFloat(y)) for x, y in outline) + ' Z')
+
+    return ('<svg xmlns="http://www.w3.org/2000/svg" width="{w}mm" height="{h}mm" viewBox="{x} {y} {w} {h}">\n'
+            '<path fill="none" stroke="{stroke}" stroke-width="{stroke_width}" d="{d}"/>\n'
+            '</svg>\n').format(x=formatFloat(x0), y=formatFloat(y0), w=formatFloat(x1 - x0),
+                               h=formatFloat(y1 - y0), stroke=stroke, stroke_width=formatFloat(stroke_width),
+                               d=' '.join(path))
+
+
+def outlinesToDxf(outlines, layer='0'):
+    r"""Get a DXF (R12) drawing of closed outlines, in mm
+
+    The y axis is flipped, as it points up in DXF. R12 has no header variable for the drawing units,
+    so the coordinates are written as plain mm values.
+
+    :param outlines: list of outlines, every outline is a list of ``(x, y)`` points in mm
+    :param layer: name of the DXF layer (default: '0'), or a list with the layer of every outline
+    """
+    layers = layer if isinstance(layer, (list, tuple)) else [layer] * len(outlines)
+
+    dxf = ['0', 'SECTION', '2', 'HEADER',
+           '9', '$ACADVER', '1', 'AC1009',
+           '0', 'ENDSEC',
+           '0', 'SECTION', '2', 'ENTITIES']
+
+    for outline, outline_layer in zip(outlines, layers):
+        # the dummy point of POLYLINE is mandatory in R12, the vertices follow as VERTEX entities
+        dxf.extend(['0', 'POLYLINE', '8', outline_layer, '66', '1', '10', '0', '20', '0', '30', '0', '70', '1'])
+        for x, y in outline:
+            dxf.extend(['0', 'VERTEX', '8', outline_layer, '10', formatFloat(x), '20', formatFloat(-y)])
+        dxf.extend(['0', 'SEQEND', '8', outline_layer])
+
+    dxf.extend(['0', 'ENDSEC', '0', 'EOF'])
+
+    return '\n'.join(dxf) + '\n'
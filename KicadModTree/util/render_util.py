@@ -0,0 +1,357 @@
+# KicadModTree is free software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# KicadModTree is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kicad-footprint-generator. If not, see < http://www.gnu.org/licenses/ >.
+#
+# (C) 2016-2018 by Thomas Pointhuber, <thomas.pointhuber@gmx.at>
+
+from math import atan2, cos, sin, sqrt, pi, ceil
+
+from KicadModTree.nodes.base.Pad import Pad
+from KicadModTree.nodes.base.Arc import Arc
+from KicadModTree.nodes.base.Circle import Circle
+from KicadModTree.nodes.base.Line import Line
+from KicadModTree.nodes.base.Polygon import Polygon
+from KicadModTree.util.kicad_util import formatFloat, sinCos
+
+# colors of the layers, similar to the default color theme of KiCad
+LAYER_COLORS = {'F.Cu': '#c83434',
+                'B.Cu': '#4d7fc4',
+                'F.Mask': '#d864ff',
+                'B.Mask': '#02ffee',
+                'F.Paste': '#b4a0a0',
+                'B.Paste': '#00c2c2',
+                'F.SilkS': '#f2eda1',
+                'B.SilkS': '#e8b2a7',
+                'F.Fab': '#afafaf',
+                'B.Fab': '#585d84',
+                'F.CrtYd': '#ff26e2',
+                'B.CrtYd': '#26e9ff',
+                'Edge.Cuts': '#d0d2cd'}
+
+DEFAULT_COLOR = '#c2c200'
+
+DEFAULT_BACKGROUND = '#001023'
+
+# layers which are drawn first, when multiple layers are drawn into one image
+LAYER_ORDER = ['B.Fab', 'B.CrtYd', 'B.SilkS', 'B.Paste', 'B.Mask', 'B.Cu',
+               'F.Cu', 'F.Mask', 'F.Paste', 'F.SilkS', 'F.Fab', 'F.CrtYd', 'Edge.Cuts']
+
+
+def sortLayers(layers):
+    r"""Sort layers in the order they are drawn, back layers first
+
+    :param layers: iterable of layer names
+    """
+    return sorted(layers, key=lambda layer: (LAYER_ORDER.index(layer) if layer in LAYER_ORDER else len(LAYER_ORDER),
+                                             layer))
+
+
+def padTransform(position, rotation):
+    r"""Get a function which transforms pad coordinates into footprint coordinates
+
+    :param position: ``(x, y)`` position of the pad
+    :param rotation: rotation of the pad in degrees
+    """
+    # pad rotation is the wrong way round compared to Vector2D.rotate
+    s, c = sinCos(-rotation)
+    px, py = position
+
+    def transform(x, y):
+        return (px + c * x - s * y, py + s * x + c * y)
+
+    return transform
+
+
+def _identity(x, y):
+    return (x, y)
+
+
+class PathBuilder(object):
+    r"""Collect the outlines of many shapes, which are drawn with the same style
+
+    Subclasses decide how the outlines are stored, by implementing ``moveTo``, ``lineTo``, ``arcTo`` and ``close``.
+    Arcs are always given as parts which are not larger than a half circle.
+    """
+
+    def moveTo(self, p):
+        raise NotImplementedError("moveTo has to be implemented by child class")
+
+    def lineTo(self, p):
+        raise NotImplementedError("lineTo has to be implemented by child class")
+
+    def arcTo(self, radius, sweep, p):
+        raise NotImplementedError("arcTo has to be implemented by child class")
+
+    def close(self):
+        raise NotImplementedError("close has to be implemented by child class")
+
+    def isEmpty(self):
+        raise NotImplementedError("isEmpty has to be implemented by child class")
+
+    def circle(self, center, radius, transform=_identity):
+        points = [transform(center[0] + radius, center[1]), transform(center[0] - radius, center[1])]
+        self.moveTo(points[0])
+        self.arcTo(radius, True, points[1])
+        self.arcTo(radius, True, points[0])
+        self.close()
+
+    def polygon(self, points, transform=_identity):
+        self.moveTo(transform(*points[0]))
+        for p in points[1:]:
+            self.lineTo(transform(*p))
+        self.close()
+
+    def stadium(self, center1, center2, radius, transform=_identity):
+        # two half circles around the given centers, connected by straight lines
+        dx, dy = center2[0] - center1[0], center2[1] - center1[1]
+        length = sqrt(dx * dx + dy * dy)
+        nx, ny = dy / length * radius, -dx / length * radius
+
+        self.moveTo(transform(center1[0] + nx, center1[1] + ny))
+        self.lineTo(transform(center2[0] + nx, center2[1] + ny))
+        self.arcTo(radius, True, transform(center2[0] - nx, center2[1] - ny))
+        self.lineTo(transform(center1[0] - nx, center1[1] - ny))
+        self.arcTo(radius, True, transform(center1[0] + nx, center1[1] + ny))
+        self.close()
+
+    def roundRect(self, center, size, radius, transform=_identity):
+        x1, y1 = center[0] - size[0] / 2, center[1] - size[1] / 2
+        x2, y2 = center[0] + size[0] / 2, center[1] + size[1] / 2
+        r = radius
+
+        self.moveTo(transform(x1 + r, y1))
+        self.lineTo(transform(x2 - r, y1))
+        self.arcTo(r, True, transform(x2, y1 + r))
+        self.lineTo(transform(x2, y2 - r))
+        self.arcTo(r, True, transform(x2 - r, y2))
+        self.lineTo(transform(x1 + r, y2))
+        self.arcTo(r, True, transform(x1, y2 - r))
+        self.lineTo(transform(x1, y1 + r))
+        self.arcTo(r, True, transform(x1 + r, y1))
+        self.close()
+
+    def oval(self, center, size, transform=_identity):
+        hx, hy = size[0] / 2, size[1] / 2
+        if hx == hy:
+            self.circle(center, hx, transform)
+        elif hx > hy:
+            self.stadium((center[0] - hx + hy, center[1]), (center[0] + hx - hy, center[1]), hy, transform)
+        else:
+            self.stadium((center[0], center[1] - hy + hx), (center[0], center[1] + hy - hx), hx, transform)
+
+    def rect(self, center, size, transform=_identity):
+        hx, hy = size[0] / 2, size[1] / 2
+        x, y = center
+        self.polygon([(x - hx, y - hy), (x + hx, y - hy), (x + hx, y + hy), (x - hx, y + hy)], transform)
+
+
+class SvgPathBuilder(PathBuilder):
+    r"""Collect outlines as data of a single svg path element
+    """
+
+    def __init__(self):
+        self.parts = []
+
+    def moveTo(self, p):
+        self.parts.append('M{} {}'.format(formatFloat(p[0]), formatFloat(p[1])))
+
+    def lineTo(self, p):
+        self.parts.append('L{} {}'.format(formatFloat(p[0]), formatFloat(p[1])))
+
+    def arcTo(self, radius, sweep, p):
+        # arcs are split by the caller, so they never need the large arc flag
+        r = formatFloat(radius)
+        self.parts.append('A{r} {r} 0 0 {sweep} {x} {y}'.format(r=r, sweep=1 if sweep else 0,
+                                                                x=formatFloat(p[0]), y=formatFloat(p[1])))
+
+    def close(self):
+        self.parts.append('Z')
+
+    def isEmpty(self):
+        return not self.parts
+
+    def __str__(self):
+        return ' '.join(self.parts)
+
+
+class FlatPathBuilder(PathBuilder):
+    r"""Collect outlines as lists of points, arcs are approximated by line segments
+
+    :param tolerance: maximum distance between an arc and its approximation (default: 0.01)
+    """
+
+    def __init__(self, tolerance=0.01):
+        self.tolerance = tolerance
+        self.subpaths = []
+        self._current = None
+
+    def moveTo(self, p):
+        self._current = [p]
+        self.subpaths.append(self._current)
+
+    def lineTo(self, p):
+        self._current.append(p)
+
+    def arcTo(self, radius, sweep, p):
+        start = self._current[-1]
+        dx, dy = p[0] - start[0], p[1] - start[1]
+        chord = sqrt(dx * dx + dy * dy)
+        if chord == 0 or radius <= 0:
+            return
+
+        # center of the arc, on the side given by the sweep direction
+        h = sqrt(max(radius * radius - chord * chord / 4, 0))
+        mx, my = (start[0] + p[0]) / 2, (start[1] + p[1]) / 2
+        sign = 1 if sweep else -1
+        cx, cy = mx - sign * h * dy / chord, my + sign * h * dx / chord
+
+        a1 = atan2(start[1] - cy, start[0] - cx)
+        a2 = atan2(p[1] - cy, p[0] - cx)
+        delta = a2 - a1
+        if sweep and delta < 0:
+            delta += 2 * pi
+        elif not sweep and delta > 0:
+            delta -= 2 * pi
+
+        step = 2 * sqrt(max(2 * radius * self.tolerance - self.tolerance ** 2, 1e-12))
+        segments = max(1, int(ceil(abs(delta) * radius / step)))
+        for i in range(1, segments):
+            a = a1 + delta * i / segments
+            self._current.append((cx + radius * cos(a), cy + radius * sin(a)))
+        self._current.append(p)
+
+    def close(self):
+        if self._current[0] != self._current[-1]:
+            self._current.append(self._current[0])
+
+    def isEmpty(self):
+        return not self.subpaths
+
+
+class LayerGeometry(object):
+    r"""Outlines of all shapes of one layer, grouped by the way they are drawn
+
+    :param resolved: the resolved footprint
+    :type resolved: ``ResolvedFootprint``
+    :param layer: name of the layer
+    :param builder_class: ``PathBuilder`` used to collect the outlines
+
+    The outlines are found in:
+
+    * *fills* -- dict of line width to the outlines of filled polygons
+    * *strokes* -- dict of line width to lines, arcs and circles
+    * *pads* -- filled outlines of all pads
+    * *pad_strokes* -- dict of line width to stroked primitives of custom pads
+    * *drills* -- outlines of the drill holes
+    * *texts* -- list of visible text shapes
+    """
+
+    def __init__(self, resolved, layer, builder_class):
+        self.layer = layer
+        self._builder_class = builder_class
+
+        self.fills = {}
+        self.strokes = {}
+        self.pads = builder_class()
+        self.pad_strokes = {}
+        self.drills = builder_class()
+        self.texts = []
+
+        for shape in resolved.getShapes(layer):
+            if shape.kind == 'pad':
+                self._addPad(shape)
+            elif shape.kind == 'text':
+                if not shape.node.hide:
+                    self.texts.append(shape)
+            elif shape.kind == 'polygon':
+                self._builder(self.fills, shape.width).polygon(shape.geometry[0])
+            else:
+                self._addStroke(shape, self._builder(self.strokes, shape.width))
+
+    def _builder(self, builders, width):
+        builder = builders.get(width)
+        if builder is None:
+            builder = builders[width] = self._builder_class()
+        return builder
+
+    @staticmethod
+    def _addStroke(shape, builder):
+        geometry = shape.geometry
+
+        if shape.kind == 'line':
+            builder.moveTo(geometry[0])
+            builder.lineTo(geometry[1])
+        elif shape.kind == 'arc':
+            start, mid, end, center, radius, angle = geometry
+            # split at the mid point, so no part is larger than a half circle
+            builder.moveTo(start)
+            builder.arcTo(radius, angle > 0, mid)
+            builder.arcTo(radius, angle > 0, end)
+        elif shape.kind == 'circle':
+            builder.circle(geometry[0], geometry[1])
+
+    def _addPad(self, shape):
+        node = shape.node
+        position, rotation = shape.geometry
+        transform = padTransform(position, rotation)
+
+        offset = (node.offset.x, node.offset.y)
+        size = (node.size.x, node.size.y)
+
+        if node.shape == Pad.SHAPE_CIRCLE:
+            self.pads.circle(offset, size[0] / 2, transform)
+        elif node.shape == Pad.SHAPE_OVAL:
+            self.pads.oval(offset, size, transform)
+        elif node.shape == Pad.SHAPE_ROUNDRECT and node.radius_ratio > 0:
+            self.pads.roundRect(offset, size, node.radius_ratio * min(size), transform)
+        elif node.shape == Pad.SHAPE_CUSTOM:
+            if node.anchor_shape == Pad.ANCHOR_CIRCLE:
+                self.pads.circle(offset, size[0] / 2, transform)
+            else:
+                self.pads.rect(offset, size, transform)
+            self._addPadPrimitives(node, offset, transform)
+        else:
+            self.pads.rect(offset, size, transform)
+
+        if node.drill is not None and node.drill.x > 0 and node.drill.y > 0:
+            self.drills.oval((0, 0), (node.drill.x, node.drill.y), transform)
+
+    def _addPadPrimitives(self, node, offset, transform):
+        def local(x, y):
+            return transform(offset[0] + x, offset[1] + y)
+
+        for p in node.primitives:
+            for primitive in p.serialize():
+                width = primitive.width or 0
+
+                if isinstance(primitive, Polygon):
+                    self.pads.polygon([(n.x, n.y) for n in primitive.nodes], local)
+                    if width:
+                        self._builder(self.pad_strokes, width).polygon([(n.x, n.y) for n in primitive.nodes],
+                                                                       local)
+                elif isinstance(primitive, Line):
+                    builder = self._builder(self.pad_strokes, width)
+                    builder.moveTo(local(primitive.start_pos.x, primitive.start_pos.y))
+                    builder.lineTo(local(primitive.end_pos.x, primitive.end_pos.y))
+                elif isinstance(primitive, Circle):
+                    center = (primitive.center_pos.x, primitive.center_pos.y)
+                    if width:
+                        # a circle with width is a ring
+                        self._builder(self.pad_strokes, width).circle(center, primitive.radius, local)
+                    else:
+                        self.pads.circle(center, primitive.radius, local)
+                elif isinstance(primitive, Arc):
+                    builder = self._builder(self.pad_strokes, width)
+                    mid, end = primitive.getMidPoint(), primitive.getEndPoint()
+                    builder.moveTo(local(primitive.start_pos.x, primitive.start_pos.y))
+                    builder.arcTo(primitive.getRadius(), primitive.angle > 0, local(mid.x, mid.y))
+                    builder.arcTo(primitive.getRadius(), primitive.angle > 0, local(end.x, end.y))
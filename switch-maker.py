@@ -1,7 +1,43 @@
 #!/usr/bin/env python
 
-from KicadModTree import *
+from KicadModTree import Arc, Footprint, LibraryWriter, Model, Pad, RectLine, Text
+from KicadModTree.util.lisp_diff import formatLispDifference
+from KicadModTree.util.plate_util import mergeRectangles, outlinesToDxf, outlinesToSvg
+import itertools
 import math
+import sys
+
+try:
+    import yaml
+    YAML_AVAILABLE = True
+except ImportError:
+    YAML_AVAILABLE = False
+
+try:
+    import tomllib as toml_loader
+    TOML_AVAILABLE = True
+except ImportError:
+    try:
+        import toml as toml_loader
+        TOML_AVAILABLE = True
+    except ImportError:
+        TOML_AVAILABLE = False
+
+
+def load_variant_spec(filepath):
+    if filepath.endswith('.toml'):
+        if not TOML_AVAILABLE:
+            raise RuntimeError('tomllib or toml is required to read {}'.format(filepath))
+        if toml_loader.__name__ == 'tomllib':
+            with open(filepath, 'rb') as stream:
+                return toml_loader.load(stream)
+        with open(filepath, 'r') as stream:
+            return toml_loader.load(stream)
+
+    if not YAML_AVAILABLE:
+        raise RuntimeError('pyyaml is required to read {}'.format(filepath))
+    with open(filepath, 'r') as stream:
+        return yaml.safe_load(stream)
 
 
 class KeyboardSwitchMaker(object):
@@ -48,6 +84,16 @@ class KeyboardSwitchMaker(object):
             'alps': (15.5, 12.8),
             'choc': (14.0, 14.0)
         }
+        self.stabilizer_cutout_size = {
+            'mx': (6.65, 12.3),
+            'mx-hotswap': (6.65, 12.3)
+        }
+        # stabilizer offsets of keys which are too long for the stabilizer hole tables
+        self.long_stabilizer_offsets = {
+            3: 19.05,
+            6.25: 50.0,
+            7: 57.15
+        }
         self.switch_spacing = 19.05
         self.type_names = {
             'mx': 'MX',
@@ -56,7 +102,8 @@ class KeyboardSwitchMaker(object):
             'mx-hotswap': 'MX-Hotswap'
         }
 
-    def make_switch(self, name, size, sw_types, led_flip=False, anti_shear=False, reversed_stabs=False):
+    def make_switch(self, name, size, sw_types, led_flip=False, anti_shear=False, reversed_stabs=False,
+                    outemu=False):
         fp = Footprint(name)
         fp.setDescription('MX/Alps footprint')
 
@@ -70,8 +117,10 @@ class KeyboardSwitchMaker(object):
         self.add_cutouts(fp, sw_types)
         #self.add_switch_pads(fp, sw_types)
         if 'mx-hotswap' in sw_types:
-            self.add_hotswap(fp, sw_types, add_via_pads=anti_shear)
-            #self.add_hotswap_outemu(fp, sw_types, add_via_pads=anti_shear)
+            if outemu:
+                self.add_hotswap_outemu(fp, sw_types, add_via_pads=anti_shear)
+            else:
+                self.add_hotswap(fp, sw_types, add_via_pads=anti_shear)
         if led_flip:
             self.add_led_pads_reversed(fp, sw_types)
         else:
@@ -80,11 +129,10 @@ class KeyboardSwitchMaker(object):
         if size >= 2:
             self.add_stabilizers(fp, sw_types, reversed=reversed_stabs)
 
-        # Write
-        filename = '{}.kicad_mod'.format(name)
-        file_handler = KicadFileHandler(fp)
-        file_handler.writeFile(filename)
-        print('Wrote {}'.format(filename))
+        # Courtyard around the plate cutout, pads and holes
+        fp.addCourtyard(body_layers=['Cmts.User'])
+
+        return fp
 
     def add_borders(self, fp, size):
         width = size * self.switch_spacing
@@ -122,7 +170,7 @@ class KeyboardSwitchMaker(object):
         angle = self.oval_angle(pads)
         offset = -self.pad_distance(pads)/2
         print(offset)
-        fp.append(Pad(
+        fp.append(Pad.fast(
             number=pad_number,
             type=Pad.TYPE_THT,
             shape=Pad.SHAPE_OVAL,
@@ -148,7 +196,7 @@ class KeyboardSwitchMaker(object):
     def add_normal_pad(self, fp, pad_number, pad):
         pad_size = 2.25
         drill_size = 1.47
-        fp.append(Pad(number=pad_number, type=Pad.TYPE_THT, shape=Pad.SHAPE_CIRCLE, at=pad, size=[
+        fp.append(Pad.fast(number=pad_number, type=Pad.TYPE_THT, shape=Pad.SHAPE_CIRCLE, at=pad, size=[
                   pad_size, pad_size], drill=drill_size, layers=Pad.LAYERS_THT))
 
     def add_led_pads(self, fp, sw_types):
@@ -157,9 +205,9 @@ class KeyboardSwitchMaker(object):
         pads = self.led_pads[sw_types[0]]
         if not pads:
             return
-        fp.append(Pad(number=3, type=Pad.TYPE_THT, shape=Pad.SHAPE_CIRCLE, at=pads[0], size=[
+        fp.append(Pad.fast(number=3, type=Pad.TYPE_THT, shape=Pad.SHAPE_CIRCLE, at=pads[0], size=[
                   pad_size, pad_size], drill=drill_size, layers=Pad.LAYERS_THT))
-        fp.append(Pad(number=4, type=Pad.TYPE_THT, shape=Pad.SHAPE_RECT, at=pads[1], size=[
+        fp.append(Pad.fast(number=4, type=Pad.TYPE_THT, shape=Pad.SHAPE_RECT, at=pads[1], size=[
                   pad_size, pad_size], drill=drill_size, layers=Pad.LAYERS_THT))
         for layer in ('F.SilkS', 'B.SilkS'):
             fp.append(Text(type='user', text='+',
@@ -171,9 +219,9 @@ class KeyboardSwitchMaker(object):
         pad_size = 1.905
         drill_size = 0.9906
         pads = self.led_pads[sw_types[0]]
-        fp.append(Pad(number=3, type=Pad.TYPE_THT, shape=Pad.SHAPE_CIRCLE, at=pads[1], size=[
+        fp.append(Pad.fast(number=3, type=Pad.TYPE_THT, shape=Pad.SHAPE_CIRCLE, at=pads[1], size=[
                   pad_size, pad_size], drill=drill_size, layers=Pad.LAYERS_THT))
-        fp.append(Pad(number=4, type=Pad.TYPE_THT, shape=Pad.SHAPE_RECT, at=pads[0], size=[
+        fp.append(Pad.fast(number=4, type=Pad.TYPE_THT, shape=Pad.SHAPE_RECT, at=pads[0], size=[
                   pad_size, pad_size], drill=drill_size, layers=Pad.LAYERS_THT))
         for layer in ('F.SilkS', 'B.SilkS'):
             fp.append(Text(type='user', text='+',
@@ -198,7 +246,7 @@ class KeyboardSwitchMaker(object):
 
     def add_support_holes(self, fp, sw_types):
         drill_size = 3.9878
-        fp.append(Pad(type=Pad.TYPE_NPTH, shape=Pad.SHAPE_CIRCLE, at=[0, 0], size=[
+        fp.append(Pad.fast(type=Pad.TYPE_NPTH, shape=Pad.SHAPE_CIRCLE, at=[0, 0], size=[
                   drill_size, drill_size], drill=drill_size, layers=Pad.LAYERS_NPTH))
 
         for sw_type in sw_types:
@@ -206,7 +254,7 @@ class KeyboardSwitchMaker(object):
                 continue
             drill_size = self.support_holes[sw_type]['size']
             for hole_location in self.support_holes[sw_type]['locations']:
-                fp.append(Pad(type=Pad.TYPE_NPTH, shape=Pad.SHAPE_CIRCLE, at=hole_location, size=[
+                fp.append(Pad.fast(type=Pad.TYPE_NPTH, shape=Pad.SHAPE_CIRCLE, at=hole_location, size=[
                           drill_size, drill_size], drill=drill_size, layers=Pad.LAYERS_NPTH))
 
     def add_stabilizers(self, fp, sw_types, reversed=False):
@@ -218,7 +266,7 @@ class KeyboardSwitchMaker(object):
                 for hole_location in holes[sw_type]['locations']:
                     if reversed:
                         hole_location = [hole_location[0], -hole_location[1]]
-                    fp.append(Pad(type=Pad.TYPE_NPTH, shape=Pad.SHAPE_CIRCLE, at=hole_location, size=[
+                    fp.append(Pad.fast(type=Pad.TYPE_NPTH, shape=Pad.SHAPE_CIRCLE, at=hole_location, size=[
                               drill_size, drill_size], drill=drill_size, layers=Pad.LAYERS_NPTH))
 
     def add_hotswap(self, fp, sw_types, add_via_pads=False):
@@ -231,13 +279,13 @@ class KeyboardSwitchMaker(object):
             pad_size = info['pad_size']
             pad_layers = ['F.Cu', 'F.Mask', 'F.Paste']
             for pad_number, pad_location in enumerate(info['pads']):
-                fp.append(Pad(number=pad_number+1, type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT,
+                fp.append(Pad.fast(number=pad_number+1, type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT,
                               at=pad_location, size=pad_size, layers=pad_layers))
 
             # Add holes
             hole_size = info['hole_size']
             for hole_location in info['holes']:
-                fp.append(Pad(type=Pad.TYPE_NPTH, shape=Pad.SHAPE_CIRCLE, at=hole_location, size=[
+                fp.append(Pad.fast(type=Pad.TYPE_NPTH, shape=Pad.SHAPE_CIRCLE, at=hole_location, size=[
                           hole_size, hole_size], drill=hole_size, layers=Pad.LAYERS_NPTH))
 
         # Add socket outline
@@ -270,7 +318,7 @@ class KeyboardSwitchMaker(object):
                         ((6.604, -5.842), (6.604, -4.318)))
             for pad_num, pad_locations in enumerate(via_pads):
                 for pad_location in pad_locations:
-                    fp.append(Pad(number=pad_num+1, type=Pad.TYPE_THT, shape=Pad.SHAPE_CIRCLE, at=pad_location, size=[
+                    fp.append(Pad.fast(number=pad_num+1, type=Pad.TYPE_THT, shape=Pad.SHAPE_CIRCLE, at=pad_location, size=[
                         pad_size, pad_size], drill=drill_size, layers=Pad.LAYERS_THT))
 
         # Add 3D Model
@@ -290,13 +338,13 @@ class KeyboardSwitchMaker(object):
             pad_size = info['pad_size']
             pad_layers = ['B.Cu', 'B.Mask', 'B.Paste']
             for pad_number, pad_location in enumerate(info['pads']):
-                fp.append(Pad(number=pad_number+1, type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT,
+                fp.append(Pad.fast(number=pad_number+1, type=Pad.TYPE_SMT, shape=Pad.SHAPE_RECT,
                               at=pad_location, size=pad_size, layers=pad_layers))
 
             # Add holes
             hole_size = info['hole_size']
             for hole_location in info['holes']:
-                fp.append(Pad(type=Pad.TYPE_NPTH, shape=Pad.SHAPE_CIRCLE, at=hole_location, size=[
+                fp.append(Pad.fast(type=Pad.TYPE_NPTH, shape=Pad.SHAPE_CIRCLE, at=hole_location, size=[
                           hole_size, hole_size], drill=hole_size, layers=Pad.LAYERS_NPTH))
 
         # Add socket outline
@@ -331,7 +379,7 @@ class KeyboardSwitchMaker(object):
                         ((6.604, -5.842), (6.604, -4.318)))
             for pad_num, pad_locations in enumerate(via_pads):
                 for pad_location in pad_locations:
-                    fp.append(Pad(number=pad_num+1, type=Pad.TYPE_THT, shape=Pad.SHAPE_CIRCLE, at=pad_location, size=[
+                    fp.append(Pad.fast(number=pad_num+1, type=Pad.TYPE_THT, shape=Pad.SHAPE_CIRCLE, at=pad_location, size=[
                         pad_size, pad_size], drill=drill_size, layers=Pad.LAYERS_THT))
 
         # Add 3D Model
@@ -341,57 +389,171 @@ class KeyboardSwitchMaker(object):
             rotate=[0, 0, 180]
         ))
 
-    def make_switches(self):
-        sizes = [1, 1.25, 1.5, 1.75, 2, 2.25, 2.75]
-        hybrid_types = [
-            # ['mx'],
-            #['mx', 'alps']
-            ['mx-hotswap']
-        ]
-        for size in sizes:
-            for hybrid_type in hybrid_types:
-                hybrid_name = '-'.join(self.type_names[sw_type]
-                                       for sw_type in hybrid_type)
-                name = '{}-{}u'.format(hybrid_name, size)
-                self.make_switch(name, size, hybrid_type)
-
-        # Anti-shear hotswap
-        for size in sizes:
-            for hybrid_type in hybrid_types:
-                hybrid_name = '-'.join(self.type_names[sw_type]
-                                       for sw_type in hybrid_type)
-                name = '{}-{}u-Antishear'.format(hybrid_name, size)
-                self.make_switch(name, size, hybrid_type, anti_shear=True)
-
-        '''
-        for size in sizes:
-            for hybrid_type in hybrid_types:
-                hybrid_name = '-'.join(self.type_names[sw_type]
-                                       for sw_type in hybrid_type)
-                name = '{}-{}u-LEDFlip'.format(hybrid_name, size)
-                self.make_switch(name, size, hybrid_type, led_flip=True)
-        '''
-
-    def make_hotswap_outemu(self):
-        sizes = [1, 1.25, 1.5, 1.75, 2, 2.25, 2.75]
-        hybrid_types = [
-            ['mx-hotswap']
-        ]
-        for size in sizes:
-            for hybrid_type in hybrid_types:
-                hybrid_name = '-'.join(self.type_names[sw_type]
-                                       for sw_type in hybrid_type)
-                name = '{}-Outemu-{}u'.format(hybrid_name, size)
-                self.make_switch(name, size, hybrid_type)
-
-                # Make Reversed Stabilizers
-                if size > 1.75:
-                    hybrid_name = '-'.join(self.type_names[sw_type]
-                                        for sw_type in hybrid_type)
-                    name = '{}-Stabflip-Outemu-{}u'.format(hybrid_name, size)
-                    self.make_switch(name, size, hybrid_type, reversed_stabs=True)
-
-
-m = KeyboardSwitchMaker()
-m.make_switches()
-#m.make_hotswap_outemu()
+    def iter_variant_jobs(self, spec):
+        """Lazily expand the variant spec into (name, size, sw_types, options) jobs, skipping duplicates"""
+        suffixes = spec.get('suffixes', {})
+        seen = {}
+        for variant in spec.get('variants', []):
+            if not variant.get('enabled', True):
+                continue
+
+            types = [[t] if isinstance(t, str) else list(t) for t in variant['types']]
+            option_names = sorted(variant.get('options', {}))
+            option_values = [variant['options'][option] for option in option_names]
+
+            for size, sw_types, values in itertools.product(
+                    variant['sizes'], types, itertools.product(*option_values)):
+                options = dict(zip(option_names, values))
+                name_fields = dict((option, suffixes.get(option, '') if value else '')
+                                   for option, value in options.items())
+                name = variant['name'].format(
+                    type='-'.join(self.type_names[sw_type] for sw_type in sw_types),
+                    size=size, **name_fields)
+
+                job = (size, tuple(sw_types), tuple(sorted(options.items())))
+                if name in seen:
+                    if seen[name] != job:
+                        raise ValueError('variant {} is defined with different parameters'.format(name))
+                    continue
+                seen[name] = job
+
+                yield name, size, sw_types, options
+
+    def make_variants(self, spec):
+        if not isinstance(spec, dict):
+            spec = load_variant_spec(spec)
+
+        footprints = (self.make_switch(name, size, sw_types, **options)
+                      for name, size, sw_types, options in self.iter_variant_jobs(spec))
+
+        summary = LibraryWriter('.').write(footprints)
+        for filename, error in sorted(summary['failed'].items()):
+            print('Failed {}: {}'.format(filename, error))
+        print('Wrote {} footprints, {} unchanged, {} failed'.format(
+            len(summary['written']), len(summary['unchanged']), len(summary['failed'])))
+
+    def check_variants(self, spec):
+        """Compare the generated variants with the checked-in files, returns False if any of them differ"""
+        if not isinstance(spec, dict):
+            spec = load_variant_spec(spec)
+
+        footprints = (self.make_switch(name, size, sw_types, **options)
+                      for name, size, sw_types, options in self.iter_variant_jobs(spec))
+
+        summary = LibraryWriter('.').check(footprints)
+        for filename, differences in sorted(summary['differing'].items()):
+            print('Differs {}:'.format(filename))
+            for difference in differences:
+                print(formatLispDifference(difference))
+        for filename in summary['missing']:
+            print('Missing {}'.format(filename))
+        for filename, error in sorted(summary['failed'].items()):
+            print('Failed {}: {}'.format(filename, error))
+        print('Checked {} footprints, {} differ, {} missing, {} failed'.format(
+            len(summary['matching']) + len(summary['differing']) + len(summary['missing']) + len(summary['failed']),
+            len(summary['differing']), len(summary['missing']), len(summary['failed'])))
+
+        return not (summary['differing'] or summary['missing'] or summary['failed'])
+
+    def stabilizer_offset(self, sw_type, size):
+        if size in self.long_stabilizer_offsets:
+            return self.long_stabilizer_offsets[size]
+        if size < 3:
+            return abs(self.stabilizer_big_holes[sw_type]['locations'][0][0])
+        raise ValueError('no stabilizer offset is known for a {}u key'.format(size))
+
+    def iter_plate_keys(self, rows):
+        """Yield the (x, y, width, height) of all keys of the layout rows, in key units
+
+        Every key is either its width, or a dict with the width w, height h and the gaps x and y before it.
+        """
+        y = 0
+        for row in rows:
+            x = 0
+            for key in row:
+                if not isinstance(key, dict):
+                    key = {'w': key}
+                # like in keyboard-layout-editor, gaps move all following keys
+                x += key.get('x', 0)
+                y += key.get('y', 0)
+                width, height = key.get('w', 1), key.get('h', 1)
+                yield x, y, width, height
+                x += width
+            y += 1
+
+    def plate_rectangles(self, rows, sw_type):
+        """Get the cutouts of the switches and stabilizers of the layout rows, as (x0, y0, x1, y1) in mm"""
+        cutout_width, cutout_height = self.cutout_size[sw_type]
+        stabilizer_holes = [self.stabilizer_big_holes.get(sw_type), self.stabilizer_small_holes.get(sw_type)]
+        stabilizer_size = self.stabilizer_cutout_size.get(sw_type)
+        # the stabilizer housing is centered between its big and small hole
+        stabilizer_shift = sum(holes['locations'][0][1] for holes in stabilizer_holes) / 2 \
+            if stabilizer_size and all(stabilizer_holes) else None
+
+        rects = []
+        for x, y, width, height in self.iter_plate_keys(rows):
+            center_x = (x + width / 2.0) * self.switch_spacing
+            center_y = (y + height / 2.0) * self.switch_spacing
+            rects.append((center_x - cutout_width / 2, center_y - cutout_height / 2,
+                          center_x + cutout_width / 2, center_y + cutout_height / 2))
+
+            size = max(width, height)
+            if size < 2 or stabilizer_shift is None:
+                continue
+
+            offset = self.stabilizer_offset(sw_type, size)
+            stab_width, stab_height = stabilizer_size
+            for side in (-1, 1):
+                if width >= height:
+                    x0, y0 = center_x + side * offset, center_y + stabilizer_shift
+                    half_x, half_y = stab_width / 2, stab_height / 2
+                else:
+                    # stabilizers of vertical keys are turned by 90 degrees
+                    x0, y0 = center_x - stabilizer_shift, center_y + side * offset
+                    half_x, half_y = stab_height / 2, stab_width / 2
+                rects.append((x0 - half_x, y0 - half_y, x0 + half_x, y0 + half_y))
+
+        return rects
+
+    def make_plate(self, spec, basename=None):
+        """Write the switch plate of a layout as .dxf and .svg file"""
+        if not isinstance(spec, dict):
+            if basename is None:
+                basename = spec.rsplit('.', 1)[0]
+            spec = load_variant_spec(spec)
+
+        rows = spec['rows']
+        margin = spec.get('margin', 0)
+        tolerance = spec.get('tolerance', 0.001)
+
+        cutouts = mergeRectangles(self.plate_rectangles(rows, spec.get('switch_type', 'mx')), tolerance)
+
+        keys = list(self.iter_plate_keys(rows))
+        right = max(x + width for x, y, width, height in keys) * self.switch_spacing + margin
+        bottom = max(y + height for x, y, width, height in keys) * self.switch_spacing + margin
+        outline = mergeRectangles([(-margin, -margin, right, bottom)], tolerance)
+
+        outlines = outline + cutouts
+        layers = ['OUTLINE'] * len(outline) + ['CUTOUTS'] * len(cutouts)
+        if basename is not None:
+            with open(basename + '.dxf', 'w') as f:
+                f.write(outlinesToDxf(outlines, layers))
+            with open(basename + '.svg', 'w') as f:
+                f.write(outlinesToSvg(outlines))
+
+        return outlines
+
+
+def main(argv):
+    m = KeyboardSwitchMaker()
+    if len(argv) > 2 and argv[1] == '--plate':
+        m.make_plate(argv[2])
+    elif len(argv) > 1 and argv[1] == '--check':
+        return 0 if m.check_variants(argv[2] if len(argv) > 2 else 'switch-variants.yml') else 1
+    else:
+        m.make_variants(argv[1] if len(argv) > 1 else 'switch-variants.yml')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))